@@ -0,0 +1,33 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+from apify import Actor
+
+
+async def scrape(urls: list[str]) -> AsyncIterator[dict]:
+    for url in urls:
+        # Do some expensive work (e.g. scraping, API calls)
+        yield {'url': url, 'data': f'Scraped data from {url}'}
+
+
+async def main() -> None:
+    async with Actor:
+        urls = [f'https://example.com/{i}' for i in range(1000)]
+
+        # highlight-start
+        # Check how many results the remaining budget pays for before doing any work
+        max_count = Actor.calculate_max_push_data_count_within_limit('result-item')
+        Actor.log.info(f'The budget allows for {max_count} results (None is unlimited)')
+
+        # Results are pulled from the generator only while the budget allows pushing them,
+        # so no page is scraped just to be thrown away
+        charge_result = await Actor.push_data_stream(
+            scrape(urls), charged_event_name='result-item'
+        )
+        # highlight-end
+
+        Actor.log.info(f'Pushed {charge_result.charged_count} results')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
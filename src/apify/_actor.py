@@ -31,23 +31,28 @@ from apify._charging import (
     ChargeResult,
     ChargingManager,
     ChargingManagerImplementation,
-    charge_lock_if_charging,
+    charge_reservation_ctx,
 )
 from apify._configuration import Configuration
 from apify._consts import EVENT_LISTENERS_TIMEOUT, EXIT_CODE_ERROR_USER_FUNCTION_THREW, ActorEnvVars, ApifyEnvVars
 from apify._crypto import decrypt_input_secrets, load_private_key
+from apify._incremental_state import IncrementalState
 from apify._proxy_configuration import ProxyConfiguration
 from apify._utils import docs_group, docs_name, ensure_context, get_system_info, is_running_in_ipython
 from apify._webhook import to_client_representations
 from apify.events import ApifyEventManager, EventManager, LocalEventManager
 from apify.log import _configure_logging, logger
 from apify.storage_clients import ApifyStorageClient, SmartApifyStorageClient
+from apify.storage_clients._apify._alias_resolving import AliasResolver
+from apify.storage_clients._apify._api_client_creation import clear_api_client_cache
+from apify.storage_clients._apify._request_queue_shared_client import ApifyRequestQueueSharedClient
 from apify.storage_clients._file_system import ApifyFileSystemStorageClient
+from apify.storage_clients._ppe_dataset_mixin import STREAM_BATCH_SIZE, DatasetClientPpeMixin, push_item_stream
 from apify.storages import Dataset, KeyValueStore, RequestQueue
 
 if TYPE_CHECKING:
     import logging
-    from collections.abc import Callable, MutableMapping
+    from collections.abc import AsyncIterable, Callable, Iterable, MutableMapping, Sequence
     from decimal import Decimal
     from types import TracebackType
     from typing import Self
@@ -149,6 +154,9 @@ class _ActorType:
         # Keep track of all used state stores to persist their values on exit
         self._use_state_stores: set[str | None] = set()
 
+        self._incremental_states: dict[tuple[str | None, str], IncrementalState] = {}
+        """States of `use_state` persisted incrementally, by the name of their key-value store and their key."""
+
         self._active = False
         """Whether the Actor instance is currently active (initialized and within context)."""
 
@@ -158,6 +166,15 @@ class _ActorType:
         self._is_exiting = False
         """Whether the Actor is currently exiting."""
 
+        self._is_pay_per_event = False
+        """Whether the Actor uses the pay-per-event pricing model, resolved once the charging manager is initialized."""
+
+        self._default_dataset: Dataset | None = None
+        """The default dataset pushed to by `push_data`, pinned so it is not looked up on every push."""
+
+        self._default_dataset_drop_count = 0
+        """How many default datasets were dropped when the default dataset was pinned."""
+
     async def __aenter__(self) -> Self:
         """Enter the Actor context.
 
@@ -202,6 +219,20 @@ class _ActorType:
         await self.event_manager.__aenter__()
         self.log.debug('Event manager initialized')
 
+        # Hand the requests locked by shared request queue clients back to other consumers once this run stops.
+        self.event_manager.on(event=Event.MIGRATING, listener=self._release_unused_request_locks)
+        self.event_manager.on(event=Event.ABORTING, listener=self._release_unused_request_locks)
+
+        # Write the mappings of newly created aliased storages together with the rest of the persisted state.
+        self.event_manager.on(event=Event.PERSIST_STATE, listener=self._flush_alias_mappings)
+        self.event_manager.on(event=Event.PERSIST_STATE, listener=self._persist_incremental_states)
+
+        # Submit the charges accumulated in the background before the run is migrated or aborted, and persist the
+        # charging state so a migrated run enforces the budget without relying on possibly stale charged counts.
+        self.event_manager.on(event=Event.MIGRATING, listener=self._flush_charges)
+        self.event_manager.on(event=Event.ABORTING, listener=self._flush_charges)
+        self.event_manager.on(event=Event.PERSIST_STATE, listener=self._persist_charging_state)
+
         # Initialize the charging manager.
         try:
             await self._charging_manager_implementation.__aenter__()
@@ -210,6 +241,8 @@ class _ActorType:
             await self.event_manager.__aexit__(None, None, None)
             raise
         self.log.debug('Charging manager initialized')
+        self._is_pay_per_event = self._charging_manager_implementation.get_pricing_info().is_pay_per_event
+        self._default_dataset = None
 
         # Mark initialization as complete and update global state.
         self._active = True
@@ -277,6 +310,15 @@ class _ActorType:
             if self._event_listeners_timeout:
                 await self.event_manager.wait_for_all_listeners_to_complete(timeout=self._event_listeners_timeout)
 
+            self.event_manager.off(event=Event.MIGRATING, listener=self._release_unused_request_locks)
+            self.event_manager.off(event=Event.ABORTING, listener=self._release_unused_request_locks)
+            await self._release_unused_request_locks()
+            self.event_manager.off(event=Event.PERSIST_STATE, listener=self._flush_alias_mappings)
+            self.event_manager.off(event=Event.PERSIST_STATE, listener=self._persist_incremental_states)
+            self.event_manager.off(event=Event.MIGRATING, listener=self._flush_charges)
+            self.event_manager.off(event=Event.ABORTING, listener=self._flush_charges)
+            self.event_manager.off(event=Event.PERSIST_STATE, listener=self._persist_charging_state)
+
             try:
                 await self.event_manager.__aexit__(None, None, None)
             except Exception:
@@ -292,6 +334,13 @@ class _ActorType:
                 await self._save_actor_state()
             except Exception:
                 self.log.exception('Failed to save Actor state')
+            self._incremental_states.clear()
+
+            await self._flush_alias_mappings()
+
+            # Storages are no longer written to by the SDK, release the API clients they shared.
+            clear_api_client_cache()
+            self._default_dataset = None
 
         try:
             await asyncio.wait_for(finalize(), self._cleanup_timeout.total_seconds())
@@ -669,9 +718,68 @@ class _ActorType:
         )
 
     @_ensure_context
-    async def push_data(self, data: dict | list[dict], *, charged_event_name: str | None = None) -> ChargeResult:
+    async def open_storages(
+        self,
+        *,
+        dataset_aliases: Sequence[str] = (),
+        key_value_store_aliases: Sequence[str] = (),
+        request_queue_aliases: Sequence[str] = (),
+        force_cloud: bool = False,
+    ) -> tuple[dict[str, Dataset], dict[str, KeyValueStore], dict[str, RequestQueue]]:
+        """Open several aliased storages at once.
+
+        Equivalent to calling `open_dataset`, `open_key_value_store` and `open_request_queue` with `alias` for each
+        of the aliases, but the storages are opened concurrently and the mapping of the newly created aliased
+        storages is saved to the default key-value store once for all of them, instead of once per alias. Prefer it
+        when an Actor works with many aliased storages, e.g. one dataset per processed category.
+
+        Args:
+            dataset_aliases: Aliases of the datasets to open (run scope, creates unnamed storages).
+            key_value_store_aliases: Aliases of the key-value stores to open (run scope, creates unnamed storages).
+            request_queue_aliases: Aliases of the request queues to open (run scope, creates unnamed storages).
+            force_cloud: If set to `True` then the Apify cloud storage is always used. This way it is possible
+                to combine local and cloud storage.
+
+        Returns:
+            The opened datasets, key-value stores and request queues, each keyed by their alias.
+        """
+        storage_client = self._storage_client.get_suitable_storage_client(force_cloud=force_cloud)
+        dataset_aliases = list(dict.fromkeys(dataset_aliases))
+        kvs_aliases = list(dict.fromkeys(key_value_store_aliases))
+        rq_aliases = list(dict.fromkeys(request_queue_aliases))
+
+        async with AliasResolver.defer_mapping_persistence():
+            datasets, key_value_stores, request_queues = await asyncio.gather(
+                asyncio.gather(
+                    *(Dataset.open(alias=alias, storage_client=storage_client) for alias in dataset_aliases)
+                ),
+                asyncio.gather(
+                    *(KeyValueStore.open(alias=alias, storage_client=storage_client) for alias in kvs_aliases)
+                ),
+                asyncio.gather(
+                    *(RequestQueue.open(alias=alias, storage_client=storage_client) for alias in rq_aliases)
+                ),
+            )
+
+        return (
+            dict(zip(dataset_aliases, datasets, strict=True)),
+            dict(zip(kvs_aliases, key_value_stores, strict=True)),
+            dict(zip(rq_aliases, request_queues, strict=True)),
+        )
+
+    @_ensure_context
+    async def push_data(
+        self,
+        data: dict | list[dict] | Iterable[dict] | AsyncIterable[dict],
+        *,
+        charged_event_name: str | None = None,
+    ) -> ChargeResult:
         """Store an object or a list of objects to the default dataset of the current Actor run.
 
+        Instead of a list, the objects can also be produced by a sync or async iterable (e.g. a generator). They are
+        then pulled and pushed in batches, so that they do not have to be held in memory all at once, see
+        `push_data_stream`.
+
         Args:
             data: The data to push to the default dataset.
             charged_event_name: If provided and if the Actor uses the pay-per-event pricing model,
@@ -680,7 +788,15 @@ class _ActorType:
         if charged_event_name and charged_event_name.startswith('apify-'):
             raise ValueError(f'Cannot charge for synthetic event "{charged_event_name}" manually')
 
-        charging_manager = self.get_charging_manager()
+        # Runs that do not use the pay-per-event pricing model charge nothing for the items, so pushes (often small
+        # and frequent ones) skip all the charging work.
+        if not self._is_pay_per_event:
+            return await self._push_data_uncharged(data, charged_event_name)
+
+        if not isinstance(data, (dict, list)):
+            return await self.push_data_stream(data, charged_event_name=charged_event_name)
+
+        charging_manager = self._charging_manager_implementation
 
         if not data:
             charged_event_name = charged_event_name or DEFAULT_DATASET_ITEM_EVENT
@@ -692,43 +808,124 @@ class _ActorType:
                 chargeable_within_limit=charging_manager.compute_chargeable(),
             )
 
-        data = data if isinstance(data, list) else [data]
+        items = cast('list[dict]', data if isinstance(data, list) else [data])
 
-        dataset = await self.open_dataset()
+        dataset = await self._open_default_dataset()
 
-        # The whole push + charge sequence has to stay under the charge lock, so that a concurrent push cannot
-        # charge in between the limit reservation below and the charge that acts on it. Runs that charge nothing
-        # skip the lock and push concurrently.
-        async with charge_lock_if_charging():
-            # Synthetic events are handled within dataset.push_data, only get data for `ChargeResult`.
-            if charged_event_name is None:
-                before = charging_manager.get_charged_event_count(DEFAULT_DATASET_ITEM_EVENT)
-                await dataset.push_data(data)
-                after = charging_manager.get_charged_event_count(DEFAULT_DATASET_ITEM_EVENT)
-                return ChargeResult(
-                    event_charge_limit_reached=charging_manager.is_event_charge_limit_reached(
-                        DEFAULT_DATASET_ITEM_EVENT
-                    ),
-                    charged_count=after - before,
-                    chargeable_within_limit=charging_manager.compute_chargeable(),
-                )
+        # Reserve the budget for both the explicit and the synthetic event of each item before the upload, so
+        # concurrent pushes cannot spend it meanwhile, and charge only once the items are pushed. No lock is held, so
+        # concurrent pushes upload their items in parallel.
+        reservation = charging_manager.reserve(self._get_push_data_event_names(charged_event_name), len(items))
 
-            pushed_items_count = charging_manager.compute_push_data_limit(
-                items_count=len(data),
-                event_name=charged_event_name,
-                is_default_dataset=True,
-            )
+        # The dataset client must not limit and charge the items again.
+        reservation_token = charge_reservation_ctx.set(reservation)
+        try:
+            if reservation.count > 0:
+                await dataset.push_data(items[: reservation.count])
+        except BaseException:
+            charging_manager.refund(reservation)
+            raise
+        finally:
+            charge_reservation_ctx.reset(reservation_token)
 
-            if pushed_items_count < len(data):
-                await dataset.push_data(data[:pushed_items_count])
-            elif pushed_items_count > 0:
-                await dataset.push_data(data)
+        return await charging_manager.commit(reservation)
 
-            # Only charge explicit events; synthetic events will be processed within the client.
-            return await charging_manager.charge(
-                event_name=charged_event_name,
-                count=pushed_items_count,
-            )
+    @_ensure_context
+    async def push_data_stream(
+        self,
+        items: Iterable[dict] | AsyncIterable[dict],
+        *,
+        charged_event_name: str | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> ChargeResult:
+        """Store objects produced by a sync or async iterable to the default dataset of the current Actor run.
+
+        Unlike with `push_data` and a list, the items do not have to be produced up front. They are pulled and pushed
+        in batches, the next batch being pulled while the previous one is uploaded, so at most two batches are held
+        in memory. The dataset client splits each batch further into uploads within the API payload size limit.
+
+        Before each batch, the pay-per-event budget for all of its items is reserved, and no more items than the
+        reservation covers are pulled from `items`. Once the budget is exhausted, pulling stops, so the producer
+        (e.g. a generator) does not produce items that could not be pushed anyway.
+
+        Args:
+            items: The objects to push to the default dataset.
+            charged_event_name: If provided and if the Actor uses the pay-per-event pricing model,
+                the method will attempt to charge for the event for each pushed item.
+            batch_size: How many items are pulled and pushed at once at most.
+
+        Returns:
+            The result of charging for the items, with the total count of items charged for.
+        """
+        if charged_event_name and charged_event_name.startswith('apify-'):
+            raise ValueError(f'Cannot charge for synthetic event "{charged_event_name}" manually')
+
+        charging_manager = self._charging_manager_implementation
+        dataset = await self._open_default_dataset()
+
+        charged_count = await push_item_stream(
+            items,
+            dataset.push_data,
+            charging_manager=charging_manager,
+            event_names=self._get_push_data_event_names(charged_event_name),
+            batch_size=batch_size,
+        )
+
+        return ChargeResult(
+            event_charge_limit_reached=charging_manager.is_event_charge_limit_reached(
+                charged_event_name or DEFAULT_DATASET_ITEM_EVENT
+            ),
+            charged_count=charged_count,
+            chargeable_within_limit=charging_manager.compute_chargeable(),
+        )
+
+    async def _push_data_uncharged(
+        self,
+        data: dict | list[dict] | Iterable[dict] | AsyncIterable[dict],
+        charged_event_name: str | None,
+    ) -> ChargeResult:
+        """Push data to the default dataset of a run that does not use the pay-per-event pricing model."""
+        uncharged_result = ChargeResult(event_charge_limit_reached=False, charged_count=0, chargeable_within_limit={})
+        if not data:
+            return uncharged_result
+
+        dataset = await self._open_default_dataset()
+        if isinstance(data, (dict, list)):
+            await dataset.push_data(cast('dict | list[dict]', data))
+        else:
+            await push_item_stream(data, dataset.push_data)
+
+        if charged_event_name is not None:
+            # Warn about the ignored charge, like `Actor.charge` does.
+            return await self.get_charging_manager().charge(charged_event_name)
+
+        return uncharged_result
+
+    async def _open_default_dataset(self) -> Dataset:
+        """Open the default dataset, reusing the one pinned by the previous call while it is still valid.
+
+        Opening a dataset resolves the suitable storage client and its cache key, which is a noticeable part of the
+        cost of small pushes. The dataset is opened again once a default dataset is dropped, which the dataset clients
+        of the SDK count. Datasets of other storage clients are never pinned, as their drops are not counted. Purging
+        a dataset keeps the same instance, so it needs no special handling.
+        """
+        drop_count = DatasetClientPpeMixin.default_dataset_drop_count
+        if self._default_dataset is not None and self._default_dataset_drop_count == drop_count:
+            return self._default_dataset
+
+        dataset = await self.open_dataset()
+        storage_client = self._storage_client.get_suitable_storage_client()
+        if isinstance(storage_client, ApifyStorageClient | ApifyFileSystemStorageClient):
+            self._default_dataset = dataset
+            self._default_dataset_drop_count = drop_count
+        return dataset
+
+    @staticmethod
+    def _get_push_data_event_names(charged_event_name: str | None) -> list[str]:
+        """Get the events charged for each pushed item - the explicit one first, if any, and the synthetic one."""
+        if charged_event_name is None:
+            return [DEFAULT_DATASET_ITEM_EVENT]
+        return [charged_event_name, DEFAULT_DATASET_ITEM_EVENT]
 
     @_ensure_context
     async def get_input(self) -> Any:
@@ -787,6 +984,21 @@ class _ActorType:
         """Retrieve the charging manager to access granular pricing information."""
         return self._charging_manager_implementation
 
+    @_ensure_context
+    def calculate_max_push_data_count_within_limit(self, charged_event_name: str | None = None) -> int | None:
+        """Calculate how many items `Actor.push_data` can push before the configured charge limit is reached.
+
+        The price of an item includes the synthetic `DEFAULT_DATASET_ITEM_EVENT` event. The calculation is cheap and
+        never blocks, so producers of items can use it to stop producing items that could not be pushed anyway.
+
+        Args:
+            charged_event_name: Name of the event charged for each item, as passed to `Actor.push_data`.
+
+        Returns:
+            The number of items, or `None` if it is not limited.
+        """
+        return self._charging_manager_implementation.calculate_max_push_data_count_within_limit(charged_event_name)
+
     @_ensure_context
     async def charge(self, event_name: str, *, count: int = 1) -> ChargeResult:
         """Charge for a specified number of events - sub-operations of the Actor.
@@ -797,7 +1009,6 @@ class _ActorType:
             event_name: Name of the event to be charged for.
             count: Number of events to charge for.
         """
-        # charging_manager.charge() acquires charge_lock internally.
         charging_manager = self.get_charging_manager()
         return await charging_manager.charge(event_name, count=count)
 
@@ -1432,6 +1643,7 @@ class _ActorType:
         *,
         key: str | None = None,
         kvs_name: str | None = None,
+        incremental: bool = False,
     ) -> MutableMapping[str, JsonSerializable]:
         """Easily create and manage state values. All state values are automatically persisted.
 
@@ -1442,13 +1654,25 @@ class _ActorType:
             key: The key in the key-value store where the state is stored. If not provided, a default key is used.
             kvs_name: The name of the key-value store where the state is stored. If not provided, the default
                 key-value store associated with the Actor run is used.
+            incremental: Whether to persist only the changes of the state instead of the whole state, for large states
+                changing little between persists. Only assignments and deletions of top-level keys are tracked, a
+                nested value changed in place has to be assigned to its key again. The state is stored in records
+                derived from `key`, so it is not interchangeable with a state that is not incremental.
 
         Returns:
             The state dictionary with automatic persistence.
         """
-        self._use_state_stores.add(kvs_name)
         kvs = await self.open_key_value_store(name=kvs_name)
-        return await kvs.get_auto_saved_value(key or self._ACTOR_STATE_KEY, default_value)
+        key = key or self._ACTOR_STATE_KEY
+
+        if incremental:
+            state = self._incremental_states.get((kvs_name, key))
+            if state is None:
+                state = self._incremental_states[kvs_name, key] = await IncrementalState.load(kvs, key, default_value)
+            return state
+
+        self._use_state_stores.add(kvs_name)
+        return await kvs.get_auto_saved_value(key, default_value)
 
     async def _save_actor_state(self) -> None:
         async def safe_persist(kvs_name: str | None) -> None:
@@ -1461,6 +1685,48 @@ class _ActorType:
         async with asyncio.TaskGroup() as tg:
             for kvs_name in self._use_state_stores:
                 tg.create_task(safe_persist(kvs_name))
+            tg.create_task(self._persist_incremental_states())
+
+    async def _persist_incremental_states(self) -> None:
+        """Write the changes of the states of `use_state` persisted incrementally."""
+
+        async def safe_persist(kvs_name: str | None, key: str, state: IncrementalState) -> None:
+            try:
+                await state.persist()
+            except Exception:
+                self.log.exception('Failed to persist incremental state', extra={'kvs_name': kvs_name, 'key': key})
+
+        async with asyncio.TaskGroup() as tg:
+            for (kvs_name, key), state in self._incremental_states.items():
+                tg.create_task(safe_persist(kvs_name, key, state))
+
+    async def _release_unused_request_locks(self) -> None:
+        """Release the locks shared request queue clients hold on requests they will no longer hand out."""
+        try:
+            await ApifyRequestQueueSharedClient.release_all_unused_locks()
+        except Exception:
+            self.log.exception('Failed to release unused request queue locks')
+
+    async def _flush_alias_mappings(self) -> None:
+        """Write the pending mappings of aliased storages to the default key-value store."""
+        try:
+            await AliasResolver.flush_mappings()
+        except Exception:
+            self.log.exception('Failed to store the alias mapping')
+
+    async def _flush_charges(self) -> None:
+        """Submit the charges accumulated by the charging manager to the platform."""
+        try:
+            await self._charging_manager_implementation.flush_charges()
+        except Exception:
+            self.log.exception('Failed to submit the accumulated charges')
+
+    async def _persist_charging_state(self) -> None:
+        """Store the state of the charging manager to the default key-value store."""
+        try:
+            await self._charging_manager_implementation.persist_state()
+        except Exception:
+            self.log.exception('Failed to persist the charging state')
 
     def _get_default_exit_process(self) -> bool:
         """Return False for IPython and Scrapy environments, True otherwise."""
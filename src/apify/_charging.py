@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-import math
-from contextlib import asynccontextmanager
+import asyncio
+import warnings
+from contextlib import asynccontextmanager, suppress
 from contextvars import ContextVar
 from dataclasses import dataclass
-from datetime import UTC, datetime
-from decimal import Decimal
+from datetime import UTC, datetime, timedelta
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from itertools import count as count_from
 from logging import getLogger
-from typing import TYPE_CHECKING, Literal, Protocol, TypedDict
+from secrets import token_hex
+from typing import TYPE_CHECKING, Any, Final, Literal, Protocol, TypedDict
 
-from pydantic import ConfigDict
+from pydantic import BaseModel, ConfigDict, ValidationError
 from pydantic.alias_generators import to_camel
 
 import apify_client._models as _client_models
@@ -21,10 +24,10 @@ from apify_client._models import PricePerDatasetItemActorPricingInfo as ClientPr
 from apify_client._models import PricingPerEvent as ClientPricingPerEvent
 
 from apify._utils import ReentrantLock, docs_group, ensure_context
-from apify.storages import Dataset
+from apify.storages import Dataset, KeyValueStore
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Sequence
     from types import TracebackType
 
     from apify_client import ApifyClientAsync
@@ -33,7 +36,7 @@ if TYPE_CHECKING:
 
 logger = getLogger(__name__)
 
-charging_manager_ctx: ContextVar[ChargingManager | None] = ContextVar('charging_manager_ctx', default=None)
+charging_manager_ctx: ContextVar[ReservingChargingManager | None] = ContextVar('charging_manager_ctx', default=None)
 """Holds the current `ChargingManager` instance, if any.
 
 Allows PPE-aware dataset clients to access the charging manager without needing to pass it explicitly.
@@ -42,6 +45,25 @@ Allows PPE-aware dataset clients to access the charging manager without needing
 DEFAULT_DATASET_ITEM_EVENT = 'apify-default-dataset-item'
 """Name of the synthetic event charged for each item pushed to the default dataset."""
 
+CHARGE_FLUSH_INTERVAL: Final[timedelta] = timedelta(seconds=1)
+"""How long charges are accumulated at most before they are submitted to the platform."""
+
+CHARGE_FLUSH_THRESHOLD: Final[int] = 1000
+"""How many accumulated event charges trigger their submission to the platform right away."""
+
+CHARGING_LOG_BATCH_SIZE: Final[int] = 100
+"""How many rows of the local charging log are buffered before they are written to its dataset."""
+
+MIN_BUDGET_UNIT_EXPONENT: Final[int] = 6
+"""Prices and budgets are kept in integer budget units for the budget checks, which run on every charge and push.
+
+A budget unit is `10 ** -exponent` dollars. The exponent starts at this value (micro-dollars) and grows to fit the
+decimal places of every price and of the budget, so that the budget checks stay exact.
+"""
+
+MAX_BUDGET_UNIT_EXPONENT: Final[int] = 18
+"""The finest budget unit used, prices with even more decimal places are rounded up to it."""
+
 PricingModel = Literal['PAY_PER_EVENT', 'PRICE_PER_DATASET_ITEM', 'FLAT_PRICE_PER_MONTH', 'FREE']
 """Pricing model for an Actor."""
 
@@ -50,19 +72,25 @@ _ensure_context = ensure_context('active')
 
 @asynccontextmanager
 async def charge_lock_if_charging() -> AsyncIterator[None]:
-    """Acquire the charge lock if a charging manager is active, otherwise proceed without locking.
+    """Proceed without locking - deprecated, will be removed in version 5.0.0.
 
-    The lock keeps a limit reservation and the charge that follows it atomic. Only pay-per-event runs charge
-    anything, and `charging_manager_ctx` is set exactly for those, so for any other run there is nothing to
-    serialize and the lock is skipped.
+    The SDK no longer holds a lock around charged pushes, it reserves the budget for them instead.
     """
-    charging_manager = charging_manager_ctx.get()
-    if charging_manager is None:
-        yield
-        return
+    warnings.warn(
+        '`charge_lock_if_charging` is deprecated and will be removed in version 5.0.0. It does nothing, '
+        'the SDK reserves the budget for charges instead of locking around them.',
+        DeprecationWarning,
+        stacklevel=3,
+    )
+    yield
+
 
-    async with charging_manager.charge_lock():
-        yield
+charge_reservation_ctx: ContextVar[ChargeReservation | None] = ContextVar('charge_reservation_ctx', default=None)
+"""Holds the budget reservation of the `Actor.push_data` call in progress, if any.
+
+`Actor.push_data` reserves the budget for the items and charges for them itself, so the PPE-aware dataset client it
+pushes the items with must neither limit nor charge them again.
+"""
 
 
 # These are thin subclasses of the `apify-client` pricing models. The Apify platform serializes Actor
@@ -208,7 +236,11 @@ class ChargingManager(Protocol):
     """
 
     charge_lock: ReentrantLock
-    """Lock to synchronize charge operations. Prevents race conditions between `charge` and `push_data` calls."""
+    """Lock to synchronize charge operations of the Actor's own code.
+
+    The SDK does not hold it - `charge` and `push_data` reserve the budget they charge instead, so they run
+    concurrently without overdrawing it.
+    """
 
     async def charge(self, event_name: str, *, count: int = 1) -> ChargeResult:
         """Charge for a specified number of events - sub-operations of the Actor.
@@ -275,6 +307,59 @@ class ChargingManager(Protocol):
         """Compute the maximum number of events of each type that can be charged within the current budget."""
 
 
+class ReservingChargingManager(ChargingManager, Protocol):
+    """A `ChargingManager` that reserves the budget for charges, which is how the SDK charges for pushed items.
+
+    Kept apart from the public `ChargingManager` protocol, so that its other implementations do not have to provide it.
+    """
+
+    def calculate_max_push_data_count_within_limit(self, charged_event_name: str | None = None) -> int | None:
+        """Calculate how many items `Actor.push_data` can push before we reach the configured limit.
+
+        The price of an item includes the synthetic `DEFAULT_DATASET_ITEM_EVENT` event. The calculation is cheap and
+        never blocks, so producers of items can use it to stop producing items that could not be pushed anyway.
+
+        Args:
+            charged_event_name: Name of the event charged for each item, as passed to `Actor.push_data`.
+
+        Returns:
+            The number of items, or `None` if it is not limited.
+        """
+
+    def reserve(self, event_names: Sequence[str], count: int) -> ChargeReservation:
+        """Reserve the budget for charging the given events, as many times as the budget allows, up to `count`.
+
+        The reservation is atomic, so the work to charge for can be done without any lock, while concurrent charges
+        cannot use the reserved budget. Every reservation has to be settled with `commit` or `refund` afterwards.
+
+        Args:
+            event_names: Names of the events charged for each occurrence, like an item of a dataset charged with both
+                an explicit and a synthetic event.
+            count: The number of occurrences to reserve the budget for.
+
+        Returns:
+            The reservation, with the number of occurrences the budget was reserved for.
+        """
+
+    async def commit(self, reservation: ChargeReservation, *, count: int | None = None) -> ChargeResult:
+        """Charge for the events of a reservation, and return the rest of the reserved budget.
+
+        Args:
+            reservation: The reservation to charge from.
+            count: The number of occurrences to charge for, at most the reserved count, which is the default.
+
+        Returns:
+            The result of charging the first event of the reservation.
+        """
+
+    def refund(self, reservation: ChargeReservation) -> None:
+        """Return the whole budget of a reservation, without charging anything.
+
+        Args:
+            reservation: The reservation to return.
+        """
+
+
 @docs_group('Charging')
 @dataclass(frozen=True)
 class ChargeResult:
@@ -290,6 +375,23 @@ class ChargeResult:
     """How many events of each known type can still be charged within the limit."""
 
 
+@dataclass(frozen=True, eq=False)
+class ChargeReservation:
+    """Budget reserved by the `ReservingChargingManager.reserve` method, until it is committed or refunded."""
+
+    event_names: tuple[str, ...]
+    """Names of the events charged for each occurrence."""
+
+    requested_count: int
+    """The number of occurrences the budget was requested for."""
+
+    count: int
+    """The number of occurrences the budget was reserved for - may be lower than the requested count."""
+
+    amount: Decimal
+    """The reserved amount of money."""
+
+
 @docs_group('Charging')
 @dataclass
 class ActorPricingInfo:
@@ -308,11 +410,14 @@ class ActorPricingInfo:
     """Price of every known event type."""
 
 
-class ChargingManagerImplementation(ChargingManager):
+class ChargingManagerImplementation(ReservingChargingManager):
     """Implementation of the `ChargingManager` Protocol - this is only meant to be instantiated internally."""
 
     LOCAL_CHARGING_LOG_DATASET_NAME = 'charging-log'
 
+    CHARGING_STATE_KEY = 'APIFY_CHARGING_STATE'
+    """Key of the record in the default key-value store the charging state is persisted to."""
+
     def __init__(self, configuration: Configuration, client: ApifyClientAsync) -> None:
         self._max_total_charge_usd = (
             configuration.max_total_charge_usd if configuration.max_total_charge_usd is not None else Decimal('inf')
@@ -325,16 +430,59 @@ class ChargingManagerImplementation(ChargingManager):
 
         self._client = client
         self._charging_log_dataset: Dataset | None = None
+        self._charging_log_buffer: list[dict[str, Any]] = []
 
         self._charging_state: dict[str, ChargingStateItem] = {}
         self._pricing_info: dict[str, PricingInfoItem] = {}
         self._tier_priced_events: set[str] = set()
 
+        self._total_charged_amount = Decimal()
+        """The running total of `_charging_state`."""
+
+        self._budget_unit_exponent = MIN_BUDGET_UNIT_EXPONENT
+        """The budget units all the amounts below are kept in are `10 ** -_budget_unit_exponent` dollars."""
+
+        self._event_price_units: dict[str, int] = {}
+        """Prices of the known events in budget units, rounded up only if they are finer than the finest unit."""
+
+        self._max_total_charge_units: int | None = None
+        """The budget in budget units, rounded down, or `None` if it is unlimited."""
+
+        self._total_charged_units = 0
+        """The running total of `_charging_state` in budget units, at the prices of `_event_price_units`."""
+
         self._not_ppe_warning_printed = False
         self.active = False
 
         self.charge_lock = ReentrantLock()
 
+        self._reservations: dict[ChargeReservation, int] = {}
+        """Reservations of the budget not committed or refunded yet, with their amounts in budget units."""
+
+        self._reserved_units = 0
+        """The part of the budget held by `_reservations`, in budget units."""
+
+        self._pending_charge_counts: dict[str, int] = {}
+        """Counts of the events charged locally and not yet submitted to the platform, by event name."""
+
+        self._unsubmitted_charges: list[_ChargeSubmission] = []
+        """Submissions of accumulated charges that were not confirmed by the platform yet, retried as they are."""
+
+        self._idempotency_key_prefix = token_hex(8)
+        """Makes the idempotency keys of the submissions of this instance unique, also across migrations of the run."""
+
+        self._submission_sequence = count_from()
+        """Sequence numbers of the submissions, part of their idempotency keys."""
+
+        self._flush_lock = asyncio.Lock()
+        """A lock serializing the submissions of accumulated charges."""
+
+        self._flush_requested = asyncio.Event()
+        """Set once enough charges accumulated to submit them before `CHARGE_FLUSH_INTERVAL` elapses."""
+
+        self._flush_task: asyncio.Task[None] | None = None
+        """The background task submitting the accumulated charges, if scheduled."""
+
     async def __aenter__(self) -> None:
         """Initialize the charging manager - this is called by the `Actor` class and shouldn't be invoked manually."""
         # Validate config
@@ -368,13 +516,25 @@ class ChargingManagerImplementation(ChargingManager):
                     # charge attempt is reported accurately rather than as an "unknown event".
                     self._tier_priced_events.add(event_name)
                     continue
-                self._pricing_info[event_name] = PricingInfoItem(
-                    price=Decimal(str(event_pricing.event_price_usd)),
-                    title=event_pricing.event_title,
+                self._add_event_pricing(
+                    event_name,
+                    PricingInfoItem(price=Decimal(str(event_pricing.event_price_usd)), title=event_pricing.event_title),
                 )
 
             self._max_total_charge_usd = max_total_charge_usd
 
+        # Precompute the budget for the budget checks
+        if self._max_total_charge_usd.is_finite():
+            self._fit_budget_unit(self._max_total_charge_usd)
+            self._max_total_charge_units = self._to_budget_units(self._max_total_charge_usd, rounding=ROUND_FLOOR)
+        else:
+            self._max_total_charge_units = None
+
+        # Reconcile the charged event counts with the state persisted before the run was migrated, which is more
+        # recent than the counts the run was started with, and resume submitting the charges persisted unsubmitted.
+        if self._pricing_model == 'PAY_PER_EVENT':
+            charged_event_counts = await self._restore_state(charged_event_counts)
+
         # Load charged event counts
         for event_name, count in charged_event_counts.items():
             price = self._pricing_info.get(event_name, PricingInfoItem(Decimal(), title='')).price
@@ -382,6 +542,8 @@ class ChargingManagerImplementation(ChargingManager):
                 charge_count=count,
                 total_charged_amount=count * price,
             )
+            self._total_charged_amount += count * price
+            self._total_charged_units += count * self._event_price_units.get(event_name, 0)
 
         # Set up charging log dataset for local development
         if not self._is_at_home and self._pricing_model == 'PAY_PER_EVENT':
@@ -408,8 +570,27 @@ class ChargingManagerImplementation(ChargingManager):
         if not self.active:
             raise RuntimeError('Exiting an uninitialized ChargingManager')
 
-        charging_manager_ctx.set(None)
-        self.active = False
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+
+        try:
+            await self.flush_charges()
+            for submission in self._unsubmitted_charges:
+                logger.error(
+                    f"Failed to submit {submission.count} charged occurrence(s) of event '{submission.event_name}' "
+                    'to the platform'
+                )
+        finally:
+            try:
+                await self.persist_state()
+            except Exception:
+                logger.exception('Failed to persist the charging state')
+
+            charging_manager_ctx.set(None)
+            self.active = False
 
     @_ensure_context
     async def charge(self, event_name: str, *, count: int = 1) -> ChargeResult:
@@ -434,93 +615,154 @@ class ChargingManagerImplementation(ChargingManager):
                 chargeable_within_limit=self.compute_chargeable(),
             )
 
-        async with self.charge_lock():
-            # Determine the maximum amount of events that can be charged within the budget
-            max_chargeable = self.calculate_max_event_charge_count_within_limit(event_name)
-            charged_count = min(count, max_chargeable if max_chargeable is not None else count)
+        result = await self.commit(self.reserve([event_name], count))
 
-            if charged_count == 0:
-                return ChargeResult(
-                    event_charge_limit_reached=True,
-                    charged_count=0,
-                    chargeable_within_limit=self.compute_chargeable(),
-                )
-
-            pricing_info = self._pricing_info.get(
-                event_name,
-                PricingInfoItem(
-                    # Use a nonzero price for local development so that the maximum budget can be reached.
-                    price=Decimal() if self._is_at_home else Decimal(1),
-                    title=f"Unknown event '{event_name}'",
-                ),
+        # If it is not possible to charge the full amount, log that fact
+        if 0 < result.charged_count < count:
+            subject = 'instance' if count == 1 else 'instances'
+            logger.info(
+                f"Charging {count} {subject} of '{event_name}' event would exceed max_total_charge_usd "
+                f'- only {result.charged_count} events were charged'
             )
 
-            # Update the charging state
-            self._charging_state.setdefault(event_name, ChargingStateItem(0, Decimal()))
-            self._charging_state[event_name].charge_count += charged_count
-            self._charging_state[event_name].total_charged_amount += charged_count * pricing_info.price
-
-            # If running on the platform, call the charge endpoint
-            if self._is_at_home:
-                if self._actor_run_id is None:
-                    raise RuntimeError('Actor run ID not configured')
-
-                if event_name.startswith('apify-'):
-                    # Synthetic events (e.g. apify-default-dataset-item) are tracked internally only,
-                    # the platform handles them automatically based on dataset writes.
-                    pass
-                elif event_name in self._pricing_info:
-                    await self._client.run(self._actor_run_id).charge(event_name, count=charged_count)
-                    logger.debug(f"Charged {charged_count} occurrence(s) of event '{event_name}'.")
-                elif event_name in self._tier_priced_events:
-                    logger.warning(
-                        f"Event '{event_name}' is tier-priced and is not chargeable via the pay-per-event API."
-                    )
-                else:
-                    logger.warning(f"Attempting to charge for an unknown event '{event_name}'")
-
-            # Log the charged operation (if enabled)
-            if self._charging_log_dataset:
-                await self._charging_log_dataset.push_data(
-                    {
-                        'event_name': event_name,
-                        'event_title': pricing_info.title,
-                        'event_price_usd': float(round(pricing_info.price, 3)),
-                        'charged_count': charged_count,
-                        'timestamp': datetime.now(UTC).isoformat(),
-                    }
-                )
+        return result
+
+    @_ensure_context
+    def reserve(self, event_names: Sequence[str], count: int) -> ChargeReservation:
+        # Runs that do not use the pay-per-event pricing model charge nothing, so there is no budget to reserve.
+        if self._pricing_model != 'PAY_PER_EVENT':
+            combined_price, combined_price_units = Decimal(), 0
+        else:
+            combined_price = sum((self._get_event_price(event_name) for event_name in event_names), start=Decimal())
+            combined_price_units = sum(self._get_event_price_units(event_name) for event_name in event_names)
+
+        reservation_count = count
+        max_count = self._calculate_max_count_within_limit(combined_price_units)
+        if max_count is not None:
+            reservation_count = min(count, max_count)
+
+        reservation = ChargeReservation(
+            event_names=tuple(event_names),
+            requested_count=count,
+            count=reservation_count,
+            amount=reservation_count * combined_price,
+        )
+        self._reservations[reservation] = reservation_count * combined_price_units
+        self._reserved_units += self._reservations[reservation]
+        return reservation
 
-            # If it is not possible to charge the full amount, log that fact
-            if charged_count < count:
-                subject = 'instance' if count == 1 else 'instances'
-                logger.info(
-                    f"Charging {count} {subject} of '{event_name}' event would exceed max_total_charge_usd "
-                    f'- only {charged_count} events were charged'
+    @_ensure_context
+    async def commit(self, reservation: ChargeReservation, *, count: int | None = None) -> ChargeResult:
+        self._release(reservation)
+        charged_count = reservation.count if count is None else max(0, min(count, reservation.count))
+        event_name = reservation.event_names[0]
+
+        # For runs that do not use the pay-per-event pricing model, just print a warning and return
+        if self._pricing_model != 'PAY_PER_EVENT':
+            if not self._not_ppe_warning_printed and not all(
+                name.startswith('apify-') for name in reservation.event_names
+            ):
+                logger.warning(
+                    'Ignored attempt to charge for an event - the Actor does not use the pay-per-event pricing'
                 )
+                self._not_ppe_warning_printed = True
 
             return ChargeResult(
-                event_charge_limit_reached=self.is_event_charge_limit_reached(event_name),
-                charged_count=charged_count,
+                event_charge_limit_reached=False,
+                charged_count=0,
                 chargeable_within_limit=self.compute_chargeable(),
             )
 
+        if charged_count > 0:
+            for name in reservation.event_names:
+                self._record_charge(name, charged_count)
+
+        if len(self._charging_log_buffer) >= CHARGING_LOG_BATCH_SIZE:
+            await self._flush_charging_log()
+
+        return ChargeResult(
+            event_charge_limit_reached=self.is_event_charge_limit_reached(event_name),
+            charged_count=charged_count,
+            chargeable_within_limit=self.compute_chargeable(),
+        )
+
+    @_ensure_context
+    def refund(self, reservation: ChargeReservation) -> None:
+        self._release(reservation)
+
+    async def flush_charges(self) -> None:
+        """Submit the charges accumulated so far to the platform, and write the buffered local charging log.
+
+        The charges of each event are submitted as a single charge, under an idempotency key that is kept when
+        the submission is retried, so the platform never charges them twice. Failed submissions are retried by the
+        next flush.
+        """
+        await self._flush_charging_log()
+
+        async with self._flush_lock:
+            self._flush_requested.clear()
+            self._prepare_submissions()
+            if not self._unsubmitted_charges:
+                return
+
+            submissions = self._unsubmitted_charges
+            results = await asyncio.gather(
+                *(self._submit_charge(submission) for submission in submissions), return_exceptions=True
+            )
+            self._unsubmitted_charges = [
+                submission
+                for submission, result in zip(submissions, results, strict=True)
+                if isinstance(result, BaseException)
+            ]
+
+    async def persist_state(self) -> None:
+        """Store the charging state to the default key-value store, so that it survives a migration of the run.
+
+        The state consists of the charged event counts and the charges not yet submitted to the platform. The latter
+        are stored with their idempotency keys, so the migrated run can submit them without charging any twice.
+        """
+        if self._pricing_model != 'PAY_PER_EVENT':
+            return
+
+        async with self._flush_lock:
+            self._prepare_submissions()
+            state = _PersistedChargingState(
+                run_id=self._actor_run_id,
+                charged_event_counts={
+                    event_name: item.charge_count for event_name, item in self._charging_state.items()
+                },
+                unsubmitted_charges=[
+                    _PersistedChargeSubmission(
+                        event_name=submission.event_name,
+                        count=submission.count,
+                        idempotency_key=submission.idempotency_key,
+                    )
+                    for submission in self._unsubmitted_charges
+                ],
+            )
+
+            kvs = await KeyValueStore.open()
+            await kvs.set_value(self.CHARGING_STATE_KEY, state.model_dump(mode='json', by_alias=True))
+
     @_ensure_context
     def calculate_total_charged_amount(self) -> Decimal:
-        return sum(
-            (item.total_charged_amount for item in self._charging_state.values()),
-            start=Decimal(),
-        )
+        return self._total_charged_amount
 
     @_ensure_context
     def calculate_max_event_charge_count_within_limit(self, event_name: str) -> int | None:
-        price = self._get_event_price(event_name)
+        return self._calculate_max_count_within_limit(self._get_event_price_units(event_name))
 
-        if not price:
+    @_ensure_context
+    def calculate_max_push_data_count_within_limit(self, charged_event_name: str | None = None) -> int | None:
+        # Runs that do not use the pay-per-event pricing model charge nothing for the items, like in `reserve`.
+        if self._pricing_model != 'PAY_PER_EVENT':
             return None
 
-        result = (self._max_total_charge_usd - self.calculate_total_charged_amount()) / price
-        return max(0, math.floor(result)) if result.is_finite() else None
+        price = self._get_event_price_units(DEFAULT_DATASET_ITEM_EVENT)
+        if charged_event_name is not None:
+            price += self._get_event_price_units(charged_event_name)
+
+        return self._calculate_max_count_within_limit(price)
 
     @_ensure_context
     def get_pricing_info(self) -> ActorPricingInfo:
@@ -552,16 +794,12 @@ class ChargingManagerImplementation(ChargingManager):
         *,
         is_default_dataset: bool,
     ) -> int:
-        explicit_price = self._get_event_price(event_name)
-        synthetic_price = self._get_event_price(DEFAULT_DATASET_ITEM_EVENT) if is_default_dataset else Decimal(0)
-        combined_price = explicit_price + synthetic_price
+        combined_price = self._get_event_price_units(event_name)
+        if is_default_dataset:
+            combined_price += self._get_event_price_units(DEFAULT_DATASET_ITEM_EVENT)
 
-        if not combined_price:
-            return items_count
-
-        result = (self._max_total_charge_usd - self.calculate_total_charged_amount()) / combined_price
-        max_count = max(0, math.floor(result)) if result.is_finite() else items_count
-        return min(items_count, max_count)
+        max_count = self._calculate_max_count_within_limit(combined_price)
+        return items_count if max_count is None else min(items_count, max_count)
 
     @_ensure_context
     def is_event_charge_limit_reached(self, event_name: str) -> bool:
@@ -617,12 +855,244 @@ class ChargingManagerImplementation(ChargingManager):
             ),
         )
 
+    async def _restore_state(self, charged_event_counts: dict[str, int]) -> dict[str, int]:
+        """Restore the charging state persisted by `persist_state` before the run was migrated, if any.
+
+        Only the state persisted by the same run on the platform is restored. A local run would otherwise pick up
+        the state left in its key-value store by a previous run, and an invalid state is ignored.
+
+        Returns:
+            The given charged event counts, raised to the persisted ones where those are higher.
+        """
+        if not self._is_at_home:
+            return charged_event_counts
+
+        kvs = await KeyValueStore.open()
+        value = await kvs.get_value(self.CHARGING_STATE_KEY)
+        if value is None:
+            return charged_event_counts
+
+        try:
+            state = _PersistedChargingState.model_validate(value)
+        except ValidationError:
+            logger.warning(f'Ignoring the invalid charging state stored under the "{self.CHARGING_STATE_KEY}" key')
+            return charged_event_counts
+
+        if state.run_id != self._actor_run_id:
+            logger.warning(
+                f'Ignoring the charging state stored under the "{self.CHARGING_STATE_KEY}" key by another run '
+                f'({state.run_id})'
+            )
+            return charged_event_counts
+
+        restored_counts = dict(charged_event_counts)
+        for event_name, count in state.charged_event_counts.items():
+            restored_counts[event_name] = max(restored_counts.get(event_name, 0), count)
+
+        self._unsubmitted_charges.extend(
+            _ChargeSubmission(
+                event_name=submission.event_name,
+                count=submission.count,
+                idempotency_key=submission.idempotency_key,
+            )
+            for submission in state.unsubmitted_charges
+        )
+        if self._unsubmitted_charges:
+            self._schedule_flush()
+
+        return restored_counts
+
+    def _prepare_submissions(self) -> None:
+        """Turn the pending charges into submissions, each under a new idempotency key."""
+        pending_charge_counts, self._pending_charge_counts = self._pending_charge_counts, {}
+        self._unsubmitted_charges.extend(
+            _ChargeSubmission(
+                event_name=event_name,
+                count=count,
+                idempotency_key=(
+                    f'{self._actor_run_id}-{event_name}-{self._idempotency_key_prefix}-'
+                    f'{next(self._submission_sequence)}'
+                ),
+            )
+            for event_name, count in pending_charge_counts.items()
+        )
+
+    def _calculate_max_count_within_limit(self, price_units: int) -> int | None:
+        """Calculate how many occurrences of the given price fit in the part of the budget neither charged nor reserved.
+
+        Returns:
+            The number of occurrences, or `None` if it is not limited - the price is zero or the budget unlimited.
+        """
+        if not price_units or self._max_total_charge_units is None:
+            return None
+
+        remaining = self._max_total_charge_units - self._total_charged_units - self._reserved_units
+        return max(0, remaining // price_units)
+
+    def _release(self, reservation: ChargeReservation) -> None:
+        """Return the budget reserved by the reservation, which is then settled."""
+        amount = self._reservations.pop(reservation, None)
+        if amount is None:
+            raise RuntimeError('The charge reservation was already committed or refunded')
+
+        self._reserved_units -= amount
+
+    def _record_charge(self, event_name: str, charged_count: int) -> None:
+        """Add charged events to the charging state, and have them charged by the platform and logged."""
+        pricing_info = self._pricing_info.get(
+            event_name,
+            PricingInfoItem(
+                # Use a nonzero price for local development so that the maximum budget can be reached.
+                price=Decimal() if self._is_at_home else Decimal(1),
+                title=f"Unknown event '{event_name}'",
+            ),
+        )
+
+        # Update the charging state
+        self._charging_state.setdefault(event_name, ChargingStateItem(0, Decimal()))
+        self._charging_state[event_name].charge_count += charged_count
+        self._charging_state[event_name].total_charged_amount += charged_count * pricing_info.price
+        self._total_charged_amount += charged_count * pricing_info.price
+        self._total_charged_units += charged_count * self._get_event_price_units(event_name)
+
+        # If running on the platform, call the charge endpoint
+        if self._is_at_home:
+            if self._actor_run_id is None:
+                raise RuntimeError('Actor run ID not configured')
+
+            if event_name.startswith('apify-'):
+                # Synthetic events (e.g. apify-default-dataset-item) are tracked internally only,
+                # the platform handles them automatically based on dataset writes.
+                pass
+            elif event_name in self._pricing_info:
+                # The charge is submitted in the background, together with other charges of the same event.
+                self._queue_charge(event_name, charged_count)
+            elif event_name in self._tier_priced_events:
+                logger.warning(f"Event '{event_name}' is tier-priced and is not chargeable via the pay-per-event API.")
+            else:
+                logger.warning(f"Attempting to charge for an unknown event '{event_name}'")
+
+        # Log the charged operation (if enabled), the log is written in batches
+        if self._charging_log_dataset:
+            self._charging_log_buffer.append(
+                {
+                    'event_name': event_name,
+                    'event_title': pricing_info.title,
+                    'event_price_usd': float(round(pricing_info.price, 3)),
+                    'charged_count': charged_count,
+                    'timestamp': datetime.now(UTC).isoformat(),
+                }
+            )
+
+    async def _flush_charging_log(self) -> None:
+        """Write the buffered rows of the local charging log to its dataset.
+
+        A failed write is only logged, so that it never fails the charges themselves. The rows are kept for the next
+        write.
+        """
+        if self._charging_log_dataset is None or not self._charging_log_buffer:
+            return
+
+        rows, self._charging_log_buffer = self._charging_log_buffer, []
+        try:
+            await self._charging_log_dataset.push_data(rows)
+        except Exception:
+            # Keep the rows, in order, for the next write.
+            self._charging_log_buffer[:0] = rows
+            logger.exception('Failed to write the local charging log')
+        except BaseException:
+            self._charging_log_buffer[:0] = rows
+            raise
+
+    def _queue_charge(self, event_name: str, count: int) -> None:
+        """Add a charge to the ones to be submitted to the platform, and schedule their submission."""
+        self._pending_charge_counts[event_name] = self._pending_charge_counts.get(event_name, 0) + count
+
+        if sum(self._pending_charge_counts.values()) >= CHARGE_FLUSH_THRESHOLD:
+            self._flush_requested.set()
+
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_in_background())
+
+    async def _flush_in_background(self) -> None:
+        """Submit the accumulated charges once `CHARGE_FLUSH_INTERVAL` elapses or enough of them accumulate."""
+        with suppress(TimeoutError):
+            await asyncio.wait_for(self._flush_requested.wait(), CHARGE_FLUSH_INTERVAL.total_seconds())
+
+        try:
+            await self.flush_charges()
+        except Exception:
+            logger.exception('Failed to submit the accumulated charges')
+            # Retry after another `CHARGE_FLUSH_INTERVAL`, rather than right away.
+            self._flush_requested.clear()
+
+        # Charges queued during the flush, or ones whose submission failed, are submitted by another round.
+        self._flush_task = None
+        if self._pending_charge_counts or self._unsubmitted_charges:
+            self._schedule_flush()
+
+    async def _submit_charge(self, submission: _ChargeSubmission) -> None:
+        try:
+            await self._client.run(str(self._actor_run_id)).charge(
+                submission.event_name,
+                count=submission.count,
+                idempotency_key=submission.idempotency_key,
+            )
+        except Exception:
+            logger.warning(
+                f"Failed to submit {submission.count} charged occurrence(s) of event '{submission.event_name}', "
+                'the submission will be retried',
+                exc_info=True,
+            )
+            raise
+
+        logger.debug(f"Charged {submission.count} occurrence(s) of event '{submission.event_name}'.")
+
     def _get_event_price(self, event_name: str) -> Decimal:
         pricing_info = self._pricing_info.get(event_name)
         if pricing_info is not None:
             return pricing_info.price
         return Decimal(0) if self._is_at_home else Decimal(1)
 
+    def _add_event_pricing(self, event_name: str, pricing_info: PricingInfoItem) -> None:
+        """Add a chargeable event, with its price precomputed for the budget checks."""
+        self._pricing_info[event_name] = pricing_info
+        self._fit_budget_unit(pricing_info.price)
+        self._event_price_units[event_name] = self._to_budget_units(pricing_info.price, rounding=ROUND_CEILING)
+
+    def _get_event_price_units(self, event_name: str) -> int:
+        price = self._event_price_units.get(event_name)
+        if price is not None:
+            return price
+        return 0 if self._is_at_home else 10**self._budget_unit_exponent
+
+    def _fit_budget_unit(self, amount: Decimal) -> None:
+        """Make the budget unit fine enough to express the given amount in dollars exactly, if it is not yet.
+
+        All the amounts already kept in budget units are converted to the finer unit, which keeps them exact.
+        """
+        amount_exponent = amount.normalize().as_tuple().exponent
+        decimal_places = -amount_exponent if isinstance(amount_exponent, int) else 0
+        exponent = min(max(decimal_places, self._budget_unit_exponent), MAX_BUDGET_UNIT_EXPONENT)
+        if exponent == self._budget_unit_exponent:
+            return
+
+        factor = 10 ** (exponent - self._budget_unit_exponent)
+        self._budget_unit_exponent = exponent
+        self._event_price_units = {name: price * factor for name, price in self._event_price_units.items()}
+        if self._max_total_charge_units is not None:
+            self._max_total_charge_units *= factor
+        self._total_charged_units *= factor
+        self._reservations = {reservation: amount * factor for reservation, amount in self._reservations.items()}
+        self._reserved_units *= factor
+
+    def _to_budget_units(self, amount: Decimal, *, rounding: str) -> int:
+        """Convert an amount in dollars to whole budget units, rounded in the given direction."""
+        return int(amount.scaleb(self._budget_unit_exponent).to_integral_value(rounding=rounding))
+
 
 @dataclass
 class ChargingStateItem:
@@ -630,6 +1100,33 @@ class ChargingStateItem:
     total_charged_amount: Decimal
 
 
+@dataclass(frozen=True)
+class _ChargeSubmission:
+    event_name: str
+    count: int
+    idempotency_key: str
+
+
+class _PersistedChargeSubmission(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    event_name: str
+    count: int
+    idempotency_key: str
+
+
+class _PersistedChargingState(BaseModel):
+    """The charging state stored by `ChargingManagerImplementation.persist_state`."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    run_id: str | None
+    """ID of the run that stored the state."""
+
+    charged_event_counts: dict[str, int]
+    unsubmitted_charges: list[_PersistedChargeSubmission]
+
+
 @dataclass
 class PricingInfoItem:
     price: Decimal
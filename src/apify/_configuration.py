@@ -300,6 +300,25 @@ class Configuration(CrawleeConfiguration):
         ),
     ] = False
 
+    key_value_store_cache_max_records: Annotated[
+        int,
+        Field(
+            validation_alias='apify_key_value_store_cache_max_records',
+            description='How many records read from each Apify key-value store are cached in memory, 0 disables the '
+            'cache. Writes and deletes through the same store invalidate the cached records',
+        ),
+        BeforeValidator(_default_if_empty(default=0)),
+    ] = 0
+
+    key_value_store_cache_ttl: Annotated[
+        timedelta_ms,
+        Field(
+            validation_alias='apify_key_value_store_cache_ttl_millis',
+            description='How long a record read from an Apify key-value store is served from the cache, bounding how '
+            'long changes made by other clients stay unnoticed',
+        ),
+    ] = timedelta(seconds=60)
+
     max_paid_dataset_items: Annotated[
         int | None,
         Field(
@@ -374,6 +393,15 @@ class Configuration(CrawleeConfiguration):
         ),
     ] = 'http://proxy.apify.com'
 
+    request_queue_metadata_max_staleness: Annotated[
+        timedelta_ms,
+        Field(
+            validation_alias='apify_request_queue_metadata_max_staleness_millis',
+            description='How old the metadata of a shared Apify request queue used by multiple clients may get before '
+            'it is refreshed in the background, bounding how long changes made by other clients stay unnoticed',
+        ),
+    ] = timedelta(seconds=5)
+
     started_at: Annotated[
         datetime | None,
         Field(
@@ -406,6 +434,16 @@ class Configuration(CrawleeConfiguration):
         ),
     ] = 'http://localhost'
 
+    trust_default_storage_ids: Annotated[
+        bool,
+        Field(
+            validation_alias='apify_trust_default_storage_ids',
+            description='Open the default storages by their configured IDs without verifying that they exist first. '
+            'Saves a round trip per default storage opened, but the storages must exist, as they are not created',
+        ),
+        BeforeValidator(_default_if_empty(default=False)),
+    ] = False
+
     token: Annotated[
         str | None,
         Field(
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import MutableMapping
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, Final
+
+from crawlee._types import JsonSerializable
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from apify.storages import KeyValueStore
+
+logger = getLogger(__name__)
+
+DEFAULT_COMPACTION_INTERVAL: Final[int] = 20
+"""How many delta records are written at most before the state is compacted into a new snapshot."""
+
+
+class IncrementalState(MutableMapping[str, JsonSerializable]):
+    """A state dictionary persisted to a key-value store incrementally.
+
+    Instead of the whole state, each persist writes a delta record with only the top-level keys assigned or deleted
+    since the previous persist. The deltas are periodically compacted into a snapshot of the whole state, after which
+    they are deleted. The state is restored from the snapshot and the deltas written after it.
+
+    Only assignments and deletions of top-level keys are tracked. A nested value changed in place has to be assigned
+    to its key again (`state['progress'] = state['progress']`) for the change to be persisted.
+
+    Records are stored under `<key>_SNAPSHOT` and `<key>_DELTA_<sequence number>`. The snapshot records the
+    sequence number of the first delta not included in it, so deltas left over from an interrupted compaction are
+    ignored.
+
+    Only internal structure.
+    """
+
+    def __init__(
+        self,
+        *,
+        kvs: KeyValueStore,
+        key: str,
+        data: dict[str, JsonSerializable],
+        next_delta: int,
+        deltas_since_snapshot: int,
+        has_snapshot: bool,
+        compaction_interval: int = DEFAULT_COMPACTION_INTERVAL,
+    ) -> None:
+        """Initialize a new instance.
+
+        Preferably use the `IncrementalState.load` class method to create a new instance.
+        """
+        self._kvs = kvs
+        """The key-value store the state is persisted to."""
+
+        self._key = key
+        """The key the records of the state are derived from."""
+
+        self._data = data
+        """The current state."""
+
+        self._next_delta = next_delta
+        """Sequence number of the next delta record to write."""
+
+        self._deltas_since_snapshot = deltas_since_snapshot
+        """How many delta records were written since the snapshot."""
+
+        self._has_snapshot = has_snapshot
+        """Whether a snapshot was written, until then the state is compacted on every persist."""
+
+        self._compaction_interval = compaction_interval
+        """How many delta records are written at most before the state is compacted."""
+
+        self._dirty_keys = set[str]()
+        """Top-level keys assigned or deleted since the previous persist."""
+
+        self._persist_lock = asyncio.Lock()
+        """A lock serializing the persists of the state."""
+
+    @classmethod
+    async def load(
+        cls,
+        kvs: KeyValueStore,
+        key: str,
+        default_value: dict[str, JsonSerializable] | None = None,
+        *,
+        compaction_interval: int = DEFAULT_COMPACTION_INTERVAL,
+    ) -> IncrementalState:
+        """Restore the state from its snapshot and deltas, or create it from `default_value` if it was never stored.
+
+        Args:
+            kvs: The key-value store the state is persisted to.
+            key: The key the records of the state are derived from.
+            default_value: The initial state, if it was never stored.
+            compaction_interval: How many delta records are written at most before the state is compacted.
+        """
+        if compaction_interval < 1:
+            raise ValueError(f'compaction_interval must be at least 1, got {compaction_interval}')
+
+        snapshot = await kvs.get_value(_snapshot_key(key))
+        if snapshot is None:
+            data, next_delta = dict(default_value or {}), 0
+        else:
+            data, next_delta = snapshot['state'], snapshot['nextDelta']
+
+        deltas_since_snapshot = 0
+        while (delta := await kvs.get_value(_delta_key(key, next_delta))) is not None:
+            data.update(delta['set'])
+            for deleted_key in delta['deleted']:
+                data.pop(deleted_key, None)
+            next_delta += 1
+            deltas_since_snapshot += 1
+
+        return cls(
+            kvs=kvs,
+            key=key,
+            data=data,
+            next_delta=next_delta,
+            deltas_since_snapshot=deltas_since_snapshot,
+            has_snapshot=snapshot is not None,
+            compaction_interval=compaction_interval,
+        )
+
+    def __getitem__(self, key: str) -> JsonSerializable:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: JsonSerializable) -> None:
+        self._data[key] = value
+        self._dirty_keys.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+        self._dirty_keys.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._data!r})'
+
+    async def persist(self) -> None:
+        """Write the changes made since the previous persist, as a delta record or a new snapshot.
+
+        The state is compacted into a new snapshot once `compaction_interval` deltas were written since the previous
+        one, or once the changes cover at least half of the state, when the snapshot costs about as much as the delta.
+        The first persist always writes a snapshot, so the stored state never depends on the `default_value`. If the
+        write fails, the changes are written by the next persist.
+        """
+        async with self._persist_lock:
+            if not self._dirty_keys:
+                return
+
+            dirty_keys, self._dirty_keys = self._dirty_keys, set[str]()
+            try:
+                if (
+                    not self._has_snapshot
+                    or self._deltas_since_snapshot >= self._compaction_interval
+                    or len(dirty_keys) * 2 >= len(self._data)
+                ):
+                    await self._compact()
+                else:
+                    await self._write_delta(dirty_keys)
+            except BaseException:
+                self._dirty_keys |= dirty_keys
+                raise
+
+    async def _write_delta(self, dirty_keys: set[str]) -> None:
+        delta: dict[str, Any] = {
+            'set': {key: self._data[key] for key in dirty_keys if key in self._data},
+            'deleted': [key for key in dirty_keys if key not in self._data],
+        }
+        await self._kvs.set_value(_delta_key(self._key, self._next_delta), delta)
+        self._next_delta += 1
+        self._deltas_since_snapshot += 1
+
+    async def _compact(self) -> None:
+        first_obsolete_delta = self._next_delta - self._deltas_since_snapshot
+        snapshot = {'state': dict(self._data), 'nextDelta': self._next_delta}
+        await self._kvs.set_value(_snapshot_key(self._key), snapshot)
+        self._has_snapshot = True
+        self._deltas_since_snapshot = 0
+
+        # The snapshot supersedes the deltas, failing to delete them only leaves garbage behind.
+        results = await asyncio.gather(
+            *(
+                self._kvs.delete_value(_delta_key(self._key, sequence))
+                for sequence in range(first_obsolete_delta, self._next_delta)
+            ),
+            return_exceptions=True,
+        )
+        if any(isinstance(result, Exception) for result in results):
+            logger.warning(f'Failed to delete some of the obsolete delta records of the state {self._key!r}')
+
+
+def _snapshot_key(key: str) -> str:
+    return f'{key}_SNAPSHOT'
+
+
+def _delta_key(key: str, sequence: int) -> str:
+    return f'{key}_DELTA_{sequence}'
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 from asyncio import Lock
+from contextlib import asynccontextmanager
+from datetime import timedelta
 from functools import cached_property
 from logging import getLogger
-from typing import TYPE_CHECKING, ClassVar, Literal, overload
+from typing import TYPE_CHECKING, ClassVar, Final, Literal, overload
 
+from ._storage_metadata_cache import StorageMetadataCache
 from ._utils import hash_api_public_base_url_and_token
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncGenerator, Callable
     from types import TracebackType
 
     from apify_client import ApifyClientAsync
@@ -107,10 +111,12 @@ async def open_by_alias(
             resource_client = get_resource_client_by_id(storage_id)
             raw_metadata = await resource_client.get()
             if raw_metadata:
+                StorageMetadataCache.put(raw_metadata)
                 return resource_client
 
         # Create new unnamed storage and store alias mapping
         raw_metadata = await collection_client.get_or_create()
+        StorageMetadataCache.put(raw_metadata)
 
         await alias_resolver.store_mapping(storage_id=raw_metadata.id)
         return get_resource_client_by_id(raw_metadata.id)
@@ -123,6 +129,10 @@ class AliasResolver:
     default kvs as a storage for global mapping of aliases to storage ids. Same mapping is also kept in memory to avoid
     unnecessary calls to API and also have limited support of alias storages when not running on Apify platform. When on
     Apify platform, the storages created with alias are accessible by the same alias even after migration or reboot.
+
+    New mappings are written to the default kvs in batches: they are collected for `_FLUSH_WINDOW` and then merged
+    into the stored mapping with a single read and write, see `flush_mappings`. The in-memory mapping is updated
+    immediately and is authoritative, so the aliases resolve before their mapping is written.
     """
 
     _ALIAS_MAPPING_KEY = '__STORAGE_ALIASES_MAPPING'
@@ -131,14 +141,33 @@ class AliasResolver:
     _ALIAS_STORAGE_KEY_SEPARATOR = ','
     """Separator used in the storage key for storing the alias mapping."""
 
+    _FLUSH_WINDOW: Final[timedelta] = timedelta(seconds=1)
+    """How long new mappings are collected before they are written to the default kvs together."""
+
+    _MAX_FLUSH_ATTEMPTS: Final[int] = 3
+    """How many times a write of the mapping is retried when a concurrent write of another process overwrote it."""
+
     _alias_map: ClassVar[dict[str, str]] = {}
     """Map containing pre-existing alias storages and their ids. Global for all instances."""
 
     _alias_map_loaded: ClassVar[bool] = False
     """Tracks whether `_alias_map` was fetched from the default KVS — an empty map is a valid loaded state."""
 
-    _alias_init_lock: Lock | None = None
-    """Lock for creating alias storages. Only one alias storage can be created at the time. Global for all instances."""
+    _alias_init_locks: ClassVar[dict[str, Lock]] = {}
+    """Locks for creating alias storages, keyed by storage key. Global for all instances.
+
+    Only one storage can be created for an alias at the time, while storages of different aliases are created
+    concurrently.
+    """
+
+    _alias_map_lock: ClassVar[Lock | None] = None
+    """Lock serializing the loading of `_alias_map` and the writes of the mapping to the default KVS."""
+
+    _pending_mappings: ClassVar[dict[str, tuple[AliasResolver, str]]] = {}
+    """Mappings not written to the default KVS yet, keyed by storage key, with the resolver that stored them."""
+
+    _flush_task: ClassVar[asyncio.Task[None] | None] = None
+    """Task writing `_pending_mappings` once the current flush window elapses."""
 
     default_storage_key: ClassVar[str] = '__default__'
 
@@ -156,7 +185,7 @@ class AliasResolver:
 
     async def __aenter__(self) -> AliasResolver:
         """Context manager to prevent race condition in alias creation."""
-        lock = await self._get_alias_init_lock()
+        lock = self._get_alias_init_lock()
         await lock.acquire()
         return self
 
@@ -166,19 +195,84 @@ class AliasResolver:
         exc_value: BaseException | None,
         exc_traceback: TracebackType | None,
     ) -> None:
-        lock = await self._get_alias_init_lock()
+        lock = self._get_alias_init_lock()
         lock.release()
 
     @classmethod
-    async def _get_alias_init_lock(cls) -> Lock:
-        """Get lock for controlling the creation of the alias storages.
+    @asynccontextmanager
+    async def defer_mapping_persistence(cls) -> AsyncGenerator[None]:
+        """Write the alias mappings stored within the context to the default KVS as soon as the context exits.
 
-        The lock is shared for all instances of the AliasResolver class.
-        It is created in async method to ensure that some event loop is already running.
+        Used when opening many aliased storages concurrently, so their mappings are written in one batch, without
+        waiting for the end of the flush window.
         """
-        if cls._alias_init_lock is None:
-            cls._alias_init_lock = Lock()
-        return cls._alias_init_lock
+        try:
+            yield
+        finally:
+            await cls.flush_mappings()
+
+    @classmethod
+    async def flush_mappings(cls) -> None:
+        """Write all pending alias mappings to the default KVS.
+
+        The mappings are grouped by the default KVS they belong to, and each group is merged into the stored mapping
+        with a single read-modify-write. Mappings that fail to be written stay pending and are written by the next
+        flush. Called at the end of each flush window, and by the Actor on `PERSIST_STATE` and on exit.
+        """
+        current_task = asyncio.current_task()
+        if cls._flush_task is not None and cls._flush_task is not current_task and not cls._flush_task.done():
+            cls._flush_task.cancel()
+        cls._flush_task = None
+
+        async with cls._get_alias_map_lock():
+            pending, cls._pending_mappings = cls._pending_mappings, {}
+
+            groups: dict[tuple[str | None, ApifyClientAsync], tuple[AliasResolver, dict[str, str]]] = {}
+            for storage_key, (resolver, storage_id) in pending.items():
+                group_key = (
+                    resolver._configuration.default_key_value_store_id,  # noqa: SLF001 - instance of this class
+                    resolver._api_client,  # noqa: SLF001 - instance of this class
+                )
+                _, mappings = groups.setdefault(group_key, (resolver, {}))
+                mappings[storage_key] = storage_id
+
+            for resolver, mappings in groups.values():
+                try:
+                    await resolver._persist_mappings(mappings)  # noqa: SLF001 - instance of this class
+                except Exception as exc:
+                    logger.warning(f'Error storing alias mapping for {", ".join(mappings)}: {exc}')
+                    for storage_key, storage_id in mappings.items():
+                        # Mappings stored in the meantime are newer, keep them.
+                        cls._pending_mappings.setdefault(storage_key, (resolver, storage_id))
+
+    @classmethod
+    def _schedule_flush(cls) -> None:
+        """Make sure the pending mappings get written once the current flush window elapses."""
+        flush_task = cls._flush_task
+        if flush_task is None or flush_task.done() or flush_task.get_loop() is not asyncio.get_running_loop():
+            cls._flush_task = asyncio.create_task(cls._flush_after_window(), name='alias mapping flush')
+
+    @classmethod
+    async def _flush_after_window(cls) -> None:
+        await asyncio.sleep(cls._FLUSH_WINDOW.total_seconds())
+        await cls.flush_mappings()
+
+    def _get_alias_init_lock(self) -> Lock:
+        """Get lock for controlling the creation of the alias storage of this resolver's storage key.
+
+        The lock is shared for all instances of the AliasResolver class resolving the same storage key.
+        """
+        lock = AliasResolver._alias_init_locks.get(self._storage_key)
+        if lock is None:
+            lock = AliasResolver._alias_init_locks[self._storage_key] = Lock()
+        return lock
+
+    @classmethod
+    def _get_alias_map_lock(cls) -> Lock:
+        """Get the lock serializing the loading and persisting of the alias mapping."""
+        if cls._alias_map_lock is None:
+            cls._alias_map_lock = Lock()
+        return cls._alias_map_lock
 
     async def _get_alias_map(self) -> dict[str, str]:
         """Get the aliases and storage ids mapping from the default kvs.
@@ -189,11 +283,14 @@ class AliasResolver:
             Map of aliases and storage ids.
         """
         if not AliasResolver._alias_map_loaded and self._configuration.is_at_home:
-            default_kvs_client = self._get_default_kvs_client()
+            async with self._get_alias_map_lock():
+                # Another resolver could have loaded the mapping while this one was waiting for the lock.
+                if not AliasResolver._alias_map_loaded:
+                    default_kvs_client = self._get_default_kvs_client()
 
-            record = await default_kvs_client.get_record(self._ALIAS_MAPPING_KEY)
-            AliasResolver._alias_map = record.get('value', {}) if record else {}
-            AliasResolver._alias_map_loaded = True
+                    record = await default_kvs_client.get_record(self._ALIAS_MAPPING_KEY)
+                    AliasResolver._alias_map = record.get('value', {}) if record else {}
+                    AliasResolver._alias_map_loaded = True
 
         return AliasResolver._alias_map
 
@@ -218,7 +315,7 @@ class AliasResolver:
         return (await self._get_alias_map()).get(self._storage_key, None)
 
     async def store_mapping(self, storage_id: str) -> None:
-        """Add alias and related storage id to the mapping in default kvs and local in-memory mapping."""
+        """Add alias and related storage id to the local in-memory mapping and schedule its write to the default kvs."""
         # Update in-memory mapping
         alias_map = await self._get_alias_map()
         alias_map[self._storage_key] = storage_id
@@ -229,17 +326,42 @@ class AliasResolver:
             )
             return
 
+        # Write it together with the other mappings stored within the flush window.
+        AliasResolver._pending_mappings[self._storage_key] = (self, storage_id)
+        self._schedule_flush()
+
+    async def _persist_mappings(self, mappings: dict[str, str]) -> None:
+        """Merge the given storage keys and storage ids into the mapping in the default kvs.
+
+        The default kvs has no conditional writes, so a concurrent read-modify-write of another process (e.g. a
+        previous run still shutting down after a migration) can overwrite this one. The written mapping is therefore
+        read back and the write is retried if any of the given mappings is missing from it. Mappings stored with
+        a different storage id are replaced, as the in-memory mapping is the one this process resolves aliases with.
+
+        Must be called with the alias map lock held.
+        """
         default_kvs_client = self._get_default_kvs_client()
 
-        try:
+        for attempt in range(1, self._MAX_FLUSH_ATTEMPTS + 1):
             record = await default_kvs_client.get_record(self._ALIAS_MAPPING_KEY)
             value = record.get('value', {}) if record else {}
-            value[self._storage_key] = storage_id
 
-            # Store the mapping back in the KVS.
+            if conflicting := [key for key, storage_id in mappings.items() if value.get(key, storage_id) != storage_id]:
+                logger.warning(
+                    f'Alias mapping for {", ".join(conflicting)} was stored with other storage ids, replacing'
+                )
+
+            value.update(mappings)
             await default_kvs_client.set_record(key=self._ALIAS_MAPPING_KEY, value=value)
-        except Exception as exc:
-            logger.warning(f'Error storing alias mapping for {self._alias}: {exc}')
+
+            record = await default_kvs_client.get_record(self._ALIAS_MAPPING_KEY)
+            written_value = record.get('value', {}) if record else {}
+            if all(written_value.get(key) == storage_id for key, storage_id in mappings.items()):
+                return
+
+            logger.debug(f'Alias mapping was overwritten by a concurrent write (attempt {attempt}), retrying')
+
+        raise RuntimeError(f'Alias mapping was overwritten by concurrent writes {self._MAX_FLUSH_ATTEMPTS} times')
 
     @cached_property
     def _storage_key(self) -> str:
@@ -6,12 +6,20 @@ from apify_client import ApifyClientAsync
 from crawlee._utils.crypto import crypto_random_object_id
 
 from apify.storage_clients._apify._alias_resolving import AliasResolver, open_by_alias
+from apify.storage_clients._apify._storage_metadata_cache import StorageMetadataCache
 
 if TYPE_CHECKING:
     from apify_client._resource_clients import DatasetClientAsync, KeyValueStoreClientAsync, RequestQueueClientAsync
 
     from apify._configuration import Configuration
 
+_api_clients: dict[tuple[str, str, str], ApifyClientAsync] = {}
+"""API clients shared by all storage clients of this process, keyed by `(token, api_url, api_public_url)`.
+
+Each `ApifyClientAsync` owns its own HTTP client and connection pool, so reusing one per set of credentials saves
+a TLS handshake and an idle pool for every storage opened. Cleared by `clear_api_client_cache`.
+"""
+
 
 @overload
 async def create_storage_api_client(
@@ -75,7 +83,7 @@ async def create_storage_api_client(
     if sum(1 for param in [id, name, alias] if param is not None) > 1:
         raise ValueError('Only one of "id", "name", or "alias" can be specified, not multiple.')
 
-    apify_client = _create_api_client(configuration)
+    apify_client = _get_api_client(configuration)
 
     # Get storage-specific configuration
     if storage_type == 'KeyValueStore':
@@ -135,16 +143,21 @@ async def create_storage_api_client(
         # Open default storage.
         case (None, None, None, str() as default_id):
             resource_client = get_resource_client(default_id)
+            if configuration.trust_default_storage_ids:
+                return resource_client
+
             raw_metadata = await resource_client.get()
             # Default storage does not exist. Create a new one.
             if not raw_metadata:
                 raw_metadata = await collection_client.get_or_create()
                 resource_client = get_resource_client(raw_metadata.id)
+            StorageMetadataCache.put(raw_metadata)
             return resource_client
 
         # Open by name.
         case (None, str(), None, _):
             raw_metadata = await collection_client.get_or_create(name=name)
+            StorageMetadataCache.put(raw_metadata)
             return get_resource_client(raw_metadata.id)
 
         # Open by ID.
@@ -153,11 +166,31 @@ async def create_storage_api_client(
             raw_metadata = await resource_client.get()
             if raw_metadata is None:
                 raise ValueError(f'Opening {storage_type} with id={id} failed.')
+            StorageMetadataCache.put(raw_metadata)
             return resource_client
 
     raise RuntimeError('Unreachable code')
 
 
+def clear_api_client_cache() -> None:
+    """Drop the API clients shared by the storage clients, releasing their connection pools once unused.
+
+    Called when the Actor exits. Storage clients opened before keep working with the client they already hold,
+    storages opened afterwards get a new one. The storage metadata remembered by opens is dropped as well.
+    """
+    _api_clients.clear()
+    StorageMetadataCache.clear()
+
+
+def _get_api_client(configuration: Configuration) -> ApifyClientAsync:
+    """Get the API client shared by the storage clients using the credentials of the given Configuration."""
+    key = (configuration.token or '', configuration.api_base_url, configuration.api_public_base_url)
+    api_client = _api_clients.get(key)
+    if api_client is None:
+        api_client = _api_clients[key] = _create_api_client(configuration)
+    return api_client
+
+
 def _create_api_client(configuration: Configuration) -> ApifyClientAsync:
     """Create and validate an ApifyClientAsync from the given Configuration."""
     if not configuration.token:
@@ -2,22 +2,22 @@ from __future__ import annotations
 
 import asyncio
 import json
-from collections.abc import Sequence
 from logging import getLogger
 from typing import TYPE_CHECKING
 
 from typing_extensions import override
 
+from apify_client._models import Dataset
 from crawlee._utils.byte_size import ByteSize
 from crawlee.storage_clients._base import DatasetClient
 from crawlee.storage_clients.models import DatasetItemsListPage, DatasetMetadata
 
 from ._api_client_creation import create_storage_api_client
-from apify._charging import charge_lock_if_charging
+from ._storage_metadata_cache import StorageMetadataCache
 from apify.storage_clients._ppe_dataset_mixin import DatasetClientPpeMixin
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator, Mapping
+    from collections.abc import AsyncIterable, AsyncIterator, Iterable, Mapping, Sequence
 
     from apify_client._resource_clients import DatasetClientAsync
     from crawlee._types import JsonSerializable
@@ -56,7 +56,7 @@ class ApifyDatasetClient(DatasetClient, DatasetClientPpeMixin):
 
     @override
     async def get_metadata(self) -> DatasetMetadata:
-        metadata = await self._api_client.get()
+        metadata = StorageMetadataCache.take(self._api_client.resource_id, Dataset) or await self._api_client.get()
 
         if metadata is None:
             raise ValueError('Failed to retrieve dataset metadata.')
@@ -128,25 +128,26 @@ class ApifyDatasetClient(DatasetClient, DatasetClientPpeMixin):
 
     @override
     async def drop(self) -> None:
+        self._count_drop()
         await self._api_client.delete()
 
     @override
-    async def push_data(self, data: Sequence[Mapping[str, JsonSerializable]] | Mapping[str, JsonSerializable]) -> None:
-        # Pushing mutates no client state - `push_items` is a stateless API call - so concurrent pushes only need
-        # the charge lock, which keeps the limit reservation and the charge atomic for pay-per-event runs.
-        async with charge_lock_if_charging():
-            items = data if isinstance(data, Sequence) else [data]
-            if not items:
-                return
-            limit = self._compute_limit_for_push(len(items))
-            items = items[:limit]
-
-            offset = 0
-            while offset < len(items):
-                chunk, offset = await asyncio.to_thread(self._serialize_chunk, items, offset)
-                await self._api_client.push_items(items=chunk)
-
-            await self._charge_for_items(count_items=limit)
+    async def push_data(
+        self,
+        data: Iterable[Mapping[str, JsonSerializable]]
+        | AsyncIterable[Mapping[str, JsonSerializable]]
+        | Mapping[str, JsonSerializable],
+    ) -> None:
+        # Pushing mutates no client state - `push_items` is a stateless API call - and the budget of pay-per-event
+        # runs is reserved before the upload, so concurrent pushes run in parallel.
+        await self._push_items(data, self._push_batch)
+
+    async def _push_batch(self, items: Sequence[Mapping[str, JsonSerializable]]) -> None:
+        """Upload items in chunks within the payload size limit."""
+        offset = 0
+        while offset < len(items):
+            chunk, offset = await asyncio.to_thread(self._serialize_chunk, items, offset)
+            await self._api_client.push_items(items=chunk)
 
     @override
     async def get_data(
@@ -1,20 +1,35 @@
 from __future__ import annotations
 
 import asyncio
+import json
+from contextlib import asynccontextmanager, suppress
 from logging import getLogger
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
+from weakref import WeakValueDictionary
 
 from typing_extensions import override
 
+from apify_client._models import KeyValueStore
 from crawlee.storage_clients._base import KeyValueStoreClient
 from crawlee.storage_clients.models import KeyValueStoreRecord, KeyValueStoreRecordMetadata
 
 from ._api_client_creation import create_storage_api_client
+from ._key_value_store_record_cache import KeyValueStoreRecordCache
 from ._models import ApifyKeyValueStoreMetadata
+from ._storage_metadata_cache import StorageMetadataCache
+from apify.storage_clients._key_value_store_bulk_mixin import KeyValueStoreClientBulkMixin
+from apify.storage_clients._key_value_store_streaming import (
+    KeyValueStoreRecordStream,
+    guess_content_type,
+    write_chunks_to_file,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    import os
+    from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
 
+    from apify_client._models import ListOfKeys
     from apify_client._resource_clients import KeyValueStoreClientAsync
 
     from apify import Configuration
@@ -22,7 +37,7 @@ if TYPE_CHECKING:
 logger = getLogger(__name__)
 
 
-class ApifyKeyValueStoreClient(KeyValueStoreClient):
+class ApifyKeyValueStoreClient(KeyValueStoreClient, KeyValueStoreClientBulkMixin):
     """An Apify platform implementation of the key-value store client."""
 
     def __init__(
@@ -30,6 +45,7 @@ class ApifyKeyValueStoreClient(KeyValueStoreClient):
         *,
         api_client: KeyValueStoreClientAsync,
         lock: asyncio.Lock,
+        record_cache: KeyValueStoreRecordCache | None = None,
     ) -> None:
         """Initialize a new instance.
 
@@ -39,11 +55,22 @@ class ApifyKeyValueStoreClient(KeyValueStoreClient):
         """The Apify KVS client for API operations."""
 
         self._lock = lock
-        """A lock to ensure that only one operation is performed at a time."""
+        """A lock serializing the drops of the store."""
+
+        self._key_locks = WeakValueDictionary[str, asyncio.Lock]()
+        """Locks serializing the writes of each key, so writes of different keys run concurrently.
+
+        Weakly referenced, so a lock lives only while some write of its key is in progress.
+        """
+
+        self._record_cache = record_cache
+        """Cache of the records read from the store, `None` if caching is disabled."""
 
     @override
     async def get_metadata(self) -> ApifyKeyValueStoreMetadata:
-        metadata = await self._api_client.get()
+        metadata = (
+            StorageMetadataCache.take(self._api_client.resource_id, KeyValueStore) or await self._api_client.get()
+        )
 
         if metadata is None:
             raise ValueError('Failed to retrieve key-value store metadata.')
@@ -97,9 +124,18 @@ class ApifyKeyValueStoreClient(KeyValueStoreClient):
             name=name,
             id=id,
         )
+        record_cache = (
+            KeyValueStoreRecordCache(
+                max_records=configuration.key_value_store_cache_max_records,
+                ttl=configuration.key_value_store_cache_ttl,
+            )
+            if configuration.key_value_store_cache_max_records > 0
+            else None
+        )
         return cls(
             api_client=api_client,
             lock=asyncio.Lock(),
+            record_cache=record_cache,
         )
 
     @override
@@ -112,60 +148,210 @@ class ApifyKeyValueStoreClient(KeyValueStoreClient):
     @override
     async def drop(self) -> None:
         async with self._lock:
-            await self._api_client.delete()
+            try:
+                await self._api_client.delete()
+            finally:
+                if self._record_cache is not None:
+                    self._record_cache.clear()
 
     @override
     async def get_value(self, *, key: str) -> KeyValueStoreRecord | None:
+        if self._record_cache is None:
+            response = await self._api_client.get_record(key)
+            return KeyValueStoreRecord.model_validate(response) if response else None
+
+        is_cached, record = self._record_cache.get(key)
+        if is_cached:
+            return record
+
+        generation = self._record_cache.get_generation()
         response = await self._api_client.get_record(key)
-        return KeyValueStoreRecord.model_validate(response) if response else None
+        record = KeyValueStoreRecord.model_validate(response) if response else None
+        self._record_cache.put(key, record, generation=generation)
+        return record
 
     @override
-    async def set_value(self, *, key: str, value: Any, content_type: str | None = None) -> None:
-        async with self._lock:
-            await self._api_client.set_record(
-                key=key,
-                value=value,
-                content_type=content_type,
-            )
+    async def set_value(
+        self,
+        *,
+        key: str,
+        value: Any,
+        content_type: str | None = None,
+        pre_serialized: bool = False,
+    ) -> None:
+        """Store a value in a record.
+
+        JSON values are serialized by `json.dumps` without the whitespace between tokens, bytes-like values are
+        uploaded without being copied where possible.
+
+        Args:
+            key: The key of the record to store.
+            value: The value of the record.
+            content_type: The content type of the value, inferred from the value if not given.
+            pre_serialized: Whether the value is the already serialized content of the record, to be uploaded as is.
+                It must be bytes-like or a string then.
+        """
+        value, content_type = _serialize_value(value, content_type=content_type, pre_serialized=pre_serialized)
+
+        async with self._get_key_lock(key):
+            try:
+                await self._api_client.set_record(
+                    key=key,
+                    value=value,
+                    content_type=content_type,
+                )
+            finally:
+                # Invalidate once the write is done, so a read racing with it cannot cache the previous record.
+                if self._record_cache is not None:
+                    self._record_cache.invalidate(key)
 
     @override
     async def delete_value(self, *, key: str) -> None:
-        async with self._lock:
-            await self._api_client.delete_record(key=key)
+        async with self._get_key_lock(key):
+            try:
+                await self._api_client.delete_record(key=key)
+            finally:
+                if self._record_cache is not None:
+                    self._record_cache.invalidate(key)
 
-    @override
-    async def iterate_keys(
+    @asynccontextmanager
+    async def stream_value(self, *, key: str) -> AsyncGenerator[KeyValueStoreRecordStream | None]:
+        """Retrieve a record with its value downloaded in chunks, as they arrive.
+
+        The value is not parsed, its chunks are the raw bytes of the record, whatever its content type. The record
+        cache is bypassed. The download is closed on exit from the context.
+
+        Args:
+            key: The key of the record to retrieve.
+
+        Returns:
+            A context manager yielding the record, or `None` if it does not exist.
+        """
+        async with self._api_client.stream_record(key) as response:
+            if response is None:
+                yield None
+                return
+
+            http_response = response['value']
+            # The content length is the size of the value only if the response is not compressed.
+            content_length = http_response.headers.get('content-length')
+            is_encoded = http_response.headers.get('content-encoding', 'identity') != 'identity'
+
+            yield KeyValueStoreRecordStream(
+                metadata=KeyValueStoreRecordMetadata(
+                    key=key,
+                    content_type=response['content_type'],
+                    size=int(content_length) if content_length and not is_encoded else None,
+                ),
+                chunks=http_response.aiter_bytes(),
+            )
+
+    async def save_value_to_file(self, *, key: str, path: str | os.PathLike[str]) -> bool:
+        """Download the value of a record into a file, holding one chunk of it in memory at a time.
+
+        The file is replaced atomically once the whole value is downloaded.
+
+        Args:
+            key: The key of the record to download.
+            path: The file to write the value to.
+
+        Returns:
+            Whether the record exists. If it does not, the file is left untouched.
+        """
+        async with self.stream_value(key=key) as record:
+            if record is None:
+                return False
+
+            await write_chunks_to_file(record.chunks, Path(path))
+            return True
+
+    async def set_value_from_file(
         self,
         *,
-        exclusive_start_key: str | None = None,
-        limit: int | None = None,
-    ) -> AsyncIterator[KeyValueStoreRecordMetadata]:
-        count = 0
+        key: str,
+        path: str | os.PathLike[str],
+        content_type: str | None = None,
+    ) -> None:
+        """Store the content of a file as the value of a record, as is.
 
-        while True:
-            list_key_page = await self._api_client.list_keys(exclusive_start_key=exclusive_start_key)
+        The API client accepts request bodies only as a whole, so the file is read into memory once, and uploaded
+        as the raw bytes of the record, without any serialization.
 
-            for item in list_key_page.items:
-                record_metadata = KeyValueStoreRecordMetadata(
-                    key=item.key,
-                    size=item.size,
-                    content_type='application/octet-stream',  # Content type not available from list_keys
-                )
-                yield record_metadata
-                count += 1
+        Args:
+            key: The key of the record to store.
+            path: The file to upload.
+            content_type: The content type of the value, guessed from the file name if not given.
+        """
+        content = await asyncio.to_thread(Path(path).read_bytes)
+        await self.set_value(
+            key=key, value=content, content_type=content_type or guess_content_type(path), pre_serialized=True
+        )
 
-                # If we've reached the limit, stop yielding
-                if limit and count >= limit:
-                    break
+    async def set_value_from_stream(
+        self,
+        *,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        content_type: str = 'application/octet-stream',
+    ) -> None:
+        """Store the given chunks of bytes as the value of a record.
 
-            # If we've reached the limit or there are no more pages, exit the loop
-            if (limit and count >= limit) or not list_key_page.is_truncated:
-                break
+        The API client accepts request bodies only as a whole, so the chunks are joined before the upload.
 
-            exclusive_start_key = list_key_page.next_exclusive_start_key
+        Args:
+            key: The key of the record to store.
+            chunks: The value of the record, in chunks.
+            content_type: The content type of the value.
+        """
+        content = b''.join([chunk async for chunk in chunks])
+        await self.set_value(key=key, value=content, content_type=content_type, pre_serialized=True)
+
+    @override
+    async def iterate_keys(
+        self,
+        *,
+        exclusive_start_key: str | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[KeyValueStoreRecordMetadata]:
+        remaining = limit or None
+
+        def fetch_page(start_key: str | None) -> asyncio.Task[ListOfKeys]:
+            # Ask only for as many keys as are still needed.
+            return asyncio.create_task(self._api_client.list_keys(exclusive_start_key=start_key, limit=remaining))
+
+        next_page: asyncio.Task[ListOfKeys] | None = fetch_page(exclusive_start_key)
+        try:
+            while next_page is not None:
+                list_key_page = await next_page
+                next_page = None
+
+                items = list_key_page.items if remaining is None else list_key_page.items[:remaining]
+                if remaining is not None:
+                    remaining -= len(items)
+
+                # Fetch the next page while the current one is consumed.
+                if list_key_page.is_truncated and (remaining is None or remaining > 0):
+                    next_page = fetch_page(list_key_page.next_exclusive_start_key)
+
+                for item in items:
+                    yield KeyValueStoreRecordMetadata(
+                        key=item.key,
+                        size=item.size,
+                        content_type='application/octet-stream',  # Content type not available from list_keys
+                    )
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+                with suppress(asyncio.CancelledError, Exception):
+                    await next_page
 
     @override
     async def record_exists(self, *, key: str) -> bool:
+        if self._record_cache is not None:
+            is_cached, record = self._record_cache.get(key)
+            if is_cached:
+                return record is not None
+
         return await self._api_client.record_exists(key=key)
 
     @override
@@ -179,3 +365,41 @@ class ApifyKeyValueStoreClient(KeyValueStoreClient):
             A public URL that can be used to access the value of the given key in the KVS.
         """
         return await self._api_client.get_record_public_url(key=key)
+
+    def _get_key_lock(self, key: str) -> asyncio.Lock:
+        """Get the lock serializing the writes of the given key."""
+        lock = self._key_locks.get(key)
+        if lock is None:
+            lock = self._key_locks[key] = asyncio.Lock()
+        return lock
+
+
+def _serialize_value(value: Any, *, content_type: str | None, pre_serialized: bool) -> tuple[Any, str | None]:
+    """Serialize a record value into the body of the upload, where it is cheaper than in the API client.
+
+    Bytes-like values and strings are left to the API client, which uploads them as they are, except memory views,
+    which it does not accept. So are file-like values, which it reads. Anything else is serialized into JSON here.
+    """
+    if isinstance(value, memoryview):
+        return _memoryview_to_bytes(value), content_type or 'application/octet-stream'
+
+    if isinstance(value, (bytes, bytearray, str)):
+        return value, content_type
+
+    if pre_serialized:
+        raise TypeError(f'A pre-serialized value must be bytes-like or a string, got {type(value).__name__}.')
+
+    if callable(getattr(value, 'read', None)) or (content_type is not None and 'application/json' not in content_type):
+        return value, content_type
+
+    # The same JSON as the API client would produce, only without the whitespace: values the standard JSON encoder
+    # cannot serialize are stringified, and NaN and infinities are rejected.
+    body = json.dumps(value, ensure_ascii=False, allow_nan=False, default=str, separators=(',', ':')).encode()
+    return body, content_type or 'application/json; charset=utf-8'
+
+
+def _memoryview_to_bytes(view: memoryview) -> bytes:
+    """Get the bytes of a memory view, without copying them if it spans a whole `bytes` object."""
+    if isinstance(view.obj, bytes) and view.c_contiguous and view.nbytes == len(view.obj):
+        return view.obj
+    return view.tobytes()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import copy
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from crawlee.storage_clients.models import KeyValueStoreRecord
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+
+class KeyValueStoreRecordCache:
+    """Bounded least-recently-used cache of the records read from a key-value store.
+
+    Records (and the absence of records) read through `ApifyKeyValueStoreClient.get_value` are kept for `ttl`, so
+    records read over and over again, like configuration or lookup tables, cost one API call per `ttl`. Writes and
+    deletes of the same client invalidate the affected key, changes made by other clients become visible once the
+    cached record expires.
+
+    Only internal structure.
+    """
+
+    def __init__(self, *, max_records: int, ttl: timedelta) -> None:
+        self._max_records = max_records
+        """How many records are kept at most, the least recently used ones are evicted first."""
+
+        self._ttl = ttl.total_seconds()
+        """How long a record is served from the cache, in seconds."""
+
+        self._entries = OrderedDict[str, tuple[float, KeyValueStoreRecord | None]]()
+        """Cached records (`None` for missing ones) with the monotonic time they were read at, most recent last."""
+
+        self._generation = 0
+        """How many times the cache was invalidated, see `get_generation`."""
+
+    def get(self, key: str) -> tuple[bool, KeyValueStoreRecord | None]:
+        """Look up the record of the given key.
+
+        Returns:
+            Whether the key is cached, and if so, a copy of the cached record or `None` if the record does not exist.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        read_at, record = entry
+        if time.monotonic() - read_at > self._ttl:
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, _copy_record(record)
+
+    def get_generation(self) -> int:
+        """Get a token to pass to `put`, to detect an invalidation while a record was being read.
+
+        Any invalidation counts, not only the one of the record being read. That keeps no state per key, at the cost
+        of occasionally not caching a record read concurrently with a write of another key.
+        """
+        return self._generation
+
+    def put(self, key: str, record: KeyValueStoreRecord | None, *, generation: int) -> None:
+        """Cache the record read for the given key, unless the cache was invalidated since `generation` was taken."""
+        if generation != self._generation:
+            return
+
+        self._entries[key] = (time.monotonic(), _copy_record(record))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_records:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Forget the record of the given key, including any read of it that is in progress."""
+        self._entries.pop(key, None)
+        self._generation += 1
+
+    def clear(self) -> None:
+        """Forget all records."""
+        self._entries.clear()
+        self._generation += 1
+
+
+def _copy_record(record: KeyValueStoreRecord | None) -> KeyValueStoreRecord | None:
+    """Copy a record with a mutable value, so changes of the value by its holder do not leak into the cache."""
+    if record is None or isinstance(record.value, (str, bytes, int, float, bool, type(None))):
+        return record
+    return record.model_copy(update={'value': copy.deepcopy(record.value)})
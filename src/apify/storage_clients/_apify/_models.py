@@ -98,9 +98,6 @@ class CachedRequest(BaseModel):
     hydrated: Request | None = None
     """The hydrated request object (the original one)."""
 
-    lock_expires_at: datetime | None = None
-    """The expiration time of the lock on the request."""
-
 
 @docs_group('Storage data')
 class ApifyRequestQueueMetadata(RequestQueueMetadata):
@@ -5,15 +5,18 @@ from typing import TYPE_CHECKING, Final, Literal
 
 from typing_extensions import override
 
+from apify_client._models import RequestQueue
 from crawlee.storage_clients._base import RequestQueueClient
 
 from ._api_client_creation import create_storage_api_client
 from ._models import ApifyRequestQueueMetadata, RequestQueueStats
 from ._request_queue_shared_client import ApifyRequestQueueSharedClient
 from ._request_queue_single_client import ApifyRequestQueueSingleClient
+from ._storage_metadata_cache import StorageMetadataCache
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
+    from datetime import timedelta
 
     from apify_client._resource_clients import RequestQueueClientAsync
     from crawlee.storage_clients.models import AddRequestsResponse, ProcessedRequest, RequestQueueMetadata
@@ -40,6 +43,7 @@ class ApifyRequestQueueClient(RequestQueueClient):
         api_client: RequestQueueClientAsync,
         metadata: RequestQueueMetadata,
         access: Literal['single', 'shared'] = 'single',
+        metadata_max_staleness: timedelta | None = None,
     ) -> None:
         """Initialize a new instance.
 
@@ -61,6 +65,7 @@ class ApifyRequestQueueClient(RequestQueueClient):
                 metadata=metadata,
                 cache_size=self._MAX_CACHED_REQUESTS,
                 metadata_getter=self.get_metadata,
+                metadata_max_staleness=metadata_max_staleness,
             )
         else:
             raise RuntimeError(f"Unsupported access type: {access}. Allowed values are 'single' or 'shared'.")
@@ -76,7 +81,7 @@ class ApifyRequestQueueClient(RequestQueueClient):
         Returns:
             Request queue metadata with accurate counts and timestamps, combining API data with local estimates.
         """
-        metadata = await self._api_client.get()
+        metadata = StorageMetadataCache.take(self._api_client.resource_id, RequestQueue) or await self._api_client.get()
 
         if metadata is None:
             raise ValueError('Failed to fetch request queue metadata from the API.')
@@ -121,8 +126,9 @@ class ApifyRequestQueueClient(RequestQueueClient):
                 Mutually exclusive with `id` and `alias`.
             alias: Alias for the request queue (scoped to current Actor run, creates unnamed storage).
                 Mutually exclusive with `id` and `name`.
-            configuration: Configuration object containing API credentials (`token`, `api_base_url`) and
-                optionally a `default_request_queue_id` for fallback when no identifier is provided.
+            configuration: Configuration object containing API credentials (`token`, `api_base_url`),
+                optionally a `default_request_queue_id` for fallback when no identifier is provided, and the
+                `request_queue_metadata_max_staleness` used with the `shared` access.
             access: Access mode controlling the client's behavior:
                 - `single`: Optimized for single-consumer scenarios (lower API usage, better performance).
                 - `shared`: Optimized for multi-consumer scenarios (more API calls, guaranteed consistency).
@@ -142,16 +148,19 @@ class ApifyRequestQueueClient(RequestQueueClient):
             id=id,
         )
 
-        # Fetch initial metadata from the API.
-        raw_metadata = await api_client.get()
+        # Fetch initial metadata from the API, unless opening the queue just did.
+        raw_metadata = StorageMetadataCache.take(api_client.resource_id, RequestQueue) or await api_client.get()
         if raw_metadata is None:
             raise ValueError('Failed to retrieve request queue metadata from the API.')
         metadata = ApifyRequestQueueMetadata.model_validate(raw_metadata.model_dump(by_alias=True))
+        # Hand it over to the `get_metadata` call following the open as well.
+        StorageMetadataCache.put(raw_metadata)
 
         return cls(
             api_client=api_client,
             metadata=metadata,
             access=access,
+            metadata_max_staleness=configuration.request_queue_metadata_max_staleness,
         )
 
     @override
@@ -163,6 +172,8 @@ class ApifyRequestQueueClient(RequestQueueClient):
 
     @override
     async def drop(self) -> None:
+        if isinstance(self._implementation, ApifyRequestQueueSharedClient):
+            await self._implementation.close()
         await self._api_client.delete()
 
     @override
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-from collections import deque
 from datetime import UTC, datetime, timedelta
 from logging import getLogger
 from typing import TYPE_CHECKING, Any, Final
@@ -11,6 +10,7 @@ from cachetools import LRUCache
 from crawlee.storage_clients.models import AddRequestsResponse, ProcessedRequest, RequestQueueMetadata
 
 from ._models import ApifyRequestQueueMetadata, CachedRequest, RequestQueueHead
+from ._request_queue_shared_head import SharedRequestQueueHead
 from ._utils import (
     resolve_awaited_in_flight,
     settle_pending_addition,
@@ -35,6 +35,9 @@ class ApifyRequestQueueSharedClient:
     from the same queue. It makes more frequent API calls to ensure consistency across all consumers and uses
     request locking to prevent duplicate processing.
 
+    All shared clients of the same queue in one process share a single `SharedRequestQueueHead`, so requests locked
+    by one of them are handed to whichever client fetches next, instead of each client locking its own batch.
+
     This class is used internally by `ApifyRequestQueueClient` when `access='shared'` is specified.
 
     Public methods are not individually documented as they implement the interface defined in `RequestQueueClient`.
@@ -56,6 +59,9 @@ class ApifyRequestQueueSharedClient:
     _VERIFICATION_BATCH_SIZE: Final[int] = 10
     """How many requests `is_finished` confirms with the platform in parallel."""
 
+    _DEFAULT_METADATA_MAX_STALENESS: Final[timedelta] = timedelta(seconds=5)
+    """The default for how old the platform metadata used by `_get_metadata_estimate` may get before a refresh."""
+
     def __init__(
         self,
         *,
@@ -63,6 +69,7 @@ class ApifyRequestQueueSharedClient:
         metadata: RequestQueueMetadata,
         cache_size: int,
         metadata_getter: Callable[[], Coroutine[Any, Any, ApifyRequestQueueMetadata]],
+        metadata_max_staleness: timedelta | None = None,
     ) -> None:
         """Initialize a new shared request queue client instance.
 
@@ -73,6 +80,8 @@ class ApifyRequestQueueSharedClient:
             metadata: Initial metadata for the request queue.
             cache_size: Maximum number of requests to cache locally.
             metadata_getter: Async function to fetch current metadata from the API.
+            metadata_max_staleness: How old the platform metadata may get before it is refreshed in the background
+                when other clients work with the queue. Defaults to `_DEFAULT_METADATA_MAX_STALENESS`.
         """
         self.metadata = metadata
         """Current metadata for the request queue."""
@@ -80,14 +89,31 @@ class ApifyRequestQueueSharedClient:
         self._metadata_getter = metadata_getter
         """Async function to fetch the latest metadata from the API."""
 
+        self._metadata_max_staleness = (
+            self._DEFAULT_METADATA_MAX_STALENESS if metadata_max_staleness is None else metadata_max_staleness
+        )
+        """How old `_platform_metadata` may get before `_get_metadata_estimate` refreshes it."""
+
+        self._platform_metadata: ApifyRequestQueueMetadata | None = None
+        """The last metadata fetched by `_metadata_getter`, reused by `_get_metadata_estimate` until it is stale."""
+
+        self._platform_metadata_fetched_at: datetime | None = None
+        """When `_platform_metadata` was fetched."""
+
+        self._platform_metadata_local_counts = (0, 0)
+        """The local `(total_request_count, handled_request_count)` when `_platform_metadata` was fetched.
+
+        The local counts that changed since are merged into the cached platform metadata as deltas.
+        """
+
+        self._metadata_refresh_task: asyncio.Task[None] | None = None
+        """The in-flight background refresh of `_platform_metadata`, if any."""
+
         self._api_client = api_client
         """The Apify API client for communication with Apify platform."""
 
-        self._queue_head = deque[str]()
-        """Local cache of request IDs from the request queue head for efficient fetching."""
-
-        self._requests_in_progress = set[str]()
-        """Request IDs handed to a consumer and not yet handled or reclaimed, tracked to avoid double-handing."""
+        self._head = SharedRequestQueueHead.get_or_create(queue_id=metadata.id, api_client=api_client)
+        """Locally locked queue head, shared with the other shared clients of this queue in the process."""
 
         self._requests_cache: LRUCache[str, CachedRequest] = LRUCache(maxsize=cache_size)
         """LRU cache storing request objects, keyed by request ID."""
@@ -112,14 +138,27 @@ class ApifyRequestQueueSharedClient:
         which holds up to a million entries and is consulted on every poll of the crawler's finished check.
         """
 
-        self._queue_has_locked_requests: bool | None = None
-        """Whether the queue contains requests currently locked by other clients."""
+    @staticmethod
+    async def release_all_unused_locks() -> None:
+        """Release the unused locks of every shared request queue in this process, see `release_unused_locks`."""
+        await SharedRequestQueueHead.release_all_unused_locks()
+
+    async def release_unused_locks(self) -> None:
+        """Release the platform locks of requests locked in the shared queue head but never handed to a consumer.
 
-        self._should_check_for_forefront_requests = False
-        """Flag indicating whether to refresh the queue head to check for newly added forefront requests."""
+        `list_and_lock_head` locks a whole batch of requests at once. When the Actor stops consuming (it is migrating,
+        aborting or exiting), the part of the batch it never handed out would otherwise stay locked until the lock
+        expires, and other consumers of the queue would sit idle in the meantime. Requests already in progress keep
+        their locks. Failures are only logged, an unreleased lock simply expires on its own.
+        """
+        await self._head.release_unused_locks()
 
-        self._fetch_lock = asyncio.Lock()
-        """Lock to prevent race conditions during concurrent fetch operations."""
+    async def close(self) -> None:
+        """Cancel and await the in-flight background refresh of the platform metadata, if any."""
+        refresh_task, self._metadata_refresh_task = self._metadata_refresh_task, None
+        if refresh_task is not None and not refresh_task.done():
+            refresh_task.cancel()
+            await asyncio.gather(refresh_task, return_exceptions=True)
 
     async def add_batch_of_requests(
         self,
@@ -239,34 +278,26 @@ class ApifyRequestQueueSharedClient:
     async def fetch_next_request(self) -> Request | None:
         """Specific implementation of this method for the RQ shared access mode."""
         # Ensure the queue head has requests if available. Fetching the head with lock to prevent race conditions.
-        async with self._fetch_lock:
+        async with self._head.fetch_lock:
             await self._ensure_head_is_non_empty()
 
-            # Pick the next request this client can safely process: one it is not already processing, and whose
-            # platform lock has not lapsed (an expired lock may have been taken over by another consumer).
+            # Pick the next request this client can safely process: one not already being processed in this process.
+            # Requests whose platform lock lapsed were already pruned from the head by `_ensure_head_is_non_empty`.
             now = datetime.now(tz=UTC)
             next_request_id: str | None = None
             lock_expires_at: datetime | None = None
-            while self._queue_head:
-                candidate_id = self._queue_head.popleft()
+            while self._head.queue_head:
+                candidate_id = self._head.queue_head.popleft()
+                candidate_lock_expires_at = self._head.untrack_lock(candidate_id)
 
-                if candidate_id in self._requests_in_progress:
+                if candidate_id in self._head.requests_in_progress:
                     # Already handed to a consumer in this process; do not process it twice.
                     continue
 
-                cached = self._requests_cache.get(candidate_id)
-                if cached is not None and cached.lock_expires_at is not None and cached.lock_expires_at <= now:
-                    logger.debug(
-                        'Skipping a queued request whose lock has expired; it may have been taken over by another '
-                        'client and will be re-fetched with a fresh lock if still available',
-                        extra={'next_request_id': candidate_id},
-                    )
-                    continue
-
                 # Reserve the request before releasing the fetch lock so a concurrent fetch cannot pick it too.
-                self._requests_in_progress.add(candidate_id)
+                self._head.requests_in_progress.add(candidate_id)
                 next_request_id = candidate_id
-                lock_expires_at = cached.lock_expires_at if cached is not None else None
+                lock_expires_at = candidate_lock_expires_at
                 break
 
             # If queue head is empty after ensuring, there are no requests
@@ -275,7 +306,7 @@ class ApifyRequestQueueSharedClient:
 
         # Make sure the consumer gets the request with a lock window long enough to process it.
         if not await self._ensure_lock_window(next_request_id, lock_expires_at=lock_expires_at, now=now):
-            self._requests_in_progress.discard(next_request_id)
+            self._head.requests_in_progress.discard(next_request_id)
             return None
 
         request = await self._get_or_hydrate_request(next_request_id)
@@ -286,7 +317,7 @@ class ApifyRequestQueueSharedClient:
                 'Cannot find a request from the beginning of queue, will be retried later',
                 extra={'next_request_id': next_request_id},
             )
-            self._requests_in_progress.discard(next_request_id)
+            self._head.requests_in_progress.discard(next_request_id)
             return None
 
         # If the request was already handled, skip it
@@ -295,7 +326,7 @@ class ApifyRequestQueueSharedClient:
                 'Request fetched from the beginning of queue was already handled',
                 extra={'next_request_id': next_request_id},
             )
-            self._requests_in_progress.discard(next_request_id)
+            self._head.requests_in_progress.discard(next_request_id)
             return None
 
         # `_get_or_hydrate_request` may return a request from the queue-head cache, which is populated by
@@ -307,7 +338,7 @@ class ApifyRequestQueueSharedClient:
                 'Request fetched from the beginning of queue was not found in the RQ',
                 extra={'next_request_id': next_request_id},
             )
-            self._requests_in_progress.discard(next_request_id)
+            self._head.requests_in_progress.discard(next_request_id)
             return None
 
         return request
@@ -316,7 +347,7 @@ class ApifyRequestQueueSharedClient:
         """Specific implementation of this method for the RQ shared access mode."""
         request_id = unique_key_to_request_id(request.unique_key)
         # The consumer is done with this request; stop tracking it as in progress.
-        self._requests_in_progress.discard(request_id)
+        self._head.requests_in_progress.discard(request_id)
         # Set the handled_at timestamp if not already set
         if request.handled_at is None:
             request.handled_at = datetime.now(tz=UTC)
@@ -358,10 +389,10 @@ class ApifyRequestQueueSharedClient:
             request.handled_at = None
 
         # Reclaim with lock to prevent race conditions that could lead to double processing of the same request.
-        async with self._fetch_lock:
+        async with self._head.fetch_lock:
             request_id = unique_key_to_request_id(request.unique_key)
             # The consumer is giving the request back; stop tracking it as in progress so it can be handed out again.
-            self._requests_in_progress.discard(request_id)
+            self._head.requests_in_progress.discard(request_id)
             try:
                 # Update the request in the API.
                 processed_request = await self._update_request(request, forefront=forefront)
@@ -384,7 +415,7 @@ class ApifyRequestQueueSharedClient:
                 # If we're adding to the forefront, we need to check for forefront requests
                 # in the next list_head call
                 if forefront:
-                    self._should_check_for_forefront_requests = True
+                    self._head.should_check_for_forefront_requests = True
 
             except Exception:
                 logger.exception(f'Error reclaiming request {request.unique_key}')
@@ -396,16 +427,16 @@ class ApifyRequestQueueSharedClient:
         """Specific implementation of this method for the RQ shared access mode."""
         # Check _list_head.
         # Without the lock the `is_empty` is prone to falsely report True with some low probability race condition.
-        async with self._fetch_lock:
+        async with self._head.fetch_lock:
             return await self._is_empty()
 
     async def is_finished(self) -> bool:
         """Specific implementation of this method for the RQ shared access mode."""
-        async with self._fetch_lock:
-            # `_is_empty` has to be awaited first: listing the head is what refreshes `_queue_has_locked_requests`,
-            # which stays `None` until then. A request this client is still processing keeps the queue unfinished even
-            # when the head lists empty.
-            if not await self._is_empty() or self._queue_has_locked_requests or self._requests_in_progress:
+        async with self._head.fetch_lock:
+            # `_is_empty` has to be awaited first: listing the head is what refreshes `queue_has_locked_requests`,
+            # which stays `None` until then. A request still being processed in this process keeps the queue
+            # unfinished even when the head lists empty.
+            if not await self._is_empty() or self._head.queue_has_locked_requests or self._head.requests_in_progress:
                 return False
 
             # The head listing is eventually consistent: it can miss a just-added request (and report no locked
@@ -459,7 +490,8 @@ class ApifyRequestQueueSharedClient:
     async def _is_empty(self) -> bool:
         """Check whether anything is available to fetch. Lock-free core of `is_empty`, caller must hold the lock."""
         head = await self._list_head(limit=1)
-        return len(head.items) == 0
+        # The shared head may hold requests another client of this queue listed, which this client has not cached.
+        return len(head.items) == 0 and not self._head.queue_head
 
     async def _get_metadata_estimate(self) -> RequestQueueMetadata:
         """Try to get cached metadata first. If multiple clients, fuse with global metadata.
@@ -467,12 +499,59 @@ class ApifyRequestQueueSharedClient:
         This method is used internally to avoid unnecessary API call unless needed (multiple clients).
         Local estimation of metadata is without delay, unlike metadata from API. In situation where there is only one
         client, it is the better choice.
-        """
-        if self.metadata.had_multiple_clients:
-            return await self._metadata_getter()
 
-        # Get local estimation (will not include changes done bo another client)
-        return self.metadata
+        With multiple clients, the global metadata is cached and reused for up to `_metadata_max_staleness`, merged
+        with the changes done locally since it was fetched. Once stale, it is refreshed in the background while the
+        stale copy keeps being served, so only the very first call waits for the API.
+        """
+        if not self.metadata.had_multiple_clients:
+            # Get local estimation (will not include changes done bo another client)
+            return self.metadata
+
+        if self._platform_metadata is None:
+            await self._refresh_platform_metadata()
+        elif (
+            self._platform_metadata_fetched_at is None
+            or datetime.now(tz=UTC) - self._platform_metadata_fetched_at >= self._metadata_max_staleness
+        ) and (self._metadata_refresh_task is None or self._metadata_refresh_task.done()):
+            self._metadata_refresh_task = asyncio.create_task(self._refresh_platform_metadata_in_background())
+
+        return self._merge_local_metadata_deltas()
+
+    async def _refresh_platform_metadata(self) -> None:
+        """Fetch the global metadata of the queue and remember the local counts it corresponds to."""
+        local_counts = (self.metadata.total_request_count, self.metadata.handled_request_count)
+        self._platform_metadata = await self._metadata_getter()
+        self._platform_metadata_fetched_at = datetime.now(tz=UTC)
+        self._platform_metadata_local_counts = local_counts
+
+    async def _refresh_platform_metadata_in_background(self) -> None:
+        """Refresh the cached global metadata, keeping the stale copy if the refresh fails."""
+        try:
+            await self._refresh_platform_metadata()
+        except Exception as exc:
+            logger.debug(f'Failed to refresh the request queue metadata: {exc!s}')
+
+    def _merge_local_metadata_deltas(self) -> RequestQueueMetadata:
+        """Merge the local changes done since `_platform_metadata` was fetched into it."""
+        platform_metadata = self._platform_metadata
+        if platform_metadata is None:
+            return self.metadata
+
+        total_at_fetch, handled_at_fetch = self._platform_metadata_local_counts
+        added_count = self.metadata.total_request_count - total_at_fetch
+        handled_count = self.metadata.handled_request_count - handled_at_fetch
+
+        return platform_metadata.model_copy(
+            update={
+                'total_request_count': platform_metadata.total_request_count + added_count,
+                'handled_request_count': platform_metadata.handled_request_count + handled_count,
+                'pending_request_count': max(platform_metadata.pending_request_count + added_count - handled_count, 0),
+                'modified_at': max(platform_metadata.modified_at, self.metadata.modified_at),
+                'accessed_at': max(platform_metadata.accessed_at, self.metadata.accessed_at),
+                'had_multiple_clients': True,
+            }
+        )
 
     async def _get_request_by_id(self, request_id: str) -> Request | None:
         response = await self._api_client.get_request(request_id)
@@ -484,12 +563,24 @@ class ApifyRequestQueueSharedClient:
 
     async def _ensure_head_is_non_empty(self) -> None:
         """Ensure that the queue head has requests if they are available in the queue."""
+        # Requests whose lock lapsed must not be handed out, so they do not count towards the head.
+        self._prune_expired_locks()
+
         # If queue head has adequate requests, skip fetching more
-        if len(self._queue_head) > 1 and not self._should_check_for_forefront_requests:
+        if len(self._head.queue_head) > 1 and not self._head.should_check_for_forefront_requests:
             return
 
-        # Fetch requests from the API and populate the queue head
+        # Fetch requests from the API and populate the queue head, dropping any that were listed with a lapsed lock.
         await self._list_head()
+        self._prune_expired_locks()
+
+    def _prune_expired_locks(self) -> None:
+        """Drop every request whose lock has lapsed from the shared queue head."""
+        if pruned_count := self._head.prune_expired_locks(datetime.now(tz=UTC)):
+            logger.debug(
+                f'Dropped {pruned_count} queued requests whose lock has expired; they may have been taken over by '
+                'another client and will be re-fetched with a fresh lock if still available'
+            )
 
     async def _ensure_lock_window(
         self,
@@ -517,7 +608,7 @@ class ApifyRequestQueueSharedClient:
             return True
 
         try:
-            lock_info = await self._api_client.prolong_request_lock(
+            lock_info = await self._head.api_client.prolong_request_lock(
                 request_id,
                 lock_duration=self._DEFAULT_LOCK_TIME,
             )
@@ -530,9 +621,6 @@ class ApifyRequestQueueSharedClient:
             logger.debug(f'Lock of request {request_id} could not be re-acquired, skipping it')
             return False
 
-        if (cached := self._requests_cache.get(request_id)) is not None:
-            cached.lock_expires_at = lock_info.lock_expires_at
-
         return True
 
     async def _get_or_hydrate_request(self, request_id: str) -> Request | None:
@@ -560,7 +648,7 @@ class ApifyRequestQueueSharedClient:
             if not request:
                 return None
 
-            # Cache the hydrated request, preserving any known lock expiry for `fetch_next_request`'s liveness check.
+            # Cache the hydrated request.
             self._cache_request(
                 cache_key=request_id,
                 processed_request=ProcessedRequest(
@@ -570,7 +658,6 @@ class ApifyRequestQueueSharedClient:
                     was_already_handled=request.handled_at is not None,
                 ),
                 hydrated_request=request,
-                lock_expires_at=cached_entry.lock_expires_at if cached_entry else None,
             )
         except Exception as exc:
             logger.debug(f'Error fetching request {request_id}: {exc!s}')
@@ -595,7 +682,8 @@ class ApifyRequestQueueSharedClient:
         """
         request_dict = request.model_dump(by_alias=True)
         request_dict['id'] = unique_key_to_request_id(request.unique_key)
-        response = await self._api_client.update_request(
+        # Go through the lock owner: the request may still be locked by it, and the lock is bound to its client key.
+        response = await self._head.api_client.update_request(
             request=request_dict,
             forefront=forefront,
         )
@@ -618,11 +706,11 @@ class ApifyRequestQueueSharedClient:
             A collection of requests from the beginning of the queue.
         """
         # Return from cache if available and we're not checking for new forefront requests
-        if self._queue_head and not self._should_check_for_forefront_requests:
-            logger.debug(f'Using cached queue head with {len(self._queue_head)} requests')
+        if self._head.queue_head and not self._head.should_check_for_forefront_requests:
+            logger.debug(f'Using cached queue head with {len(self._head.queue_head)} requests')
             # Create a list of requests from the cached queue head
             items = []
-            for request_id in list(self._queue_head)[:limit]:
+            for request_id in list(self._head.queue_head)[:limit]:
                 cached_request = self._requests_cache.get(request_id)
                 if cached_request and cached_request.hydrated:
                     items.append(cached_request.hydrated)
@@ -635,22 +723,22 @@ class ApifyRequestQueueSharedClient:
                 queue_modified_at=metadata.modified_at,
                 items=items,
                 lock_time=None,
-                queue_has_locked_requests=self._queue_has_locked_requests,
+                queue_has_locked_requests=self._head.queue_has_locked_requests,
             )
         leftover_buffer = list[str]()
-        if self._should_check_for_forefront_requests:
-            leftover_buffer = list(self._queue_head)
-            self._queue_head.clear()
-            self._should_check_for_forefront_requests = False
+        if self._head.should_check_for_forefront_requests:
+            leftover_buffer = list(self._head.queue_head)
+            self._head.queue_head.clear()
+            self._head.should_check_for_forefront_requests = False
 
         # Otherwise fetch from API
-        locked_queue_head = await self._api_client.list_and_lock_head(
+        locked_queue_head = await self._head.api_client.list_and_lock_head(
             lock_duration=self._DEFAULT_LOCK_TIME,
             limit=limit,
         )
 
         # Update the queue head cache
-        self._queue_has_locked_requests = locked_queue_head.queue_has_locked_requests
+        self._head.queue_has_locked_requests = locked_queue_head.queue_has_locked_requests
         # Check if there is another client working with the RequestQueue
         self.metadata.had_multiple_clients = locked_queue_head.had_multiple_clients
 
@@ -669,13 +757,11 @@ class ApifyRequestQueueSharedClient:
                 )
                 continue
 
-            # Skip requests this client is already processing (e.g. re-listed after their lock lapsed). Re-adding
-            # them would hand the same request to a second consumer in this process.
-            if request_id in self._requests_in_progress:
+            # Skip requests already being processed in this process (e.g. re-listed after their lock lapsed).
+            # Re-adding them would hand the same request to a second consumer.
+            if request_id in self._head.requests_in_progress:
                 continue
 
-            # Cache the request together with its lock expiry, so `fetch_next_request` can tell whether the lock is
-            # still held before handing the request to a consumer.
             self._cache_request(
                 request_id,
                 ProcessedRequest(
@@ -685,13 +771,15 @@ class ApifyRequestQueueSharedClient:
                     was_already_handled=False,
                 ),
                 hydrated_request=request,
-                lock_expires_at=request_data.lock_expires_at,
             )
-            self._queue_head.append(request_id)
+            # Track the lock expiry, so `fetch_next_request` can tell whether the lock is still held before handing
+            # the request to a consumer.
+            self._head.track_lock(request_id, request_data.lock_expires_at)
+            self._head.queue_head.append(request_id)
 
         for leftover_id in leftover_buffer:
             # After adding new requests to the forefront, any existing leftover locked request is kept in the end.
-            self._queue_head.append(leftover_id)
+            self._head.queue_head.append(leftover_id)
 
         return RequestQueueHead.from_client_locked_head(locked_queue_head)
 
@@ -701,7 +789,6 @@ class ApifyRequestQueueSharedClient:
         processed_request: ProcessedRequest,
         *,
         hydrated_request: Request | None = None,
-        lock_expires_at: datetime | None = None,
     ) -> None:
         """Cache a request for future use.
 
@@ -709,7 +796,6 @@ class ApifyRequestQueueSharedClient:
             cache_key: The key to use for caching the request. It should be request ID.
             processed_request: The processed request information.
             hydrated_request: The hydrated request object, if available.
-            lock_expires_at: When the platform lock on the request expires, if it is currently locked by this client.
         """
         if processed_request.id is None:
             raise ValueError('ProcessedRequest must have an ID to be cached.')
@@ -718,7 +804,6 @@ class ApifyRequestQueueSharedClient:
             id=processed_request.id,
             was_already_handled=processed_request.was_already_handled,
             hydrated=hydrated_request,
-            lock_expires_at=lock_expires_at,
         )
 
         if processed_request.was_already_handled:
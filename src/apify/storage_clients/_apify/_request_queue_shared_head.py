@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections import deque
+from datetime import datetime
+from logging import getLogger
+from typing import TYPE_CHECKING, ClassVar, Final
+from weakref import WeakValueDictionary
+
+if TYPE_CHECKING:
+    from apify_client._resource_clients import RequestQueueClientAsync
+
+logger = getLogger(__name__)
+
+
+class SharedRequestQueueHead:
+    """Locally locked head of a request queue, shared by all shared-mode clients of that queue in this process.
+
+    Several crawlers in one process may open the same queue with `access='shared'`, each getting its own
+    `ApifyRequestQueueSharedClient`. Without coordination, each of them would list and lock its own batch of requests
+    through the API, competing for the same locks and leaving its batch idle while another client's consumers are
+    starving. Sharing one head per queue makes the process a single consumer from the platform's point of view:
+    requests locked by one `list_and_lock_head` call are handed to whichever in-process client fetches next.
+
+    Platform locks are bound to the client key of the API client that acquired them, so every lock-related call
+    (listing and locking the head, prolonging, deleting locks and updating locked requests) goes through the API client
+    of the first client that opened the queue.
+
+    Only internal structure, use `SharedRequestQueueHead.get_or_create` to obtain an instance.
+    """
+
+    _instances: ClassVar[WeakValueDictionary[tuple[str, object], SharedRequestQueueHead]] = WeakValueDictionary()
+    """Heads of the queues opened in shared mode in this process, keyed by queue ID and the HTTP client of the API.
+
+    Storage API clients with the same credentials (token and API URL) share one HTTP client, see `_get_api_client`.
+    Clients of the same queue opened with different credentials therefore never share a head, so none of them
+    acquires platform locks with the credentials of another.
+
+    Weakly referenced, so a head lives exactly as long as some client of its queue does.
+    """
+
+    _LOCK_EXPIRY_HEAP_SLACK: Final[int] = 100
+    """How many stale entries `_lock_expiry_heap` may hold beyond the tracked locks before it is compacted."""
+
+    def __init__(self, *, api_client: RequestQueueClientAsync) -> None:
+        self.api_client = api_client
+        """The API client owning the platform locks of this head."""
+
+        self.queue_head = deque[str]()
+        """IDs of requests locked by this process and not yet handed to a consumer, in the order to process them."""
+
+        self.requests_in_progress = set[str]()
+        """Request IDs handed to a consumer and not yet handled or reclaimed, tracked to avoid double-handing."""
+
+        self.lock_expires_at = dict[str, datetime]()
+        """When the platform lock of each request in `queue_head` expires, keyed by request ID.
+
+        Maintained via `track_lock` and `untrack_lock`, which keep `_lock_expiry_heap` in sync with it.
+        """
+
+        self._lock_expiry_heap = list[tuple[datetime, str]]()
+        """Min-heap of `(lock_expires_at, request_id)` pairs, an expiry index over `lock_expires_at`.
+
+        Lets `prune_expired_locks` find every lapsed lock without scanning the queue head. Entries are removed lazily:
+        an entry whose expiry no longer matches `lock_expires_at` is stale and ignored once it surfaces. Stale entries
+        are bounded by compacting the heap once they outnumber the tracked locks by `_LOCK_EXPIRY_HEAP_SLACK`.
+        """
+
+        self.queue_has_locked_requests: bool | None = None
+        """Whether the queue contains requests currently locked by other clients."""
+
+        self.should_check_for_forefront_requests = False
+        """Flag indicating whether to refresh the queue head to check for newly added forefront requests."""
+
+        self.fetch_lock = asyncio.Lock()
+        """Lock to prevent race conditions during concurrent fetch operations of all clients sharing this head."""
+
+    @classmethod
+    def get_or_create(cls, *, queue_id: str, api_client: RequestQueueClientAsync) -> SharedRequestQueueHead:
+        """Get the head of the given queue, creating it with `api_client` as the lock owner if it does not exist yet.
+
+        Only clients using the same credentials share a head, see `_instances`.
+
+        Args:
+            queue_id: ID of the request queue.
+            api_client: The API client of the calling client, it owns the platform locks if the head is created.
+        """
+        key = (queue_id, api_client._http_client)  # noqa: SLF001 - the client has no public identity of credentials
+        head = cls._instances.get(key)
+        if head is None:
+            head = cls(api_client=api_client)
+            cls._instances[key] = head
+        return head
+
+    @classmethod
+    async def release_all_unused_locks(cls) -> None:
+        """Release the unused locks of every shared head in this process, see `release_unused_locks`."""
+        await asyncio.gather(*(head.release_unused_locks() for head in list(cls._instances.values())))
+
+    def track_lock(self, request_id: str, lock_expires_at: datetime) -> None:
+        """Record the expiry of the platform lock this process holds on a request in the queue head."""
+        self.lock_expires_at[request_id] = lock_expires_at
+        heapq.heappush(self._lock_expiry_heap, (lock_expires_at, request_id))
+
+        if len(self._lock_expiry_heap) > 2 * len(self.lock_expires_at) + self._LOCK_EXPIRY_HEAP_SLACK:
+            self._compact_lock_expiry_heap()
+
+    def untrack_lock(self, request_id: str) -> datetime | None:
+        """Stop tracking the lock of a request leaving the queue head and return its expiry, if it was known."""
+        return self.lock_expires_at.pop(request_id, None)
+
+    def prune_expired_locks(self, now: datetime) -> int:
+        """Drop every request whose lock has lapsed from the queue head, in one pass.
+
+        An expired lock may have been taken over by another consumer, so such a request must not be handed out. It is
+        re-listed with a fresh lock later if it is still available.
+
+        Args:
+            now: The current time.
+
+        Returns:
+            The number of requests dropped from the queue head.
+        """
+        expired_request_ids = set[str]()
+        while self._lock_expiry_heap and self._lock_expiry_heap[0][0] <= now:
+            expires_at, request_id = heapq.heappop(self._lock_expiry_heap)
+            if self.lock_expires_at.get(request_id) == expires_at:
+                del self.lock_expires_at[request_id]
+                expired_request_ids.add(request_id)
+
+        if expired_request_ids:
+            remaining = [request_id for request_id in self.queue_head if request_id not in expired_request_ids]
+            self.queue_head.clear()
+            self.queue_head.extend(remaining)
+
+        return len(expired_request_ids)
+
+    async def release_unused_locks(self) -> None:
+        """Release the platform locks of requests listed in the queue head but never handed to a consumer.
+
+        `list_and_lock_head` locks a whole batch of requests at once. When this process stops consuming (the Actor
+        is migrating, aborting or exiting), the part of the batch it never handed out would otherwise stay locked
+        until the lock expires, and other consumers of the queue would sit idle in the meantime. Requests already
+        in progress keep their locks, as their consumer still owns them.
+
+        Failures are only logged, an unreleased lock simply expires on its own.
+        """
+        # Hold the fetch lock for the whole release, so a concurrent fetch cannot hand out (or re-list and re-lock)
+        # a request whose lock is being deleted.
+        async with self.fetch_lock:
+            cleared_request_ids = list(dict.fromkeys(self.queue_head))
+            self.queue_head.clear()
+            for request_id in cleared_request_ids:
+                self.untrack_lock(request_id)
+            self._compact_lock_expiry_heap()
+
+            unused_request_ids = [
+                request_id for request_id in cleared_request_ids if request_id not in self.requests_in_progress
+            ]
+
+            if not unused_request_ids:
+                return
+
+            results = await asyncio.gather(
+                *(self.api_client.delete_request_lock(request_id) for request_id in unused_request_ids),
+                return_exceptions=True,
+            )
+
+            for request_id, result in zip(unused_request_ids, results, strict=True):
+                if isinstance(result, BaseException):
+                    logger.debug(f'Failed to release the lock of request {request_id}: {result!s}')
+
+            logger.debug(f'Released the locks of {len(unused_request_ids)} unused requests')
+
+    def _compact_lock_expiry_heap(self) -> None:
+        """Rebuild `_lock_expiry_heap` from `lock_expires_at`, dropping its stale entries."""
+        self._lock_expiry_heap = [(expires_at, key) for key, expires_at in self.lock_expires_at.items()]
+        heapq.heapify(self._lock_expiry_heap)
@@ -55,6 +55,9 @@ class ApifyStorageClient(StorageClient):
     and consistency across clients, at the cost of higher API usage and slightly worse performance. This mode is safe
     for concurrent access from multiple processes, including Actors running in parallel on the Apify platform. It
     should be used when multiple consumers need to process requests from the same queue simultaneously.
+
+    Clients opened in `shared` mode for the same queue within one process share the requests they lock, so several
+    crawlers consuming one queue in a single process do not compete for locks with each other.
     """
 
     _LSP_ERROR_MSG = 'Expected "configuration" to be an instance of "apify.Configuration", but got {} instead.'
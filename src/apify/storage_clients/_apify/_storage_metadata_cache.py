@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import ClassVar, Final, TypeVar
+
+from apify_client._models import Dataset, KeyValueStore, RequestQueue
+
+StorageMetadataT = TypeVar('StorageMetadataT', Dataset, KeyValueStore, RequestQueue)
+
+
+class StorageMetadataCache:
+    """Short-lived cache of the storage metadata fetched while opening a storage.
+
+    Opening a storage verifies that it exists (or creates it) through the API, which already returns its metadata,
+    and right after that the storage is asked for its metadata again. Handing the metadata from the first response
+    over to the second request makes one open cost one round trip.
+
+    An entry is handed over at most once and only for `_TTL`, so every later `get_metadata` call still observes the
+    current state of the storage.
+
+    Only internal structure.
+    """
+
+    _TTL: Final[timedelta] = timedelta(seconds=10)
+    """How long the metadata fetched during an open can be handed over."""
+
+    _entries: ClassVar[dict[str, tuple[float, Dataset | KeyValueStore | RequestQueue]]] = {}
+    """Metadata fetched during storage opens, with the monotonic time it was fetched at, keyed by storage ID."""
+
+    @classmethod
+    def put(cls, metadata: Dataset | KeyValueStore | RequestQueue) -> None:
+        """Remember metadata just fetched from the API while opening a storage."""
+        cls._entries[metadata.id] = (time.monotonic(), metadata)
+
+    @classmethod
+    def take(cls, storage_id: str | None, metadata_type: type[StorageMetadataT]) -> StorageMetadataT | None:
+        """Hand over the metadata remembered for the storage, if it is fresh and of the expected type.
+
+        Args:
+            storage_id: ID of the storage.
+            metadata_type: The API model of the storage metadata, distinguishing the storage types.
+
+        Returns:
+            The remembered metadata, or `None` if it has to be fetched from the API.
+        """
+        if storage_id is None:
+            return None
+
+        entry = cls._entries.pop(storage_id, None)
+        if entry is None:
+            return None
+
+        fetched_at, metadata = entry
+        if time.monotonic() - fetched_at > cls._TTL.total_seconds() or not isinstance(metadata, metadata_type):
+            return None
+
+        return metadata
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget all remembered metadata."""
+        cls._entries.clear()
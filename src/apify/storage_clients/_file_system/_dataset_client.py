@@ -1,17 +1,15 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any, Self
 
 from typing_extensions import override
 
 from crawlee.storage_clients._file_system import FileSystemDatasetClient
 
-from apify._charging import charge_lock_if_charging
 from apify.storage_clients._ppe_dataset_mixin import DatasetClientPpeMixin
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import AsyncIterable, Iterable, Mapping, Sequence
 
     from crawlee._types import JsonSerializable
     from crawlee.configuration import Configuration
@@ -52,11 +50,18 @@ class ApifyFileSystemDatasetClient(FileSystemDatasetClient, DatasetClientPpeMixi
         return dataset_client
 
     @override
-    async def push_data(self, data: Sequence[Mapping[str, JsonSerializable]] | Mapping[str, JsonSerializable]) -> None:
-        async with charge_lock_if_charging():
-            items = data if isinstance(data, Sequence) else [data]
-            limit = self._compute_limit_for_push(len(items))
+    async def drop(self) -> None:
+        self._count_drop()
+        await super().drop()
 
-            await super().push_data(items[:limit])
-
-            await self._charge_for_items(limit)
+    @override
+    async def push_data(
+        self,
+        data: Iterable[Mapping[str, JsonSerializable]]
+        | AsyncIterable[Mapping[str, JsonSerializable]]
+        | Mapping[str, JsonSerializable],
+    ) -> None:
+        await self._push_items(data, self._push_batch)
+
+    async def _push_batch(self, items: Sequence[Mapping[str, JsonSerializable]]) -> None:
+        await super().push_data(items)
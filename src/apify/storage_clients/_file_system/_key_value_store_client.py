@@ -1,6 +1,9 @@
 import asyncio
 import json
 import logging
+import os
+from collections.abc import AsyncGenerator, AsyncIterable
+from contextlib import asynccontextmanager
 from itertools import chain
 from pathlib import Path
 from typing import Any, Self
@@ -14,15 +17,27 @@ from crawlee.storage_clients._file_system import FileSystemKeyValueStoreClient
 from crawlee.storage_clients.models import KeyValueStoreMetadata, KeyValueStoreRecord, KeyValueStoreRecordMetadata
 
 from apify._configuration import Configuration as ApifyConfiguration
+from apify.storage_clients._key_value_store_bulk_mixin import KeyValueStoreClientBulkMixin
+from apify.storage_clients._key_value_store_streaming import (
+    KeyValueStoreRecordStream,
+    copy_file_atomically,
+    copy_file_to_temp_file,
+    guess_content_type,
+    iterate_file_chunks,
+    write_chunks_to_temp_file,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class ApifyFileSystemKeyValueStoreClient(FileSystemKeyValueStoreClient):
+class ApifyFileSystemKeyValueStoreClient(FileSystemKeyValueStoreClient, KeyValueStoreClientBulkMixin):
     """Apify-specific implementation of the `FileSystemKeyValueStoreClient`.
 
-    The only difference is that it overrides the `purge` method to delete all files in the key-value store
-    directory, except for the metadata file and the `INPUT.json` file.
+    It overrides the `purge` method to delete all files in the key-value store directory, except for the metadata
+    file and the `INPUT.json` file, and adds bulk operations over many records and streaming of record values.
+
+    The bulk operations store and delete each record by `set_value` and `delete_value`, under the store lock, so they
+    never interleave with other writes of the same key.
     """
 
     def __init__(
@@ -107,6 +122,134 @@ class ApifyFileSystemKeyValueStoreClient(FileSystemKeyValueStoreClient):
     async def get_public_url(self, *, key: str) -> str:
         return await super().get_public_url(key=self._resolve_input_key(key))
 
+    @asynccontextmanager
+    async def stream_value(self, *, key: str) -> AsyncGenerator[KeyValueStoreRecordStream | None]:
+        """Retrieve a record with its value read from its file in chunks.
+
+        The value is not parsed, its chunks are the raw bytes of the record file, whatever its content type.
+
+        Args:
+            key: The key of the record to retrieve.
+
+        Returns:
+            A context manager yielding the record, or `None` if it does not exist.
+        """
+        record_path = self.path_to_kvs / self._encode_key(self._resolve_input_key(key))
+        record_metadata = await self._read_record_metadata(record_path)
+        if record_metadata is None:
+            yield None
+            return
+
+        chunks = iterate_file_chunks(record_path)
+        try:
+            yield KeyValueStoreRecordStream(metadata=record_metadata, chunks=chunks)
+        finally:
+            await chunks.aclose()
+
+    async def save_value_to_file(self, *, key: str, path: str | os.PathLike[str]) -> bool:
+        """Copy the value of a record into a file, without reading it into memory.
+
+        The record file is copied by the operating system, and the file is replaced atomically.
+
+        Args:
+            key: The key of the record to copy.
+            path: The file to write the value to.
+
+        Returns:
+            Whether the record exists. If it does not, the file is left untouched.
+        """
+        record_path = self.path_to_kvs / self._encode_key(self._resolve_input_key(key))
+        if await self._read_record_metadata(record_path) is None:
+            return False
+
+        try:
+            await copy_file_atomically(record_path, Path(path))
+        except FileNotFoundError:
+            logger.warning(f'Value file disappeared for key "{key}"')
+            return False
+        return True
+
+    async def set_value_from_file(
+        self,
+        *,
+        key: str,
+        path: str | os.PathLike[str],
+        content_type: str | None = None,
+    ) -> None:
+        """Store the content of a file as the value of a record, as is, without reading it into memory.
+
+        The file is copied into the store by the operating system.
+
+        Args:
+            key: The key of the record to store.
+            path: The file to store.
+            content_type: The content type of the value, guessed from the file name if not given.
+        """
+        key = self._resolve_input_key(key)
+        record_path = self.path_to_kvs / self._encode_key(key)
+
+        await asyncio.to_thread(self.path_to_kvs.mkdir, parents=True, exist_ok=True)
+        temp_path, size = await copy_file_to_temp_file(Path(path), record_path)
+        await self._replace_record(
+            temp_path, record_path, key=key, content_type=content_type or guess_content_type(path), size=size
+        )
+
+    async def set_value_from_stream(
+        self,
+        *,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        content_type: str = 'application/octet-stream',
+    ) -> None:
+        """Store the given chunks of bytes as the value of a record, writing them to its file as they come.
+
+        Args:
+            key: The key of the record to store.
+            chunks: The value of the record, in chunks.
+            content_type: The content type of the value.
+        """
+        key = self._resolve_input_key(key)
+        record_path = self.path_to_kvs / self._encode_key(key)
+
+        await asyncio.to_thread(self.path_to_kvs.mkdir, parents=True, exist_ok=True)
+        temp_path, size = await write_chunks_to_temp_file(chunks, record_path)
+        await self._replace_record(temp_path, record_path, key=key, content_type=content_type, size=size)
+
+    async def _read_record_metadata(self, record_path: Path) -> KeyValueStoreRecordMetadata | None:
+        """Read the metadata of the record stored in the given file, `None` if the record does not exist."""
+        record_metadata_filepath = record_path.with_name(f'{record_path.name}.{METADATA_FILENAME}')
+        try:
+            metadata_content = await asyncio.to_thread(record_metadata_filepath.read_text, encoding='utf-8')
+        except FileNotFoundError:
+            return None
+
+        if not await asyncio.to_thread(record_path.exists):
+            return None
+
+        return KeyValueStoreRecordMetadata.model_validate_json(metadata_content)
+
+    async def _replace_record(
+        self, temp_path: Path, record_path: Path, *, key: str, content_type: str, size: int
+    ) -> None:
+        """Move a written value file in place of a record and write the record metadata.
+
+        Both happen under the store lock, like in `set_value`, so the value and the metadata of the record cannot get
+        out of sync with concurrent writes of the same key. The value itself is written before, without the lock.
+        """
+        try:
+            async with self._lock:
+                await asyncio.to_thread(temp_path.replace, record_path)
+                await self._write_record_metadata(record_path, key=key, content_type=content_type, size=size)
+                await self._update_metadata(update_accessed_at=True, update_modified_at=True)
+        finally:
+            await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+
+    async def _write_record_metadata(self, record_path: Path, *, key: str, content_type: str, size: int) -> None:
+        """Write the metadata file of the record stored in the given file."""
+        record_metadata = KeyValueStoreRecordMetadata(key=key, content_type=content_type, size=size)
+        record_metadata_filepath = record_path.with_name(f'{record_path.name}.{METADATA_FILENAME}')
+        await atomic_write(record_metadata_filepath, await json_dumps(record_metadata.model_dump()))
+
     def _resolve_input_key(self, key: str) -> str:
         """Redirect the logical input key to the actual input file name on disk.
 
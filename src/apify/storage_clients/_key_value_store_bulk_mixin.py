@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from functools import partial
+from typing import TYPE_CHECKING, Any, Final, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping, Sequence
+
+    from crawlee.storage_clients.models import KeyValueStoreRecord, KeyValueStoreRecordMetadata
+
+DEFAULT_BULK_MAX_CONCURRENCY: Final[int] = 10
+"""How many records a bulk operation processes at once, unless specified otherwise."""
+
+T = TypeVar('T')
+
+
+class KeyValueStoreClientBulkMixin:
+    """A mixin for key-value store clients to add operations over many records at once.
+
+    The records are processed concurrently, at most `max_concurrency` at a time, on top of the single-record
+    operations of the client. Clients may override the bulk operations with more efficient implementations.
+    """
+
+    if TYPE_CHECKING:
+
+        async def get_value(self, *, key: str) -> KeyValueStoreRecord | None: ...
+
+        async def set_value(self, *, key: str, value: Any, content_type: str | None = None) -> None: ...
+
+        async def delete_value(self, *, key: str) -> None: ...
+
+        def iterate_keys(
+            self,
+            *,
+            exclusive_start_key: str | None = None,
+            limit: int | None = None,
+        ) -> AsyncIterator[KeyValueStoreRecordMetadata]: ...
+
+    async def get_values(
+        self,
+        keys: Iterable[str],
+        *,
+        max_concurrency: int = DEFAULT_BULK_MAX_CONCURRENCY,
+    ) -> dict[str, KeyValueStoreRecord | None]:
+        """Retrieve the records of the given keys.
+
+        Args:
+            keys: Keys of the records to retrieve.
+            max_concurrency: How many records are retrieved at once at most.
+
+        Returns:
+            The records keyed by their keys, in the order of `keys`, with `None` for keys that have no record.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        records = await gather_bounded(
+            [partial(self.get_value, key=key) for key in unique_keys], max_concurrency=max_concurrency
+        )
+        return dict(zip(unique_keys, records, strict=True))
+
+    async def iterate_records(
+        self,
+        *,
+        exclusive_start_key: str | None = None,
+        limit: int | None = None,
+        max_concurrency: int = DEFAULT_BULK_MAX_CONCURRENCY,
+    ) -> AsyncIterator[KeyValueStoreRecord]:
+        """Iterate over the records of the store, in the order of their keys.
+
+        The values of the upcoming records are retrieved concurrently while the keys are being listed and the records
+        consumed. Records deleted after their key was listed are skipped.
+
+        Args:
+            exclusive_start_key: All records with keys up to this one (including) are skipped.
+            limit: The maximum number of records to iterate over.
+            max_concurrency: How many records are retrieved at once at most.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be at least 1, got {max_concurrency}')
+
+        pending: deque[asyncio.Task[KeyValueStoreRecord | None]] = deque()
+        try:
+            async for record_metadata in self.iterate_keys(exclusive_start_key=exclusive_start_key, limit=limit):
+                pending.append(asyncio.create_task(self.get_value(key=record_metadata.key)))
+
+                if len(pending) >= max_concurrency and (record := await pending.popleft()) is not None:
+                    yield record
+
+            while pending:
+                if (record := await pending.popleft()) is not None:
+                    yield record
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def set_values(
+        self,
+        values: Mapping[str, Any],
+        *,
+        content_type: str | None = None,
+        max_concurrency: int = DEFAULT_BULK_MAX_CONCURRENCY,
+    ) -> None:
+        """Store the given records.
+
+        Args:
+            values: The values to store, keyed by their keys.
+            content_type: The MIME content type of all the values, inferred per value if not given.
+            max_concurrency: How many records are stored at once at most.
+        """
+        await gather_bounded(
+            [partial(self.set_value, key=key, value=value, content_type=content_type) for key, value in values.items()],
+            max_concurrency=max_concurrency,
+        )
+
+    async def delete_values(
+        self,
+        keys: Iterable[str],
+        *,
+        max_concurrency: int = DEFAULT_BULK_MAX_CONCURRENCY,
+    ) -> None:
+        """Delete the records of the given keys, keys without a record are skipped.
+
+        Args:
+            keys: Keys of the records to delete.
+            max_concurrency: How many records are deleted at once at most.
+        """
+        await gather_bounded(
+            [partial(self.delete_value, key=key) for key in dict.fromkeys(keys)],
+            max_concurrency=max_concurrency,
+        )
+
+
+async def gather_bounded(operations: Sequence[Callable[[], Awaitable[T]]], *, max_concurrency: int) -> list[T]:
+    """Run the operations concurrently, at most `max_concurrency` at a time, and return their results in order."""
+    if max_concurrency < 1:
+        raise ValueError(f'max_concurrency must be at least 1, got {max_concurrency}')
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(operation: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await operation()
+
+    return await asyncio.gather(*(run(operation) for operation in operations))
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import mimetypes
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Final
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
+
+    from crawlee.storage_clients.models import KeyValueStoreRecordMetadata
+
+STREAM_CHUNK_SIZE: Final[int] = 1024 * 1024
+"""Size of the chunks record values are read in from files, in bytes."""
+
+
+@dataclass(frozen=True)
+class KeyValueStoreRecordStream:
+    """A key-value store record whose value is read in chunks, so it never has to be held in memory whole."""
+
+    metadata: KeyValueStoreRecordMetadata
+    """Metadata of the record. The size is `None` if it is not known before the value is read."""
+
+    chunks: AsyncIterator[bytes]
+    """The value of the record, in chunks. It can be iterated only once."""
+
+
+def guess_content_type(path: str | os.PathLike[str]) -> str:
+    """Guess the content type of a record value stored in a file from the file name."""
+    content_type, _ = mimetypes.guess_type(Path(path).name)
+    return content_type or 'application/octet-stream'
+
+
+async def iterate_file_chunks(path: Path) -> AsyncGenerator[bytes]:
+    """Read a file in chunks of `STREAM_CHUNK_SIZE` bytes, without blocking the event loop."""
+    file = await asyncio.to_thread(_open_for_reading, path)
+    try:
+        while chunk := await asyncio.to_thread(file.read, STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        await asyncio.to_thread(file.close)
+
+
+async def write_chunks_to_file(chunks: AsyncIterable[bytes], path: Path) -> int:
+    """Write chunks to a file atomically, holding one chunk in memory at a time.
+
+    The chunks are written to a temporary file next to `path`, which then replaces it, so readers of `path` never
+    observe a partially written file.
+
+    Returns:
+        The number of bytes written.
+    """
+    temp_path, size = await write_chunks_to_temp_file(chunks, path)
+    await _replace_with_temp_file(temp_path, path)
+    return size
+
+
+async def write_chunks_to_temp_file(chunks: AsyncIterable[bytes], destination: Path) -> tuple[Path, int]:
+    """Write chunks to a temporary file next to `destination`, to replace it once written.
+
+    Returns:
+        The temporary file and the number of bytes written. The caller moves the file in place or deletes it.
+    """
+    fd, temp_path = await asyncio.to_thread(_create_temp_file, destination)
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            async for chunk in chunks:
+                await asyncio.to_thread(file.write, chunk)
+                size += len(chunk)
+    except BaseException:
+        await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+        raise
+
+    return temp_path, size
+
+
+async def copy_file_atomically(source: Path, destination: Path) -> int:
+    """Copy a file atomically, letting the operating system copy the content without passing it through Python.
+
+    `shutil.copyfile` uses the zero-copy system calls of the platform (e.g. `sendfile` on Linux) where available. The
+    content is copied to a temporary file next to `destination`, which then replaces it.
+
+    Returns:
+        The size of the copied file, in bytes.
+    """
+    temp_path, size = await copy_file_to_temp_file(source, destination)
+    await _replace_with_temp_file(temp_path, destination)
+    return size
+
+
+async def copy_file_to_temp_file(source: Path, destination: Path) -> tuple[Path, int]:
+    """Copy a file to a temporary file next to `destination`, to replace it once copied, see `copy_file_atomically`.
+
+    Returns:
+        The temporary file and its size, in bytes. The caller moves the file in place or deletes it.
+    """
+    fd, temp_path = await asyncio.to_thread(_create_temp_file, destination)
+    os.close(fd)
+    try:
+        await asyncio.to_thread(shutil.copyfile, source, temp_path)
+        size = (await asyncio.to_thread(temp_path.stat)).st_size
+    except BaseException:
+        await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+        raise
+
+    return temp_path, size
+
+
+async def _replace_with_temp_file(temp_path: Path, destination: Path) -> None:
+    try:
+        await asyncio.to_thread(temp_path.replace, destination)
+    except BaseException:
+        await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+        raise
+
+
+def _open_for_reading(path: Path) -> BinaryIO:
+    return path.open('rb')
+
+
+def _create_temp_file(destination: Path) -> tuple[int, Path]:
+    """Create a temporary file next to `destination`, to be moved in its place once written."""
+    fd, temp_name = tempfile.mkstemp(dir=destination.parent, prefix=f'.{destination.name}.', suffix='.tmp')
+    return fd, Path(temp_name)
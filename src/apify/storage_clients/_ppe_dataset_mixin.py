@@ -1,25 +1,196 @@
 from __future__ import annotations
 
-from apify._charging import DEFAULT_DATASET_ITEM_EVENT, charging_manager_ctx
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterable, Mapping, Sequence
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, ClassVar, Final, TypeVar, cast
+
+from apify._charging import DEFAULT_DATASET_ITEM_EVENT, charge_reservation_ctx, charging_manager_ctx
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+
+    from crawlee._types import JsonSerializable
+
+    from apify._charging import ChargeReservation, ReservingChargingManager
+
+T = TypeVar('T')
+
+STREAM_BATCH_SIZE: Final[int] = 1000
+"""How many items of an iterable pushed to a dataset are held in memory at most, as a single batch."""
+
+_EXHAUSTED: Final = object()
+"""Returned by `anext` once the items of an iterable are exhausted, unlike `None` it is never an item itself."""
 
 
 class DatasetClientPpeMixin:
     """A mixin for dataset clients to add support for PPE pricing model and tracking synthetic events."""
 
+    default_dataset_drop_count: ClassVar[int] = 0
+    """How many times a default dataset was dropped, lets `Actor.push_data` tell that its pinned dataset is gone."""
+
     def __init__(self) -> None:
         self.is_default_dataset = False
 
-    def _compute_limit_for_push(self, items_count: int) -> int:
-        if self.is_default_dataset and (charging_manager := charging_manager_ctx.get()):
-            max_charged_count = charging_manager.calculate_max_event_charge_count_within_limit(
-                event_name=DEFAULT_DATASET_ITEM_EVENT
-            )
-            return min(max_charged_count, items_count) if max_charged_count is not None else items_count
-        return items_count
-
-    async def _charge_for_items(self, count_items: int) -> None:
-        if self.is_default_dataset and (charging_manager := charging_manager_ctx.get()):
-            await charging_manager.charge(
-                event_name=DEFAULT_DATASET_ITEM_EVENT,
-                count=count_items,
-            )
+    def _count_drop(self) -> None:
+        """Count the drop of the dataset, if it is the default one."""
+        if self.is_default_dataset:
+            DatasetClientPpeMixin.default_dataset_drop_count += 1
+
+    @asynccontextmanager
+    async def _charged_push(self, items_count: int) -> AsyncGenerator[int]:
+        """Reserve the budget for pushing items, yield how many of them can be pushed, and charge for them once pushed.
+
+        The budget is reserved without any lock, so concurrent pushes run in parallel. If the push fails, the reserved
+        budget is refunded.
+        """
+        charging_manager = charging_manager_ctx.get()
+        if not self.is_default_dataset or charging_manager is None:
+            yield items_count
+            return
+
+        # Within `Actor.push_data`, which reserved the budget and charges for the items itself.
+        if (outer_reservation := charge_reservation_ctx.get()) is not None:
+            yield min(items_count, outer_reservation.count)
+            return
+
+        reservation = charging_manager.reserve([DEFAULT_DATASET_ITEM_EVENT], items_count)
+        try:
+            yield reservation.count
+        except BaseException:
+            charging_manager.refund(reservation)
+            raise
+
+        await charging_manager.commit(reservation)
+
+    async def _push_items(
+        self,
+        data: Iterable[Mapping[str, JsonSerializable]]
+        | AsyncIterable[Mapping[str, JsonSerializable]]
+        | Mapping[str, JsonSerializable],
+        push_batch: Callable[[Sequence[Mapping[str, JsonSerializable]]], Awaitable[None]],
+    ) -> None:
+        """Push a single item, a sequence of items or the items of a sync or async iterable with `push_batch`.
+
+        Items of an iterable are pulled and pushed in batches, see `push_item_stream`. Items pushed to the default
+        dataset of a pay-per-event run are limited to the budget and charged for.
+        """
+        if isinstance(data, Mapping | Sequence):
+            items = cast('Sequence[Mapping[str, JsonSerializable]]', data if isinstance(data, Sequence) else [data])
+            if items:
+                async with self._charged_push(len(items)) as limit:
+                    await push_batch(items[:limit])
+            return
+
+        charging_manager = charging_manager_ctx.get()
+        if not self.is_default_dataset or charge_reservation_ctx.get() is not None:
+            charging_manager = None
+
+        await push_item_stream(
+            data,
+            push_batch,
+            charging_manager=charging_manager,
+            event_names=[DEFAULT_DATASET_ITEM_EVENT],
+            batch_size=STREAM_BATCH_SIZE,
+        )
+
+
+async def push_item_stream(
+    items: Iterable[T] | AsyncIterable[T],
+    push_batch: Callable[[list[T]], Awaitable[None]],
+    *,
+    charging_manager: ReservingChargingManager | None = None,
+    event_names: Sequence[str] = (),
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> int:
+    """Pull the items of a sync or async iterable in batches and push each batch with `push_batch`.
+
+    The next batch is pulled while the previous one is being pushed, but the batches are pushed one at a time, so the
+    items keep their order and at most two batches are held in memory.
+
+    With a `charging_manager`, the budget for `event_names` of a whole batch is reserved before its items are pulled,
+    and no more items are pulled than the reservation covers. Once the budget is exhausted, pulling stops, so the
+    producer of the items does not produce items that could not be pushed anyway. Each batch is pushed within its
+    reservation (see `charge_reservation_ctx`), charged for once pushed, and refunded if the push fails.
+
+    Returns:
+        The number of items charged for the first of `event_names`, zero without a `charging_manager`.
+    """
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be at least 1, got {batch_size}')
+
+    async def push(batch: list[T], reservation: ChargeReservation | None) -> int:
+        if charging_manager is None or reservation is None:
+            await push_batch(batch)
+            return 0
+
+        reservation_token = charge_reservation_ctx.set(reservation)
+        try:
+            await push_batch(batch)
+        except BaseException:
+            charging_manager.refund(reservation)
+            raise
+        finally:
+            charge_reservation_ctx.reset(reservation_token)
+
+        result = await charging_manager.commit(reservation, count=len(batch))
+        return result.charged_count
+
+    iterator = _aiter_items(items)
+    charged_count = 0
+    push_task: asyncio.Task[int] | None = None
+
+    try:
+        while True:
+            reservation = charging_manager.reserve(event_names, batch_size) if charging_manager is not None else None
+            try:
+                limit = batch_size if reservation is None else reservation.count
+                batch = list[T]()
+                while len(batch) < limit and (item := await anext(iterator, _EXHAUSTED)) is not _EXHAUSTED:
+                    batch.append(cast('T', item))
+
+                if push_task is not None:
+                    charged_count += await push_task
+                    push_task = None
+            except BaseException:
+                if charging_manager is not None and reservation is not None:
+                    charging_manager.refund(reservation)
+                raise
+
+            if not batch:
+                if charging_manager is not None and reservation is not None:
+                    charging_manager.refund(reservation)
+                break
+
+            push_task = asyncio.create_task(push(batch, reservation))
+            # Let the push start before pulling the next batch, also if the items are produced without awaiting.
+            await asyncio.sleep(0)
+
+            # Fewer items than the limit mean the iterable is exhausted.
+            if len(batch) < limit:
+                break
+
+        if push_task is not None:
+            charged_count += await push_task
+            push_task = None
+    finally:
+        if push_task is not None and not push_task.done():
+            push_task.cancel()
+            await asyncio.gather(push_task, return_exceptions=True)
+
+        # Once the budget is exhausted or the push fails, the rest of the items is never pulled.
+        if isinstance(iterator, AsyncGenerator):
+            await iterator.aclose()
+
+    return charged_count
+
+
+def _aiter_items(items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        return aiter(items)
+    return _aiter_sync_items(items)
+
+
+async def _aiter_sync_items(items: Iterable[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
@@ -0,0 +1,133 @@
+"""Fixtures shared by the unit tests and the benchmarks, registered as a plugin by their `conftest.py` files."""
+
+from __future__ import annotations
+
+import os
+from logging import getLogger
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from crawlee import service_locator
+
+import apify._actor
+import apify.log
+from apify._consts import ApifyEnvVars
+from apify.storage_clients._apify._alias_resolving import AliasResolver
+from apify.storage_clients._apify._api_client_creation import clear_api_client_cache
+from apify.storage_clients._apify._request_queue_shared_head import SharedRequestQueueHead
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from logging import Logger
+    from pathlib import Path
+
+
+@pytest.fixture
+def _patch_propagate_logger(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Patch enabling `propagate` for the crawlee logger.
+
+    This is necessary for tests requiring log interception using `caplog`.
+    """
+
+    original_configure_logger = apify.log.configure_logger
+
+    def propagate_logger(logger: Logger, **kwargs: Any) -> None:
+        original_configure_logger(logger, **kwargs)
+        logger.propagate = True
+
+    monkeypatch.setattr('crawlee._log_config.configure_logger', propagate_logger)
+    monkeypatch.setattr(apify.log, 'configure_logger', propagate_logger)
+    yield
+    monkeypatch.undo()
+
+
+@pytest.fixture
+def prepare_test_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Callable[[], None]:
+    """Prepare the testing environment by resetting the global state before each test.
+
+    This fixture ensures that the global state of the package is reset to a known baseline before each test runs.
+    It also configures a temporary storage directory for test isolation.
+
+    Args:
+        monkeypatch: Test utility provided by pytest for patching.
+        tmp_path: A unique temporary directory path provided by pytest for test isolation.
+
+    Returns:
+        A callable that prepares the test environment.
+    """
+
+    def _prepare_test_env() -> None:
+        # Production code doesn't detect the test env (#641), so force the `exit_process` default to False.
+        # Otherwise a clean context exit calls `sys.exit()` and aborts the test. Patch before touching the
+        # `Actor` proxy below, which materializes its `_ActorType` instance.
+        monkeypatch.setattr(apify._actor._ActorType, '_get_default_exit_process', lambda _self: False)
+
+        if hasattr(apify._actor.Actor, '__wrapped__'):
+            delattr(apify._actor.Actor, '__wrapped__')
+
+        apify._actor.Actor._active = False
+
+        # Set the environment variable for the local storage directory to the temporary path.
+        monkeypatch.setenv(ApifyEnvVars.LOCAL_STORAGE_DIR, str(tmp_path))
+
+        # Reset the services in the service locator.
+        service_locator._configuration = None
+        service_locator._event_manager = None
+        service_locator._storage_client = None
+        service_locator.storage_instance_manager.clear_cache()
+
+        # Reset the AliasResolver class state.
+        AliasResolver._alias_map = {}
+        AliasResolver._alias_map_loaded = False
+        AliasResolver._alias_init_locks = {}
+        AliasResolver._alias_map_lock = None
+        AliasResolver._pending_mappings = {}
+        AliasResolver._flush_task = None
+
+        # Forget the shared request queue heads and API clients of previous tests.
+        SharedRequestQueueHead._instances.clear()
+        clear_api_client_cache()
+
+        # Verify that the test environment was set up correctly.
+        assert os.environ.get(ApifyEnvVars.LOCAL_STORAGE_DIR) == str(tmp_path)
+
+    return _prepare_test_env
+
+
+@pytest.fixture(autouse=True)
+def _isolate_test_environment(
+    prepare_test_env: Callable[[], None],
+    _patch_propagate_logger: None,
+) -> None:
+    """Isolate the testing environment by resetting global state before and after each test.
+
+    This fixture ensures that each test starts with a clean slate and that any modifications during the test
+    do not affect subsequent tests. It runs automatically for all tests.
+
+    Args:
+        prepare_test_env: Fixture to prepare the environment before each test.
+    """
+
+    prepare_test_env()
+
+
+@pytest.fixture(scope='session')
+def make_httpserver() -> Iterator[HTTPServer]:
+    werkzeug_logger = getLogger('werkzeug')
+    werkzeug_logger.disabled = True
+
+    server = HTTPServer(threaded=True, host='127.0.0.1')
+    server.start()
+    yield server
+    server.clear()
+    if server.is_running():
+        server.stop()
+
+
+@pytest.fixture
+def httpserver(make_httpserver: HTTPServer) -> Iterator[HTTPServer]:
+    server = make_httpserver
+    yield server
+    server.clear()
@@ -0,0 +1,272 @@
+"""In-process stand-in for the endpoints of the Apify API a pay-per-event Actor run calls while pushing data.
+
+`ChargingApiServer` serves the run charge, dataset and key-value store endpoints through a `pytest-httpserver`
+instance, speaking the same HTTP protocol as the platform, so the real `ApifyClientAsync` and storage clients can be
+benchmarked offline. It keeps:
+
+- Charged events, deduplicated by their idempotency keys the way the platform does.
+- The number of items pushed to each dataset, not the items themselves, so long runs do not fill the memory.
+- The records of key-value stores in memory.
+
+Every endpoint can be slowed down by a fixed latency, simulating the network round trip to the platform.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Literal
+
+import brotli
+from werkzeug import Response
+
+if TYPE_CHECKING:
+    from pytest_httpserver import HTTPServer
+    from werkzeug import Request
+
+Operation = Literal[
+    'charge',
+    'get_or_create_dataset',
+    'get_dataset',
+    'push_items',
+    'get_or_create_store',
+    'get_store',
+    'get_record',
+    'set_record',
+]
+
+_ROUTES: list[tuple[str, re.Pattern[str], Operation]] = [
+    ('POST', re.compile(r'^/v2/actor-runs/(?P<run_id>[^/]+)/charge$'), 'charge'),
+    ('POST', re.compile(r'^/v2/datasets$'), 'get_or_create_dataset'),
+    ('GET', re.compile(r'^/v2/datasets/(?P<dataset_id>[^/]+)$'), 'get_dataset'),
+    ('POST', re.compile(r'^/v2/datasets/(?P<dataset_id>[^/]+)/items$'), 'push_items'),
+    ('POST', re.compile(r'^/v2/key-value-stores$'), 'get_or_create_store'),
+    ('GET', re.compile(r'^/v2/key-value-stores/(?P<store_id>[^/]+)$'), 'get_store'),
+    ('GET', re.compile(r'^/v2/key-value-stores/(?P<store_id>[^/]+)/records/(?P<key>[^/]+)$'), 'get_record'),
+    ('PUT', re.compile(r'^/v2/key-value-stores/(?P<store_id>[^/]+)/records/(?P<key>[^/]+)$'), 'set_record'),
+]
+
+
+class _ApiError(Exception):
+    """An error to respond with, in the format of the Apify API."""
+
+    def __init__(self, status_code: int, error_type: str, message: str) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.error_type = error_type
+
+
+@dataclass
+class _StoredDataset:
+    id: str
+    name: str | None
+    created_at: datetime
+    item_count: int = 0
+
+
+@dataclass
+class _StoredStore:
+    id: str
+    name: str | None
+    created_at: datetime
+    records: dict[str, tuple[bytes, str]] = field(default_factory=dict)
+    """Values of the records with their content types, by key."""
+
+
+class ChargingApiServer:
+    """In-memory run charge, dataset and key-value store API served through a `pytest-httpserver` instance.
+
+    See the module docstring. Point the SDK at it with `api_base_url=server.url`.
+    """
+
+    def __init__(self, httpserver: HTTPServer) -> None:
+        self.url = str(httpserver.url_for('/')).removesuffix('/')
+        """The base URL to use as `api_base_url` (and `api_public_base_url`) of the SDK configuration."""
+
+        self.latency = timedelta(0)
+        """Delay added to every response, simulating the network round trip to the platform."""
+
+        self.call_counts = Counter[Operation]()
+        """How many times each operation was called."""
+
+        self.charged_counts = Counter[str]()
+        """Total charged count of each event, each idempotency key counted once."""
+
+        self._idempotency_keys = set[str]()
+        self._datasets = dict[str, _StoredDataset]()
+        self._stores = dict[str, _StoredStore]()
+        self._state_lock = threading.Lock()
+
+        httpserver.expect_request(re.compile(r'^/v2/.*')).respond_with_handler(self._handle)
+
+    def create_dataset(self, *, dataset_id: str = 'test-dataset-id', name: str | None = None) -> str:
+        """Create an empty dataset and return its ID."""
+        with self._state_lock:
+            self._datasets[dataset_id] = _StoredDataset(id=dataset_id, name=name, created_at=datetime.now(tz=UTC))
+            return dataset_id
+
+    def create_store(self, *, store_id: str = 'test-kvs-id', name: str | None = None) -> str:
+        """Create an empty key-value store and return its ID."""
+        with self._state_lock:
+            self._stores[store_id] = _StoredStore(id=store_id, name=name, created_at=datetime.now(tz=UTC))
+            return store_id
+
+    def get_item_count(self, dataset_id: str) -> int:
+        """Return the number of items pushed to a dataset."""
+        with self._state_lock:
+            return self._get_dataset(dataset_id).item_count
+
+    def _handle(self, request: Request) -> Response:
+        if self.latency:
+            time.sleep(self.latency.total_seconds())
+
+        route = next(
+            (
+                (operation, match)
+                for method, pattern, operation in _ROUTES
+                if request.method == method and (match := pattern.match(request.path))
+            ),
+            None,
+        )
+        if route is None:
+            return self._error_response(
+                _ApiError(404, 'page-not-found', f'No route for {request.method} {request.path}')
+            )
+        operation, match = route
+
+        with self._state_lock:
+            self.call_counts[operation] += 1
+            try:
+                handler = getattr(self, f'_on_{operation}')
+                response = handler(request, **match.groupdict())
+            except _ApiError as exc:
+                return self._error_response(exc)
+
+        if isinstance(response, Response):
+            return response
+
+        status_code, data = response
+        if data is None:
+            return Response(status=status_code)
+        return Response(json.dumps({'data': data}, default=_json_default), status_code, mimetype='application/json')
+
+    @staticmethod
+    def _error_response(error: _ApiError) -> Response:
+        body = {'error': {'type': error.error_type, 'message': str(error)}}
+        return Response(json.dumps(body), error.status_code, mimetype='application/json')
+
+    @staticmethod
+    def _read_body(request: Request) -> bytes:
+        body = request.get_data()
+        content_encoding = request.headers.get('Content-Encoding')
+        if content_encoding == 'br':
+            return brotli.decompress(body)
+        if content_encoding == 'gzip':
+            return gzip.decompress(body)
+        return body
+
+    def _get_dataset(self, dataset_id: str) -> _StoredDataset:
+        dataset = self._datasets.get(dataset_id)
+        if dataset is None:
+            raise _ApiError(404, 'record-not-found', f'Dataset {dataset_id} was not found')
+        return dataset
+
+    def _get_store(self, store_id: str) -> _StoredStore:
+        store = self._stores.get(store_id)
+        if store is None:
+            raise _ApiError(404, 'record-not-found', f'Key-value store {store_id} was not found')
+        return store
+
+    @staticmethod
+    def _dataset_metadata(dataset: _StoredDataset) -> dict[str, Any]:
+        return {
+            'id': dataset.id,
+            'name': dataset.name,
+            'userId': 'test-user-id',
+            'createdAt': dataset.created_at,
+            'modifiedAt': dataset.created_at,
+            'accessedAt': dataset.created_at,
+            'itemCount': dataset.item_count,
+            'cleanItemCount': dataset.item_count,
+            'consoleUrl': f'https://console.apify.com/storage/datasets/{dataset.id}',
+        }
+
+    @staticmethod
+    def _store_metadata(store: _StoredStore) -> dict[str, Any]:
+        return {
+            'id': store.id,
+            'name': store.name,
+            'userId': 'test-user-id',
+            'createdAt': store.created_at,
+            'modifiedAt': store.created_at,
+            'accessedAt': store.created_at,
+        }
+
+    def _on_charge(self, request: Request, run_id: str) -> tuple[int, Any]:  # noqa: ARG002
+        idempotency_key = request.headers.get('idempotency-key')
+        if idempotency_key is not None and idempotency_key in self._idempotency_keys:
+            return 201, None
+
+        if idempotency_key is not None:
+            self._idempotency_keys.add(idempotency_key)
+
+        charge = json.loads(self._read_body(request))
+        self.charged_counts[charge['eventName']] += charge['count']
+        return 201, None
+
+    def _on_get_or_create_dataset(self, request: Request) -> tuple[int, Any]:
+        name = request.args.get('name')
+        for dataset in self._datasets.values():
+            if name is not None and dataset.name == name:
+                return 200, self._dataset_metadata(dataset)
+
+        dataset_id = f'dataset-{len(self._datasets) + 1}'
+        self._datasets[dataset_id] = _StoredDataset(id=dataset_id, name=name, created_at=datetime.now(tz=UTC))
+        return 201, self._dataset_metadata(self._datasets[dataset_id])
+
+    def _on_get_dataset(self, request: Request, dataset_id: str) -> tuple[int, Any]:  # noqa: ARG002
+        return 200, self._dataset_metadata(self._get_dataset(dataset_id))
+
+    def _on_push_items(self, request: Request, dataset_id: str) -> tuple[int, Any]:
+        dataset = self._get_dataset(dataset_id)
+        items = json.loads(self._read_body(request))
+        dataset.item_count += len(items) if isinstance(items, list) else 1
+        return 201, None
+
+    def _on_get_or_create_store(self, request: Request) -> tuple[int, Any]:
+        name = request.args.get('name')
+        for store in self._stores.values():
+            if name is not None and store.name == name:
+                return 200, self._store_metadata(store)
+
+        store_id = f'kvs-{len(self._stores) + 1}'
+        self._stores[store_id] = _StoredStore(id=store_id, name=name, created_at=datetime.now(tz=UTC))
+        return 201, self._store_metadata(self._stores[store_id])
+
+    def _on_get_store(self, request: Request, store_id: str) -> tuple[int, Any]:  # noqa: ARG002
+        return 200, self._store_metadata(self._get_store(store_id))
+
+    def _on_get_record(self, request: Request, store_id: str, key: str) -> Response:  # noqa: ARG002
+        record = self._get_store(store_id).records.get(key)
+        if record is None:
+            raise _ApiError(404, 'record-not-found', f'Record {key} was not found')
+
+        value, content_type = record
+        return Response(value, 200, content_type=content_type)
+
+    def _on_set_record(self, request: Request, store_id: str, key: str) -> tuple[int, Any]:
+        store = self._get_store(store_id)
+        store.records[key] = (self._read_body(request), request.headers.get('Content-Type', 'application/json'))
+        return 201, None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
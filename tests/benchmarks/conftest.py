@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from ._charging_api_server import ChargingApiServer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from _pytest.terminal import TerminalReporter
+    from pytest_httpserver import HTTPServer
+
+pytest_plugins = ['tests._fixtures']
+"""Isolate the global state between benchmarks and serve the local HTTP server, shared with the unit tests."""
+
+_results: list[tuple[str, dict[str, float]]] = []
+"""Metrics recorded by the benchmarks of the session, by benchmark name."""
+
+
+@pytest.fixture
+def charging_api_server(httpserver: HTTPServer) -> ChargingApiServer:
+    """In-memory stand-in for the run charge, dataset and key-value store endpoints, see `ChargingApiServer`."""
+    return ChargingApiServer(httpserver)
+
+
+@pytest.fixture
+def record_benchmark(request: pytest.FixtureRequest) -> Callable[..., None]:
+    """Record the metrics of the benchmark, reported at the end of the session."""
+
+    def record(**metrics: float) -> None:
+        _results.append((request.node.name, metrics))
+
+    return record
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter) -> None:
+    if not _results:
+        return
+
+    terminalreporter.section('benchmark results')
+    name_width = max(len(name) for name, _ in _results)
+    for name, metrics in _results:
+        formatted_metrics = '  '.join(
+            f'{metric}={value:,}' if isinstance(value, int) else f'{metric}={value:,.1f}'
+            for metric, value in metrics.items()
+        )
+        terminalreporter.write_line(f'{name:<{name_width}}  {formatted_metrics}')
@@ -0,0 +1,115 @@
+"""Throughput of `Actor.push_data` in a pay-per-event run, with and without an explicitly charged event.
+
+The Actor pushes to a dataset and charges through the real API client against `ChargingApiServer`. The run
+behaves like one on the platform - charges are submitted to the charge endpoint and no local charging log is written.
+
+The size of the benchmarks can be changed with the `BENCHMARK_PUSH_COUNT`, `BENCHMARK_ITEMS_PER_PUSH` and
+`BENCHMARK_API_LATENCY_MS` environment variables.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, Final
+
+import pytest
+
+from crawlee import service_locator
+
+from apify import Actor, Configuration
+from apify._charging import DEFAULT_DATASET_ITEM_EVENT, ChargingManagerImplementation
+from apify.storage_clients import ApifyStorageClient, SmartApifyStorageClient
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ._charging_api_server import ChargingApiServer
+
+PUSH_COUNT: Final[int] = int(os.environ.get('BENCHMARK_PUSH_COUNT', '500'))
+"""How many `Actor.push_data` calls each benchmark makes."""
+
+ITEMS_PER_PUSH: Final[int] = int(os.environ.get('BENCHMARK_ITEMS_PER_PUSH', '10'))
+"""How many items each `Actor.push_data` call pushes."""
+
+API_LATENCY: Final[timedelta] = timedelta(milliseconds=int(os.environ.get('BENCHMARK_API_LATENCY_MS', '2')))
+"""Latency of every API call, simulating the network round trip to the platform."""
+
+CHARGED_EVENT = 'result'
+
+PRICING_INFO: Final = {
+    'pricingModel': 'PAY_PER_EVENT',
+    'pricingPerEvent': {
+        'actorChargeEvents': {
+            CHARGED_EVENT: {'eventPriceUsd': 0.001, 'eventTitle': 'Result'},
+            DEFAULT_DATASET_ITEM_EVENT: {'eventPriceUsd': 0.0001, 'eventTitle': 'Dataset item'},
+        }
+    },
+}
+
+
+@pytest.mark.parametrize('concurrency', [1, 20])
+@pytest.mark.parametrize('charged_event_name', [None, CHARGED_EVENT], ids=['synthetic-event', 'charged-event'])
+async def test_push_data_throughput(
+    charging_api_server: ChargingApiServer,
+    record_benchmark: Callable[..., None],
+    charged_event_name: str | None,
+    concurrency: int,
+) -> None:
+    charging_api_server.latency = API_LATENCY
+    dataset_id = charging_api_server.create_dataset()
+    configuration = Configuration(
+        token='benchmark-token',
+        api_base_url=charging_api_server.url,
+        api_public_base_url=charging_api_server.url,
+        actor_run_id='benchmark-run-id',
+        default_dataset_id=dataset_id,
+        default_key_value_store_id=charging_api_server.create_store(),
+        is_at_home=True,
+        actor_pricing_info=PRICING_INFO,
+        charged_event_counts={CHARGED_EVENT: 0},
+        max_total_charge_usd=Decimal(1_000_000),
+    )
+
+    # Both storage clients talk to the stand-in, also in a run that is not on the platform.
+    service_locator.set_storage_client(
+        SmartApifyStorageClient(local_storage_client=ApifyStorageClient(), cloud_storage_client=ApifyStorageClient())
+    )
+
+    latencies = list[float]()
+    pushes = iter(range(PUSH_COUNT))
+
+    async def push_worker() -> None:
+        for push in pushes:
+            items = [{'push': push, 'item': item} for item in range(ITEMS_PER_PUSH)]
+            started_at = time.perf_counter()
+            await Actor.push_data(items, charged_event_name=charged_event_name)
+            latencies.append(time.perf_counter() - started_at)
+
+    async with Actor(configuration, configure_logging=False):
+        charging_manager = Actor.get_charging_manager()
+        assert isinstance(charging_manager, ChargingManagerImplementation)
+
+        started_at = time.perf_counter()
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(concurrency):
+                tg.create_task(push_worker())
+        # Include submitting the charges still accumulated.
+        await charging_manager.flush_charges()
+        elapsed = time.perf_counter() - started_at
+
+    item_count = PUSH_COUNT * ITEMS_PER_PUSH
+    assert charging_api_server.get_item_count(dataset_id) == item_count
+    if charged_event_name is not None:
+        assert charging_api_server.charged_counts[charged_event_name] == item_count
+
+    record_benchmark(
+        items_per_sec=item_count / elapsed,
+        charge_calls=charging_api_server.call_counts['charge'],
+        p50_ms=statistics.median(latencies) * 1000,
+        p99_ms=statistics.quantiles(latencies, n=100, method='inclusive')[98] * 1000,
+    )
@@ -0,0 +1,68 @@
+"""Per-call overhead of `Actor.push_data` over pushing to the dataset directly, for small pushes.
+
+Both push single items to the default dataset in memory, so the difference between them is the work
+`Actor.push_data` adds to every call - resolving the dataset and the pricing model, and the charging.
+
+The size of the benchmark can be changed with the `BENCHMARK_CALL_COUNT` environment variable.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING, Final
+
+import pytest
+
+from crawlee import service_locator
+from crawlee.storage_clients import MemoryStorageClient
+
+from apify import Actor, Configuration
+from apify._charging import DEFAULT_DATASET_ITEM_EVENT
+from apify.storage_clients import SmartApifyStorageClient
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+CALL_COUNT: Final[int] = int(os.environ.get('BENCHMARK_CALL_COUNT', '5000'))
+"""How many single-item pushes each benchmark makes, both through the Actor and to the dataset directly."""
+
+PRICING_INFO: Final = {
+    'pricingModel': 'PAY_PER_EVENT',
+    'pricingPerEvent': {
+        'actorChargeEvents': {
+            DEFAULT_DATASET_ITEM_EVENT: {'eventPriceUsd': 0.0001, 'eventTitle': 'Dataset item'},
+        }
+    },
+}
+
+
+@pytest.mark.parametrize('is_pay_per_event', [False, True], ids=['no-ppe', 'ppe'])
+async def test_push_data_overhead(record_benchmark: Callable[..., None], *, is_pay_per_event: bool) -> None:
+    configuration = Configuration(
+        test_pay_per_event=is_pay_per_event,
+        actor_pricing_info=PRICING_INFO if is_pay_per_event else None,
+        charged_event_counts={} if is_pay_per_event else None,
+    )
+    service_locator.set_storage_client(SmartApifyStorageClient(local_storage_client=MemoryStorageClient()))
+
+    async with Actor(configuration, configure_logging=False):
+        dataset = await Actor.open_dataset()
+
+        started_at = time.perf_counter()
+        for i in range(CALL_COUNT):
+            await dataset.push_data({'id': i})
+        dataset_elapsed = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        for i in range(CALL_COUNT):
+            await Actor.push_data({'id': i})
+        actor_elapsed = time.perf_counter() - started_at
+
+        assert (await dataset.get_metadata()).item_count == 2 * CALL_COUNT
+
+    record_benchmark(
+        actor_us_per_call=actor_elapsed / CALL_COUNT * 1_000_000,
+        dataset_us_per_call=dataset_elapsed / CALL_COUNT * 1_000_000,
+        overhead_us_per_call=(actor_elapsed - dataset_elapsed) / CALL_COUNT * 1_000_000,
+    )
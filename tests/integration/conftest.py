@@ -13,6 +13,8 @@ from apify import Actor
 from apify._consts import ApifyEnvVars
 from apify.storage_clients import ApifyStorageClient
 from apify.storage_clients._apify._alias_resolving import AliasResolver
+from apify.storage_clients._apify._api_client_creation import clear_api_client_cache
+from apify.storage_clients._apify._request_queue_shared_head import SharedRequestQueueHead
 from apify.storages import RequestQueue
 
 if TYPE_CHECKING:
@@ -77,7 +79,14 @@ def prepare_test_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Callabl
 
         # Reset the AliasResolver class state.
         AliasResolver._alias_map = {}
-        AliasResolver._alias_init_lock = None
+        AliasResolver._alias_init_locks = {}
+        AliasResolver._alias_map_lock = None
+        AliasResolver._pending_mappings = {}
+        AliasResolver._flush_task = None
+
+        # Forget the shared request queue heads and API clients of previous tests.
+        SharedRequestQueueHead._instances.clear()
+        clear_api_client_cache()
 
         # Verify that the test environment was set up correctly.
         assert os.environ.get(ApifyEnvVars.LOCAL_STORAGE_DIR) == str(tmp_path)
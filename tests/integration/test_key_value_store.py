@@ -89,7 +89,10 @@ async def test_set_value_in_one_context_and_get_value_in_another(
     service_locator._storage_client = None
     service_locator.storage_instance_manager.clear_cache()
     AliasResolver._alias_map = {}
-    AliasResolver._alias_init_lock = None
+    AliasResolver._alias_init_locks = {}
+    AliasResolver._alias_map_lock = None
+    AliasResolver._pending_mappings = {}
+    AliasResolver._flush_task = None
 
     # Second context: get the value
     try:
@@ -106,7 +109,10 @@ async def test_set_value_in_one_context_and_get_value_in_another(
         service_locator._storage_client = None
         service_locator.storage_instance_manager.clear_cache()
         AliasResolver._alias_map = {}
-        AliasResolver._alias_init_lock = None
+        AliasResolver._alias_init_locks = {}
+        AliasResolver._alias_map_lock = None
+        AliasResolver._pending_mappings = {}
+        AliasResolver._flush_task = None
         async with Actor:
             kvs3 = await Actor.open_key_value_store(id=kvs_id, force_cloud=True)
             await kvs3.drop()
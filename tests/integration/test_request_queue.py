@@ -1632,7 +1632,7 @@ async def test_shared_is_finished_false_while_request_in_progress(
             fetched = await rq.fetch_next_request()
             assert fetched is not None
             request_id = unique_key_to_request_id(fetched.unique_key)
-            assert request_id in impl._requests_in_progress
+            assert request_id in impl._head.requests_in_progress
 
             # Finish the request out-of-band via the raw API (mark handled, drop lock), as another consumer would
             # after our lock lapsed, so our local in-progress tracking still holds it.
@@ -1643,12 +1643,12 @@ async def test_shared_is_finished_false_while_request_in_progress(
 
             # Wait for the head to reflect the empty, unlocked queue (shared-mode propagation delay).
             async def _head_empty_and_unlocked() -> bool:
-                return await rq.is_empty() and not impl._queue_has_locked_requests
+                return await rq.is_empty() and not impl._head.queue_has_locked_requests
 
             # This is the state where pre-fix `is_finished` wrongly returned True.
             assert await poll_until_condition(_head_empty_and_unlocked, timeout=30, backoff_factor=2) is True
 
-            assert request_id in impl._requests_in_progress
+            assert request_id in impl._head.requests_in_progress
             assert await rq.is_finished() is False
         finally:
             await rq.drop()
@@ -0,0 +1,466 @@
+"""In-process stand-in for the request queue endpoints of the Apify API.
+
+`RequestQueueApiServer` keeps request queues in memory and serves them through a `pytest-httpserver` instance,
+speaking the same HTTP protocol as the platform. Unlike mocked client objects, it lets the real `ApifyClientAsync`
+(and therefore `ApifyRequestQueueClient` pointed at it via `api_base_url`) exercise request serialization,
+compression, retries and, most importantly, the platform locking semantics:
+
+- `list_and_lock_head` hands out only pending requests that are not locked, and locks them for the calling client key.
+- A lock can be prolonged or deleted, and a locked request updated, only by the client key holding the lock.
+- Expired locks are ignored, so their requests are listed (and locked) again.
+- `hadMultipleClients` turns true once more than one client key accessed the queue.
+
+Requests are listed in queue order, with forefront requests first, so runs are deterministic.
+
+Every endpoint can be slowed down by a fixed latency, and failures can be injected into upcoming calls of a given
+operation. Time is taken from an injectable clock, so lock expiry can be driven deterministically.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Literal
+
+import brotli
+from werkzeug import Response
+
+from apify.storage_clients._apify._utils import unique_key_to_request_id
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pytest_httpserver import HTTPServer
+    from werkzeug import Request
+
+Operation = Literal[
+    'get_or_create_queue',
+    'get_queue',
+    'delete_queue',
+    'list_head',
+    'list_and_lock_head',
+    'list_requests',
+    'add_request',
+    'batch_add_requests',
+    'get_request',
+    'update_request',
+    'delete_request',
+    'prolong_request_lock',
+    'delete_request_lock',
+]
+
+_ROUTES: list[tuple[str, re.Pattern[str], Operation]] = [
+    ('POST', re.compile(r'^/v2/request-queues$'), 'get_or_create_queue'),
+    ('GET', re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)$'), 'get_queue'),
+    ('DELETE', re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)$'), 'delete_queue'),
+    ('GET', re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/head$'), 'list_head'),
+    ('POST', re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/head/lock$'), 'list_and_lock_head'),
+    ('GET', re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/requests$'), 'list_requests'),
+    ('POST', re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/requests$'), 'add_request'),
+    ('POST', re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/requests/batch$'), 'batch_add_requests'),
+    ('GET', re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/requests/(?P<request_id>[^/]+)$'), 'get_request'),
+    ('PUT', re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/requests/(?P<request_id>[^/]+)$'), 'update_request'),
+    (
+        'DELETE',
+        re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/requests/(?P<request_id>[^/]+)$'),
+        'delete_request',
+    ),
+    (
+        'PUT',
+        re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/requests/(?P<request_id>[^/]+)/lock$'),
+        'prolong_request_lock',
+    ),
+    (
+        'DELETE',
+        re.compile(r'^/v2/request-queues/(?P<queue_id>[^/]+)/requests/(?P<request_id>[^/]+)/lock$'),
+        'delete_request_lock',
+    ),
+]
+
+
+class _ApiError(Exception):
+    """An error to respond with, in the format of the Apify API."""
+
+    def __init__(self, status_code: int, error_type: str, message: str) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.error_type = error_type
+
+
+@dataclass
+class _StoredRequest:
+    data: dict[str, Any]
+    """The request as stored by the API, in its camelCase JSON form, including `id` and `handledAt`."""
+
+    order_no: int
+    """Position of the request in the queue; lower numbers are listed first."""
+
+    lock_expires_at: datetime | None = None
+    """When the lock on the request expires, if it was ever locked."""
+
+    lock_client_key: str | None = None
+    """The client key holding the lock on the request."""
+
+    @property
+    def is_handled(self) -> bool:
+        return self.data.get('handledAt') is not None
+
+
+@dataclass
+class _StoredQueue:
+    id: str
+    name: str | None
+    created_at: datetime
+    modified_at: datetime
+    accessed_at: datetime
+    requests: dict[str, _StoredRequest] = field(default_factory=dict)
+    client_keys: set[str] = field(default_factory=set)
+    next_order_no: int = 0
+    next_forefront_order_no: int = -1
+
+
+class RequestQueueApiServer:
+    """In-memory request queue API served through a `pytest-httpserver` instance, see the module docstring.
+
+    Use the `request_queue_api_server` fixture, and point the SDK at it with `api_base_url=server.url`.
+    """
+
+    def __init__(self, httpserver: HTTPServer, *, clock: Callable[[], datetime] | None = None) -> None:
+        self.url = str(httpserver.url_for('/')).removesuffix('/')
+        """The base URL to use as `api_base_url` (and `api_public_base_url`) of the SDK configuration."""
+
+        self.clock = clock or (lambda: datetime.now(tz=UTC))
+        """Source of the current time, replace it to control lock expiry."""
+
+        self.latency = timedelta(0)
+        """Delay added to every response, simulating the network round trip to the platform."""
+
+        self.call_counts = Counter[Operation]()
+        """How many times each operation was called, including failed calls."""
+
+        self._queues = dict[str, _StoredQueue]()
+        self._injected_failures = defaultdict[Operation, deque[int]](deque)
+        self._state_lock = threading.Lock()
+
+        httpserver.expect_request(re.compile(r'^/v2/request-queues.*')).respond_with_handler(self._handle)
+
+    def create_queue(self, *, queue_id: str = 'test-rq-id', name: str | None = None) -> str:
+        """Create an empty request queue and return its ID."""
+        with self._state_lock:
+            return self._create_queue(queue_id=queue_id, name=name).id
+
+    def fail_next(self, operation: Operation, *, status_code: int = 500, times: int = 1) -> None:
+        """Make the next `times` calls of `operation` fail with the given HTTP status code."""
+        with self._state_lock:
+            self._injected_failures[operation].extend([status_code] * times)
+
+    def get_stored_request(self, queue_id: str, request_id: str) -> dict[str, Any]:
+        """Return a copy of a stored request, including its `lockExpiresAt` and `lockClientKey`, for assertions."""
+        with self._state_lock:
+            stored = self._get_queue(queue_id).requests[request_id]
+            return stored.data | {
+                'lockExpiresAt': stored.lock_expires_at,
+                'lockClientKey': stored.lock_client_key,
+            }
+
+    def _handle(self, request: Request) -> Response:
+        if self.latency:
+            time.sleep(self.latency.total_seconds())
+
+        route = next(
+            (
+                (operation, match)
+                for method, pattern, operation in _ROUTES
+                if request.method == method and (match := pattern.match(request.path))
+            ),
+            None,
+        )
+        if route is None:
+            return self._error_response(
+                _ApiError(404, 'page-not-found', f'No route for {request.method} {request.path}')
+            )
+        operation, match = route
+
+        with self._state_lock:
+            self.call_counts[operation] += 1
+            try:
+                if self._injected_failures[operation]:
+                    status_code = self._injected_failures[operation].popleft()
+                    raise _ApiError(status_code, 'injected-failure', f'Injected failure of {operation}')
+
+                handler = getattr(self, f'_on_{operation}')
+                status_code, data = handler(request, **match.groupdict())
+            except _ApiError as exc:
+                return self._error_response(exc)
+
+        if data is None:
+            return Response(status=status_code)
+        return Response(json.dumps({'data': data}, default=_json_default), status_code, mimetype='application/json')
+
+    @staticmethod
+    def _error_response(error: _ApiError) -> Response:
+        body = {'error': {'type': error.error_type, 'message': str(error)}}
+        return Response(json.dumps(body), error.status_code, mimetype='application/json')
+
+    @staticmethod
+    def _read_json(request: Request) -> Any:
+        body = request.get_data()
+        content_encoding = request.headers.get('Content-Encoding')
+        if content_encoding == 'br':
+            body = brotli.decompress(body)
+        elif content_encoding == 'gzip':
+            body = gzip.decompress(body)
+        return json.loads(body)
+
+    def _create_queue(self, *, queue_id: str, name: str | None) -> _StoredQueue:
+        now = self.clock()
+        queue = _StoredQueue(id=queue_id, name=name, created_at=now, modified_at=now, accessed_at=now)
+        self._queues[queue_id] = queue
+        return queue
+
+    def _get_queue(self, queue_id: str) -> _StoredQueue:
+        queue = self._queues.get(queue_id)
+        if queue is None:
+            raise _ApiError(404, 'record-not-found', f'Request queue {queue_id} was not found')
+        queue.accessed_at = self.clock()
+        return queue
+
+    def _get_stored_request(self, queue: _StoredQueue, request_id: str) -> _StoredRequest:
+        stored = queue.requests.get(request_id)
+        if stored is None:
+            raise _ApiError(404, 'record-not-found', f'Request {request_id} was not found')
+        return stored
+
+    def _register_client(self, queue: _StoredQueue, request: Request) -> str | None:
+        client_key = request.args.get('clientKey')
+        if client_key:
+            queue.client_keys.add(client_key)
+        return client_key
+
+    def _is_locked_by_other_client(self, stored: _StoredRequest, client_key: str | None) -> bool:
+        return (
+            stored.lock_expires_at is not None
+            and stored.lock_expires_at > self.clock()
+            and stored.lock_client_key != client_key
+        )
+
+    def _move(self, queue: _StoredQueue, stored: _StoredRequest, *, forefront: bool) -> None:
+        if forefront:
+            stored.order_no = queue.next_forefront_order_no
+            queue.next_forefront_order_no -= 1
+
+    def _pending_unlocked(self, queue: _StoredQueue) -> list[_StoredRequest]:
+        now = self.clock()
+        return sorted(
+            (
+                stored
+                for stored in queue.requests.values()
+                if not stored.is_handled and (stored.lock_expires_at is None or stored.lock_expires_at <= now)
+            ),
+            key=lambda stored: stored.order_no,
+        )
+
+    def _queue_metadata(self, queue: _StoredQueue) -> dict[str, Any]:
+        handled_count = sum(1 for stored in queue.requests.values() if stored.is_handled)
+        return {
+            'id': queue.id,
+            'name': queue.name,
+            'userId': 'test-user-id',
+            'createdAt': queue.created_at,
+            'modifiedAt': queue.modified_at,
+            'accessedAt': queue.accessed_at,
+            'totalRequestCount': len(queue.requests),
+            'handledRequestCount': handled_count,
+            'pendingRequestCount': len(queue.requests) - handled_count,
+            'hadMultipleClients': len(queue.client_keys) > 1,
+            'consoleUrl': f'https://console.apify.com/storage/request-queues/{queue.id}',
+        }
+
+    @staticmethod
+    def _head_item(stored: _StoredRequest) -> dict[str, Any]:
+        return {
+            'id': stored.data['id'],
+            'uniqueKey': stored.data['uniqueKey'],
+            'url': stored.data['url'],
+            'method': stored.data.get('method'),
+            'retryCount': stored.data.get('retryCount'),
+        }
+
+    def _add(self, queue: _StoredQueue, draft: dict[str, Any], *, forefront: bool) -> dict[str, Any]:
+        request_id = unique_key_to_request_id(draft['uniqueKey'])
+        stored = queue.requests.get(request_id)
+        if stored is not None:
+            return {'requestId': request_id, 'wasAlreadyPresent': True, 'wasAlreadyHandled': stored.is_handled}
+
+        stored = _StoredRequest(data=draft | {'id': request_id}, order_no=queue.next_order_no)
+        queue.next_order_no += 1
+        self._move(queue, stored, forefront=forefront)
+        queue.requests[request_id] = stored
+        queue.modified_at = self.clock()
+        return {'requestId': request_id, 'wasAlreadyPresent': False, 'wasAlreadyHandled': False}
+
+    def _on_get_or_create_queue(self, request: Request) -> tuple[int, Any]:
+        name = request.args.get('name')
+        for queue in self._queues.values():
+            if name is not None and queue.name == name:
+                return 200, self._queue_metadata(queue)
+
+        queue = self._create_queue(queue_id=f'rq-{len(self._queues) + 1}', name=name)
+        return 201, self._queue_metadata(queue)
+
+    def _on_get_queue(self, request: Request, queue_id: str) -> tuple[int, Any]:  # noqa: ARG002
+        return 200, self._queue_metadata(self._get_queue(queue_id))
+
+    def _on_delete_queue(self, request: Request, queue_id: str) -> tuple[int, Any]:  # noqa: ARG002
+        self._get_queue(queue_id)
+        del self._queues[queue_id]
+        return 204, None
+
+    def _on_list_head(self, request: Request, queue_id: str) -> tuple[int, Any]:
+        queue = self._get_queue(queue_id)
+        self._register_client(queue, request)
+        limit = int(request.args.get('limit', 100))
+        return 200, {
+            'limit': limit,
+            'queueModifiedAt': queue.modified_at,
+            'hadMultipleClients': len(queue.client_keys) > 1,
+            'items': [self._head_item(stored) for stored in self._pending_unlocked(queue)[:limit]],
+        }
+
+    def _on_list_and_lock_head(self, request: Request, queue_id: str) -> tuple[int, Any]:
+        queue = self._get_queue(queue_id)
+        client_key = self._register_client(queue, request)
+        limit = int(request.args.get('limit', 25))
+        lock_secs = int(request.args['lockSecs'])
+        now = self.clock()
+        lock_expires_at = now + timedelta(seconds=lock_secs)
+
+        items = []
+        for stored in self._pending_unlocked(queue)[:limit]:
+            stored.lock_expires_at = lock_expires_at
+            stored.lock_client_key = client_key
+            items.append(self._head_item(stored) | {'lockExpiresAt': lock_expires_at})
+
+        return 200, {
+            'limit': limit,
+            'queueModifiedAt': queue.modified_at,
+            'queueHasLockedRequests': any(
+                stored.lock_expires_at is not None and stored.lock_expires_at > now and not stored.is_handled
+                for stored in queue.requests.values()
+            ),
+            'clientKey': client_key,
+            'hadMultipleClients': len(queue.client_keys) > 1,
+            'lockSecs': lock_secs,
+            'items': items,
+        }
+
+    def _on_list_requests(self, request: Request, queue_id: str) -> tuple[int, Any]:
+        queue = self._get_queue(queue_id)
+        self._register_client(queue, request)
+        limit = int(request.args.get('limit', 100))
+        offset = int(request.args.get('cursor', 0))
+        filters = set(request.args['filter'].split(',')) if 'filter' in request.args else None
+        now = self.clock()
+
+        matching = [
+            stored
+            for stored in sorted(queue.requests.values(), key=lambda stored: stored.order_no)
+            if filters is None
+            or ('pending' in filters and not stored.is_handled)
+            or ('locked' in filters and stored.lock_expires_at is not None and stored.lock_expires_at > now)
+        ]
+        page = matching[offset : offset + limit]
+        next_offset = offset + len(page)
+        return 200, {
+            'items': [dict(stored.data) for stored in page],
+            'limit': limit,
+            'cursor': request.args.get('cursor'),
+            'nextCursor': str(next_offset) if next_offset < len(matching) else None,
+        }
+
+    def _on_add_request(self, request: Request, queue_id: str) -> tuple[int, Any]:
+        queue = self._get_queue(queue_id)
+        self._register_client(queue, request)
+        forefront = request.args.get('forefront') == 'true'
+        return 201, self._add(queue, self._read_json(request), forefront=forefront)
+
+    def _on_batch_add_requests(self, request: Request, queue_id: str) -> tuple[int, Any]:
+        queue = self._get_queue(queue_id)
+        self._register_client(queue, request)
+        forefront = request.args.get('forefront') == 'true'
+        processed = []
+        for draft in self._read_json(request):
+            registration = self._add(queue, draft, forefront=forefront)
+            processed.append(registration | {'uniqueKey': draft['uniqueKey']})
+        return 201, {'processedRequests': processed, 'unprocessedRequests': []}
+
+    def _on_get_request(self, request: Request, queue_id: str, request_id: str) -> tuple[int, Any]:  # noqa: ARG002
+        return 200, dict(self._get_stored_request(self._get_queue(queue_id), request_id).data)
+
+    def _on_update_request(self, request: Request, queue_id: str, request_id: str) -> tuple[int, Any]:
+        queue = self._get_queue(queue_id)
+        client_key = self._register_client(queue, request)
+        data = self._read_json(request)
+        stored = queue.requests.get(request_id)
+
+        if stored is None:
+            registration = self._add(queue, data, forefront=request.args.get('forefront') == 'true')
+            return 200, registration
+
+        if self._is_locked_by_other_client(stored, client_key):
+            raise _ApiError(403, 'request-locked', f'Request {request_id} is locked by another client')
+
+        was_already_handled = stored.is_handled
+        stored.data = data | {'id': request_id, 'handledAt': data.get('handledAt')}
+        # Updating the request hands it back to the queue (handled or pending), which releases the lock.
+        stored.lock_expires_at = None
+        stored.lock_client_key = None
+        self._move(queue, stored, forefront=request.args.get('forefront') == 'true')
+        queue.modified_at = self.clock()
+        return 200, {'requestId': request_id, 'wasAlreadyPresent': True, 'wasAlreadyHandled': was_already_handled}
+
+    def _on_delete_request(self, request: Request, queue_id: str, request_id: str) -> tuple[int, Any]:
+        queue = self._get_queue(queue_id)
+        client_key = self._register_client(queue, request)
+        stored = self._get_stored_request(queue, request_id)
+        if self._is_locked_by_other_client(stored, client_key):
+            raise _ApiError(403, 'request-locked', f'Request {request_id} is locked by another client')
+        del queue.requests[request_id]
+        queue.modified_at = self.clock()
+        return 204, None
+
+    def _on_prolong_request_lock(self, request: Request, queue_id: str, request_id: str) -> tuple[int, Any]:
+        queue = self._get_queue(queue_id)
+        client_key = self._register_client(queue, request)
+        stored = self._get_stored_request(queue, request_id)
+        if self._is_locked_by_other_client(stored, client_key):
+            raise _ApiError(403, 'request-locked', f'Request {request_id} is locked by another client')
+
+        stored.lock_expires_at = self.clock() + timedelta(seconds=int(request.args['lockSecs']))
+        stored.lock_client_key = client_key
+        self._move(queue, stored, forefront=request.args.get('forefront') == 'true')
+        return 200, {'lockExpiresAt': stored.lock_expires_at}
+
+    def _on_delete_request_lock(self, request: Request, queue_id: str, request_id: str) -> tuple[int, Any]:
+        queue = self._get_queue(queue_id)
+        client_key = self._register_client(queue, request)
+        stored = self._get_stored_request(queue, request_id)
+        if self._is_locked_by_other_client(stored, client_key):
+            raise _ApiError(403, 'request-locked', f'Request {request_id} is locked by another client')
+
+        stored.lock_expires_at = None
+        stored.lock_client_key = None
+        self._move(queue, stored, forefront=request.args.get('forefront') == 'true')
+        return 204, None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
@@ -3,16 +3,17 @@ from __future__ import annotations
 import asyncio
 from contextlib import asynccontextmanager
 from decimal import Decimal
-from typing import TYPE_CHECKING, NamedTuple
-from unittest.mock import AsyncMock, Mock, patch
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+from unittest.mock import ANY, AsyncMock, Mock, patch
 
-from apify import Actor, Configuration
+import pytest
+
+from apify import Actor, Configuration, _charging
 from apify._charging import ChargingManagerImplementation, PayPerEventActorPricingInfo, PricingInfoItem
+from apify.storage_clients._ppe_dataset_mixin import push_item_stream
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
-
-    import pytest
+    from collections.abc import AsyncGenerator, AsyncIterator, Iterator
 
 
 class MockedChargingSetup(NamedTuple):
@@ -34,10 +35,11 @@ async def setup_mocked_charging(
         pricing_info = {'event': Decimal('1.0')}
         async with setup_mocked_charging(configuration, pricing_info) as setup:
             # Add pricing info for events
-            setup.charging_mgr._pricing_info['event'] = PricingInfoItem(Decimal('1.0'), 'Event')
+            setup.charging_mgr._add_event_pricing('event', PricingInfoItem(Decimal('1.0'), 'Event'))
 
             result = await Actor.charge('event', count=1)
-            setup.mock_charge.assert_called_once_with('event', count=1)
+            await setup.charging_mgr.flush_charges()
+            setup.mock_charge.assert_called_once_with('event', count=1, idempotency_key=ANY)
     """
     # Mock the ApifyClientAsync
     mock_client = Mock()
@@ -64,10 +66,13 @@ async def setup_mocked_charging(
             )
 
             for event_name, price in pricing_info.items():
-                setup.charging_mgr._pricing_info[event_name] = PricingInfoItem(price, title=event_name.title())
+                setup.charging_mgr._add_event_pricing(event_name, PricingInfoItem(price, title=event_name.title()))
 
             yield setup
 
+            # Submit the charges accumulated in the background while the client is still mocked.
+            await charging_mgr_impl.flush_charges()
+
 
 async def test_actor_charge_push_data_with_no_remaining_budget() -> None:
     """Test that the API client is NOT called when budget is exhausted during push_data.
@@ -82,7 +87,8 @@ async def test_actor_charge_push_data_with_no_remaining_budget() -> None:
         result1 = await Actor.charge('some-event', count=1)  # Costs $1, leaving $0.5
 
         # Verify the first charge call was made correctly
-        setup.mock_charge.assert_called_once_with('some-event', count=1)
+        await setup.charging_mgr.flush_charges()
+        setup.mock_charge.assert_called_once_with('some-event', count=1, idempotency_key=ANY)
         setup.mock_charge.reset_mock()
 
         assert result1.charged_count == 1
@@ -117,7 +123,8 @@ async def test_actor_charge_api_call_verification() -> None:
 
         # Call charge with count=1 - this SHOULD call the API
         result2 = await Actor.charge('test-event', count=1)
-        setup.mock_charge.assert_called_once_with('test-event', count=1)
+        await setup.charging_mgr.flush_charges()
+        setup.mock_charge.assert_called_once_with('test-event', count=1, idempotency_key=ANY)
         assert result2.charged_count == 1
 
 
@@ -176,6 +183,81 @@ async def test_push_data_combined_price_limits_items() -> None:
         assert items.items[0] == {'id': 0}
 
 
+async def test_push_data_stream_stops_pulling_items_at_the_budget() -> None:
+    """Test that push_data_stream pulls no more items from the producer than the budget allows."""
+    async with setup_mocked_charging(
+        Configuration(max_total_charge_usd=Decimal('5.00'), test_pay_per_event=True),
+        {'scrape': Decimal('0.50'), 'apify-default-dataset-item': Decimal('0.50')},
+    ) as setup:
+        assert Actor.calculate_max_push_data_count_within_limit('scrape') == 5
+        assert Actor.calculate_max_push_data_count_within_limit() == 10
+
+        produced = list[int]()
+        closed = False
+
+        async def produce() -> AsyncIterator[dict]:
+            nonlocal closed
+            try:
+                for i in range(100):
+                    produced.append(i)
+                    yield {'id': i}
+            finally:
+                closed = True
+
+        result = await Actor.push_data_stream(produce(), charged_event_name='scrape', batch_size=2)
+
+        assert result.charged_count == 5
+        assert result.event_charge_limit_reached is True
+        assert produced == [0, 1, 2, 3, 4]
+        # The producer is closed rather than left suspended once no more of its items are pulled.
+        assert closed
+        assert setup.charging_mgr.calculate_max_push_data_count_within_limit('scrape') == 0
+
+        dataset = await Actor.open_dataset()
+        items = await dataset.get_data()
+        assert [item['id'] for item in items.items] == [0, 1, 2, 3, 4]
+
+
+async def test_push_item_stream_pushes_none_items() -> None:
+    """Test that a `None` item does not end the stream of items early."""
+    pushed = list[list[int | None]]()
+
+    async def push_batch(batch: list[int | None]) -> None:
+        pushed.append(batch)
+
+    await push_item_stream([1, None, 2, None], push_batch, batch_size=3)
+
+    assert pushed == [[1, None, 2], [None]]
+
+
+async def test_push_data_accepts_a_generator_and_stops_pulling_it_at_the_budget() -> None:
+    """Test that push_data pushes the items of a generator, pulling no more of them than the budget allows."""
+    async with setup_mocked_charging(
+        Configuration(max_total_charge_usd=Decimal('3.00'), test_pay_per_event=True),
+        {'scrape': Decimal('0.50'), 'apify-default-dataset-item': Decimal('0.50')},
+    ) as setup:
+        produced = list[int]()
+
+        def produce() -> Iterator[dict]:
+            for i in range(5000):
+                produced.append(i)
+                yield {'id': i}
+
+        result = await Actor.push_data(produce(), charged_event_name='scrape')
+
+        assert result.charged_count == 3
+        assert result.event_charge_limit_reached is True
+        assert produced == [0, 1, 2]
+
+        await setup.charging_mgr.flush_charges()
+        charged = {call.args[0]: call.kwargs['count'] for call in setup.mock_charge.call_args_list}
+        assert charged == {'scrape': 3}
+
+        dataset = await Actor.open_dataset()
+        items = await dataset.get_data()
+        assert [item['id'] for item in items.items] == [0, 1, 2]
+
+
 async def test_push_data_charges_synthetic_event_for_default_dataset() -> None:
     """Test that push_data charges both the explicit event and the synthetic apify-default-dataset-item event."""
     async with setup_mocked_charging(
@@ -271,6 +353,36 @@ async def test_push_data_does_not_take_charge_lock_without_pay_per_event(monkeyp
         charge_lock.assert_not_called()
 
 
+async def test_push_data_skips_charging_without_pay_per_event(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """`Actor.push_data` neither reserves nor commits any budget when the Actor does not use pay-per-event pricing."""
+    async with Actor:
+        charging_manager = cast('ChargingManagerImplementation', Actor.get_charging_manager())
+        reserve = Mock(wraps=charging_manager.reserve)
+        monkeypatch.setattr(charging_manager, 'reserve', reserve)
+
+        result = await Actor.push_data([{'id': 1}, {'id': 2}])
+        assert result == _charging.ChargeResult(
+            event_charge_limit_reached=False, charged_count=0, chargeable_within_limit={}
+        )
+
+        await Actor.push_data(({'id': i} for i in range(3, 5)), charged_event_name='scrape')
+
+        reserve.assert_not_called()
+        assert 'does not use the pay-per-event pricing' in caplog.text
+
+        dataset = await Actor.open_dataset()
+        items = await dataset.get_data()
+        assert [item['id'] for item in items.items] == [1, 2, 3, 4]
+
+
+async def test_charge_lock_if_charging_is_a_deprecated_no_op() -> None:
+    with pytest.deprecated_call(match='charge_lock_if_charging'):
+        async with _charging.charge_lock_if_charging():
+            pass
+
+
 async def test_charge_with_overdrawn_budget() -> None:
     configuration = Configuration(
         max_total_charge_usd=Decimal('0.00025'),
@@ -308,3 +420,116 @@ async def test_charge_with_overdrawn_budget() -> None:
         assert push_result.charged_count == 0  # Nor does the budget allow this
 
         setup.mock_charge.assert_not_called()
+
+
+async def test_concurrent_charges_are_submitted_together() -> None:
+    async with setup_mocked_charging(
+        Configuration(max_total_charge_usd=Decimal('100.0'), test_pay_per_event=True),
+        {'event': Decimal('0.01'), 'other-event': Decimal('0.01')},
+    ) as setup:
+        results = await asyncio.gather(
+            *(Actor.charge('event', count=1) for _ in range(50)), Actor.charge('other-event', count=3)
+        )
+
+        # The charges are accounted for right away, but not submitted yet.
+        assert all(result.charged_count > 0 for result in results)
+        assert setup.charging_mgr.get_charged_event_count('event') == 50
+        setup.mock_charge.assert_not_called()
+
+        await setup.charging_mgr.flush_charges()
+
+        assert sorted((call.args[0], call.kwargs['count']) for call in setup.mock_charge.call_args_list) == [
+            ('event', 50),
+            ('other-event', 3),
+        ]
+
+
+async def test_failed_charge_submission_is_retried_with_the_same_idempotency_key() -> None:
+    async with setup_mocked_charging(
+        Configuration(max_total_charge_usd=Decimal('10.0'), test_pay_per_event=True), {'event': Decimal('1.0')}
+    ) as setup:
+        failures = [RuntimeError('Service unavailable')]
+
+        async def charge(*_: object, **__: object) -> None:
+            if failures:
+                raise failures.pop()
+
+        setup.mock_charge.side_effect = charge
+
+        await Actor.charge('event', count=2)
+        await setup.charging_mgr.flush_charges()
+        await Actor.charge('event', count=1)
+        await setup.charging_mgr.flush_charges()
+
+        first_call, retried_call, next_call = setup.mock_charge.call_args_list
+        assert retried_call == first_call
+        assert retried_call.kwargs['count'] == 2
+        assert next_call.kwargs['count'] == 1
+        assert next_call.kwargs['idempotency_key'] != first_call.kwargs['idempotency_key']
+
+
+async def test_charges_are_submitted_in_background(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_charging, 'CHARGE_FLUSH_THRESHOLD', 10)
+
+    async with setup_mocked_charging(
+        Configuration(max_total_charge_usd=Decimal('100.0'), test_pay_per_event=True), {'event': Decimal('0.01')}
+    ) as setup:
+        submitted = asyncio.Event()
+        setup.mock_charge.side_effect = lambda *_, **__: submitted.set()
+
+        await Actor.charge('event', count=10)
+
+        # Enough charges accumulated to submit them without waiting for the flush interval.
+        await asyncio.wait_for(submitted.wait(), timeout=0.5)
+        setup.mock_charge.assert_called_once_with('event', count=10, idempotency_key=ANY)
+
+
+async def test_concurrent_push_data_uploads_in_parallel(monkeypatch: pytest.MonkeyPatch) -> None:
+    async with setup_mocked_charging(
+        Configuration(max_total_charge_usd=Decimal('0.50'), test_pay_per_event=True),
+        {'scrape': Decimal('0.10')},
+    ) as setup:
+        dataset = await Actor.open_dataset()
+        client = dataset._client
+        push_data = client.push_data
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_push_data(data: Any) -> None:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            await push_data(data)
+            in_flight -= 1
+
+        monkeypatch.setattr(client, 'push_data', slow_push_data)
+
+        results = await asyncio.gather(
+            *(Actor.push_data([{'id': i}, {'id': i}], charged_event_name='scrape') for i in range(3))
+        )
+
+        # The uploads overlapped, yet only the items that fit within the budget were pushed and charged.
+        assert max_in_flight == 3
+        assert sorted(result.charged_count for result in results) == [1, 2, 2]
+        assert setup.charging_mgr.get_charged_event_count('scrape') == 5
+        assert len((await dataset.get_data()).items) == 5
+
+
+async def test_failed_push_data_refunds_reserved_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    async with setup_mocked_charging(
+        Configuration(max_total_charge_usd=Decimal('1.00'), test_pay_per_event=True),
+        {'scrape': Decimal('0.10')},
+    ) as setup:
+        dataset = await Actor.open_dataset()
+
+        async def failing_push_data(**_: Any) -> None:
+            raise RuntimeError('Upload failed')
+
+        with monkeypatch.context() as patch_context:
+            patch_context.setattr(dataset._client, 'push_data', failing_push_data)
+            with pytest.raises(RuntimeError, match='Upload failed'):
+                await Actor.push_data([{'id': i} for i in range(10)], charged_event_name='scrape')
+
+        assert setup.charging_mgr.get_charged_event_count('scrape') == 0
+        assert setup.charging_mgr.calculate_max_event_charge_count_within_limit('scrape') == 10
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from unittest.mock import AsyncMock
+
 import pytest
 
+from crawlee import service_locator
+
 from apify import Actor
+from apify.storage_clients import ApifyStorageClient, MemoryStorageClient, SmartApifyStorageClient
 
 
 async def test_throws_error_without_actor_init() -> None:
@@ -29,6 +34,20 @@ async def test_open_dataset_returns_same_references() -> None:
         assert dataset_by_id_2 is dataset_by_id_1
 
 
+async def test_open_storages_opens_aliased_storages() -> None:
+    async with Actor:
+        datasets, key_value_stores, request_queues = await Actor.open_storages(
+            dataset_aliases=['first', 'second', 'first'],
+            key_value_store_aliases=['cache'],
+        )
+
+        assert list(datasets) == ['first', 'second']
+        assert datasets['first'] is not datasets['second']
+        assert datasets['first'] is await Actor.open_dataset(alias='first')
+        assert key_value_stores['cache'] is await Actor.open_key_value_store(alias='cache')
+        assert request_queues == {}
+
+
 async def test_push_data_to_dataset() -> None:
     async with Actor as actor:
         dataset = await actor.open_dataset()
@@ -37,3 +56,44 @@ async def test_push_data_to_dataset() -> None:
 
         list_page = await dataset.get_data(limit=desired_item_count)
         assert {item['id'] for item in list_page.items} == set(range(desired_item_count))
+
+
+async def test_push_data_opens_the_default_dataset_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    async with Actor:
+        open_dataset = AsyncMock(wraps=Actor.open_dataset)
+        monkeypatch.setattr(Actor, 'open_dataset', open_dataset)
+
+        for i in range(3):
+            await Actor.push_data({'id': i})
+
+        assert open_dataset.await_count == 1
+
+
+async def test_push_data_opens_the_default_dataset_again_after_it_is_dropped() -> None:
+    async with Actor:
+        await Actor.push_data({'id': 1})
+        dropped_dataset = await Actor.open_dataset()
+        await dropped_dataset.drop()
+
+        await Actor.push_data({'id': 2})
+
+        dataset = await Actor.open_dataset()
+        assert dataset is not dropped_dataset
+        assert [item['id'] for item in (await dataset.get_data()).items] == [2]
+
+
+async def test_push_data_opens_the_default_dataset_again_after_it_is_dropped_with_a_memory_storage() -> None:
+    service_locator.set_storage_client(
+        SmartApifyStorageClient(local_storage_client=MemoryStorageClient(), cloud_storage_client=ApifyStorageClient())
+    )
+
+    async with Actor:
+        await Actor.push_data({'id': 1})
+        dropped_dataset = await Actor.open_dataset()
+        await dropped_dataset.drop()
+
+        await Actor.push_data({'id': 2})
+
+        dataset = await Actor.open_dataset()
+        assert dataset is not dropped_dataset
+        assert [item['id'] for item in (await dataset.get_data()).items] == [2]
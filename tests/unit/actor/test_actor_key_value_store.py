@@ -3,6 +3,7 @@ from __future__ import annotations
 import pytest
 
 from crawlee._utils.file import json_dumps
+from crawlee.events import Event, EventPersistStateData
 
 from ..._utils import PRIVATE_KEY_PASSWORD, PRIVATE_KEY_PEM_BASE64, PUBLIC_KEY, poll_until_condition
 from apify import Actor
@@ -187,3 +188,24 @@ async def test_use_state_with_multiple_stores() -> None:
 
     saved_state_custom = await kvs_custom.get_value('APIFY_GLOBAL_STATE')
     assert saved_state_custom == {'value': 'custom_store'}
+
+
+async def test_use_state_incremental_is_restored_in_next_run() -> None:
+    async with Actor as actor:
+        state = await actor.use_state({'processed': 0}, incremental=True)
+        assert await actor.use_state(incremental=True) is state
+
+        state['processed'] = 1
+        actor.event_manager.emit(event=Event.PERSIST_STATE, event_data=EventPersistStateData(is_migrating=True))
+
+        kvs = await actor.open_key_value_store()
+        await poll_until_condition(
+            lambda: kvs.get_value('APIFY_GLOBAL_STATE_SNAPSHOT'),
+            lambda value: value is not None,
+            poll_interval=0.05,
+        )
+        state['last_url'] = 'https://example.com'
+
+    async with Actor as actor:
+        state = await actor.use_state({'processed': 0}, incremental=True)
+        assert state == {'processed': 1, 'last_url': 'https://example.com'}
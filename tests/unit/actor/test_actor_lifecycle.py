@@ -15,13 +15,16 @@ import websockets
 import websockets.asyncio.server
 
 from apify_client._models import Run
-from crawlee.events._types import Event, EventAbortingData, EventPersistStateData
+from crawlee.events._types import Event, EventAbortingData, EventMigratingData, EventPersistStateData
 
+import apify._actor
 from ..._utils import poll_until_condition
 from apify import Actor
 from apify._actor import _ActorType
 from apify._charging import ChargingManagerImplementation
 from apify._consts import EXIT_CODE_ERROR_USER_FUNCTION_THREW, ActorEnvVars, ApifyEnvVars
+from apify.storage_clients._apify._alias_resolving import AliasResolver
+from apify.storage_clients._apify._request_queue_shared_client import ApifyRequestQueueSharedClient
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator, Callable
@@ -417,6 +420,48 @@ async def test_actor_handles_migrating_event_correctly(monkeypatch: pytest.Monke
         assert event_data == EventPersistStateData(is_migrating=False)
 
 
+@pytest.mark.parametrize(
+    ('event', 'event_data'),
+    [(Event.MIGRATING, EventMigratingData()), (Event.ABORTING, EventAbortingData())],
+    ids=['migrating', 'aborting'],
+)
+async def test_actor_releases_unused_request_locks_on_shutdown_events(
+    monkeypatch: pytest.MonkeyPatch, event: Event, event_data: EventMigratingData | EventAbortingData
+) -> None:
+    """Migrating and aborting release the unused shared request queue locks, and so does the final exit."""
+    release = AsyncMock()
+    monkeypatch.setattr(ApifyRequestQueueSharedClient, 'release_all_unused_locks', release)
+
+    async with Actor:
+        Actor.event_manager.emit(event=event, event_data=event_data)
+        await Actor.event_manager.wait_for_all_listeners_to_complete()
+        assert release.await_count == 1
+
+    assert release.await_count == 2
+
+
+async def test_actor_exit_releases_shared_api_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    clear_api_client_cache = Mock()
+    monkeypatch.setattr(apify._actor, 'clear_api_client_cache', clear_api_client_cache)
+
+    async with Actor:
+        clear_api_client_cache.assert_not_called()
+
+    clear_api_client_cache.assert_called_once()
+
+
+async def test_actor_exit_flushes_pending_alias_mappings(monkeypatch: pytest.MonkeyPatch) -> None:
+    flush_mappings = AsyncMock()
+    monkeypatch.setattr(AliasResolver, 'flush_mappings', flush_mappings)
+
+    async with Actor:
+        # Persisting the state (also done on start) writes the mappings as well.
+        await asyncio.sleep(0.1)
+        flush_mappings.reset_mock()
+
+    flush_mappings.assert_awaited()
+
+
 async def test_actor_fail_prevents_further_execution(caplog: pytest.LogCaptureFixture) -> None:
     """Test that calling Actor.fail() prevents further code execution in the Actor context."""
     caplog.set_level(logging.INFO)
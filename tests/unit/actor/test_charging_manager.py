@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
 from decimal import Decimal
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import ANY, AsyncMock, MagicMock
 
 import pytest
 
-from apify._charging import ActorChargeEvent, ChargingManagerImplementation, PayPerEventActorPricingInfo
+from apify import _charging
+from apify._charging import (
+    CHARGING_LOG_BATCH_SIZE,
+    ActorChargeEvent,
+    ChargingManagerImplementation,
+    PayPerEventActorPricingInfo,
+    PricingInfoItem,
+    charging_manager_ctx,
+)
 from apify._configuration import Configuration
+from apify.storages import KeyValueStore
 
 
 def _make_config(**kwargs: Any) -> Configuration:
@@ -466,3 +477,261 @@ async def test_compute_chargeable_updates_after_charge(mock_client: MagicMock) -
         # $6.00 remaining: search=$1.00 → 6, scrape=$2.00 → 3
         assert chargeable['search'] == 6
         assert chargeable['scrape'] == 3
+
+
+async def test_reserved_budget_is_not_available_until_settled(mock_client: MagicMock) -> None:
+    pricing_info = _make_ppe_pricing_info({'search': Decimal('1.00'), 'scrape': Decimal('2.00')})
+    config = _make_config(
+        test_pay_per_event=True,
+        actor_pricing_info=pricing_info,
+        charged_event_counts={},
+        max_total_charge_usd=Decimal('10.00'),
+    )
+    cm = ChargingManagerImplementation(config, mock_client)
+    async with cm:
+        reservation = cm.reserve(['search', 'scrape'], 5)
+        assert reservation.count == 3
+        assert cm.calculate_max_event_charge_count_within_limit('search') == 1
+
+        result = await cm.commit(reservation, count=2)
+        assert result.charged_count == 2
+        assert cm.get_charged_event_count('scrape') == 2
+        assert cm.calculate_max_event_charge_count_within_limit('search') == 4
+
+        refunded = cm.reserve(['search'], 4)
+        cm.refund(refunded)
+        assert cm.calculate_max_event_charge_count_within_limit('search') == 4
+
+        with pytest.raises(RuntimeError, match='already committed or refunded'):
+            cm.refund(refunded)
+
+
+async def test_charging_log_is_written_in_batches(mock_client: MagicMock) -> None:
+    pricing_info = _make_ppe_pricing_info({'search': Decimal('0.01')})
+    config = _make_config(
+        test_pay_per_event=True,
+        actor_pricing_info=pricing_info,
+        charged_event_counts={},
+    )
+    cm = ChargingManagerImplementation(config, mock_client)
+    async with cm:
+        charging_log = MagicMock(push_data=AsyncMock())
+        cm._charging_log_dataset = charging_log
+
+        for _ in range(CHARGING_LOG_BATCH_SIZE + 1):
+            await cm.charge('search')
+
+        charging_log.push_data.assert_awaited_once()
+        assert len(charging_log.push_data.call_args.args[0]) == CHARGING_LOG_BATCH_SIZE
+
+    assert charging_log.push_data.await_count == 2
+    assert len(charging_log.push_data.call_args.args[0]) == 1
+    assert charging_log.push_data.call_args.args[0][0]['event_name'] == 'search'
+
+
+async def test_failed_charging_log_write_does_not_fail_charges(
+    mock_client: MagicMock, caplog: pytest.LogCaptureFixture
+) -> None:
+    config = _make_config(
+        is_at_home=True,
+        actor_run_id='test-run-id',
+        actor_pricing_info=_make_ppe_pricing_info({'search': Decimal('0.01')}),
+        charged_event_counts={},
+    )
+    mock_charge = mock_client.run.return_value.charge
+
+    cm = ChargingManagerImplementation(config, mock_client)
+    async with cm:
+        charging_log = MagicMock(push_data=AsyncMock(side_effect=RuntimeError('Dataset unavailable')))
+        cm._charging_log_dataset = charging_log
+
+        for _ in range(CHARGING_LOG_BATCH_SIZE):
+            result = await cm.charge('search')
+            assert result.charged_count == 1
+
+        await cm.flush_charges()
+
+        mock_charge.assert_awaited_once_with('search', count=CHARGING_LOG_BATCH_SIZE, idempotency_key=ANY)
+        assert len(cm._charging_log_buffer) == CHARGING_LOG_BATCH_SIZE
+
+        charging_log.push_data.side_effect = None
+        await cm.flush_charges()
+
+    assert 'Failed to write the local charging log' in caplog.text
+    assert len(charging_log.push_data.call_args.args[0]) == CHARGING_LOG_BATCH_SIZE
+    assert not cm._charging_log_buffer
+
+
+async def test_budget_checks_are_exact_for_decimal_prices(mock_client: MagicMock) -> None:
+    pricing_info = _make_ppe_pricing_info(
+        {'search': Decimal('0.1'), 'scrape': Decimal('0.0000001'), 'parse': Decimal('0.0000015')}
+    )
+    config = _make_config(
+        test_pay_per_event=True,
+        actor_pricing_info=pricing_info,
+        charged_event_counts={'search': 1},
+        max_total_charge_usd=Decimal('0.4'),
+    )
+    cm = ChargingManagerImplementation(config, mock_client)
+    async with cm:
+        assert cm.calculate_max_event_charge_count_within_limit('search') == 3
+
+        # Prices below a micro-dollar, or not a whole number of them, are not rounded by the budget checks.
+        assert cm.calculate_max_event_charge_count_within_limit('scrape') == 3_000_000
+        assert cm.calculate_max_event_charge_count_within_limit('parse') == 200_000
+
+        result = await cm.charge('search', count=5)
+        assert result.charged_count == 3
+        assert result.event_charge_limit_reached is True
+        assert cm.calculate_total_charged_amount() == Decimal('0.4')
+
+
+async def test_budget_checks_stay_exact_for_prices_added_while_charging(mock_client: MagicMock) -> None:
+    config = _make_config(
+        test_pay_per_event=True,
+        actor_pricing_info=_make_ppe_pricing_info({'search': Decimal('0.01')}),
+        charged_event_counts={},
+        max_total_charge_usd=Decimal('1.00'),
+    )
+    cm = ChargingManagerImplementation(config, mock_client)
+    async with cm:
+        await cm.charge('search', count=50)
+        reservation = cm.reserve(['search'], 10)
+
+        # The finer price converts the amounts already charged and reserved to a finer budget unit.
+        cm._add_event_pricing('scrape', PricingInfoItem(Decimal('0.000000001'), title='scrape'))
+
+        assert cm.calculate_max_event_charge_count_within_limit('search') == 40
+        assert cm.calculate_max_event_charge_count_within_limit('scrape') == 400_000_000
+
+        cm.refund(reservation)
+        assert cm.calculate_max_event_charge_count_within_limit('search') == 50
+
+
+async def test_charging_state_is_restored_after_migration(mock_client: MagicMock) -> None:
+    pricing_info = _make_ppe_pricing_info({'search': Decimal('1.00')})
+
+    def make_config() -> Configuration:
+        # The charged event counts the migrated run starts with are stale.
+        return _make_config(
+            is_at_home=True,
+            actor_run_id='test-run-id',
+            actor_pricing_info=pricing_info,
+            charged_event_counts={'search': 1},
+            max_total_charge_usd=Decimal('10.00'),
+        )
+
+    mock_charge = mock_client.run.return_value.charge
+    mock_charge.side_effect = RuntimeError('The platform is unreachable')
+
+    cm = ChargingManagerImplementation(make_config(), mock_client)
+    async with cm:
+        await cm.charge('search', count=4)
+
+    idempotency_key = mock_charge.call_args.kwargs['idempotency_key']
+    mock_charge.reset_mock(side_effect=True)
+
+    migrated_cm = ChargingManagerImplementation(make_config(), mock_client)
+    async with migrated_cm:
+        assert migrated_cm.get_charged_event_count('search') == 5
+        assert migrated_cm.calculate_max_event_charge_count_within_limit('search') == 5
+
+        await migrated_cm.flush_charges()
+        mock_charge.assert_awaited_once_with('search', count=4, idempotency_key=idempotency_key)
+
+
+@pytest.mark.parametrize(
+    ('is_at_home', 'stored_state'),
+    [
+        pytest.param(
+            False,
+            {'runId': None, 'chargedEventCounts': {'search': 8}, 'unsubmittedCharges': []},
+            id='local-run',
+        ),
+        pytest.param(
+            True,
+            {'runId': 'previous-run-id', 'chargedEventCounts': {'search': 8}, 'unsubmittedCharges': []},
+            id='another-run',
+        ),
+        pytest.param(True, {'chargedEventCounts': {'search': 'many'}}, id='invalid-state'),
+    ],
+)
+async def test_charging_state_is_not_restored_unless_persisted_by_the_same_run(
+    mock_client: MagicMock, *, is_at_home: bool, stored_state: dict[str, Any]
+) -> None:
+    kvs = await KeyValueStore.open()
+    await kvs.set_value(ChargingManagerImplementation.CHARGING_STATE_KEY, stored_state)
+
+    config = _make_config(
+        is_at_home=is_at_home,
+        actor_run_id='test-run-id' if is_at_home else None,
+        test_pay_per_event=not is_at_home,
+        actor_pricing_info=_make_ppe_pricing_info({'search': Decimal('1.00')}),
+        charged_event_counts={'search': 1},
+        max_total_charge_usd=Decimal('10.00'),
+    )
+
+    cm = ChargingManagerImplementation(config, mock_client)
+    async with cm:
+        assert cm.get_charged_event_count('search') == 1
+        assert cm.calculate_max_event_charge_count_within_limit('search') == 9
+
+
+async def test_failed_background_flush_is_logged_and_retried(
+    mock_client: MagicMock, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(_charging, 'CHARGE_FLUSH_INTERVAL', timedelta(milliseconds=10))
+    config = _make_config(
+        is_at_home=True,
+        actor_run_id='test-run-id',
+        actor_pricing_info=_make_ppe_pricing_info({'search': Decimal('1.00')}),
+        charged_event_counts={},
+    )
+    submitted = asyncio.Event()
+    mock_charge = mock_client.run.return_value.charge
+    mock_charge.side_effect = lambda *_, **__: submitted.set()
+
+    cm = ChargingManagerImplementation(config, mock_client)
+    async with cm:
+        prepare_submissions = cm._prepare_submissions
+        failed = False
+
+        def prepare_submissions_failing_once() -> None:
+            nonlocal failed
+            if not failed:
+                failed = True
+                raise RuntimeError('Unexpected failure')
+            prepare_submissions()
+
+        monkeypatch.setattr(cm, '_prepare_submissions', prepare_submissions_failing_once)
+        await cm.charge('search', count=2)
+
+        await asyncio.wait_for(submitted.wait(), timeout=1)
+
+    assert failed
+    assert 'Failed to submit the accumulated charges' in caplog.text
+    mock_charge.assert_awaited_once_with('search', count=2, idempotency_key=ANY)
+
+
+async def test_exit_persists_state_when_final_flush_fails(
+    mock_client: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config = _make_config(
+        test_pay_per_event=True,
+        actor_pricing_info=_make_ppe_pricing_info({'search': Decimal('1.00')}),
+        charged_event_counts={},
+    )
+    cm = ChargingManagerImplementation(config, mock_client)
+    await cm.__aenter__()
+    assert charging_manager_ctx.get() is cm
+
+    persist_state = AsyncMock()
+    monkeypatch.setattr(cm, 'flush_charges', AsyncMock(side_effect=RuntimeError('Unexpected failure')))
+    monkeypatch.setattr(cm, 'persist_state', persist_state)
+
+    with pytest.raises(RuntimeError, match='Unexpected failure'):
+        await cm.__aexit__(None, None, None)
+
+    persist_state.assert_awaited_once()
+    assert charging_manager_ctx.get() is None
+    assert not cm.active
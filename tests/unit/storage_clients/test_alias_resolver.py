@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import copy
+from datetime import timedelta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from apify_client import ApifyClientAsync
@@ -14,6 +17,14 @@ def _api_client() -> ApifyClientAsync:
     return ApifyClientAsync(token='test-token')
 
 
+def _fake_kvs_client(stored_record: dict[str, Any]) -> AsyncMock:
+    """Build a fake default KVS client keeping the alias mapping record in `stored_record`."""
+    kvs_client = AsyncMock()
+    kvs_client.get_record = AsyncMock(side_effect=lambda _key: copy.deepcopy(stored_record))
+    kvs_client.set_record = AsyncMock(side_effect=lambda key, value: stored_record.update(value=value))  # noqa: ARG005
+    return kvs_client
+
+
 def test_storage_key_format() -> None:
     """Test that _storage_key has the expected format: type,alias,hash."""
     config = Configuration(token='test-token', api_base_url='https://api.apify.com')
@@ -67,14 +78,17 @@ async def test_concurrent_alias_creation_uses_lock() -> None:
     config = Configuration(token='test-token')
     resolver = AliasResolver(storage_type='Dataset', alias='test', configuration=config, api_client=_api_client())
 
+    other_resolver = AliasResolver(
+        storage_type='Dataset', alias='other', configuration=config, api_client=_api_client()
+    )
+
     async with resolver:
-        # Lock should be acquired
-        lock = await AliasResolver._get_alias_init_lock()
-        assert lock.locked()
+        # Lock should be acquired, for this alias only
+        assert resolver._get_alias_init_lock().locked()
+        assert not other_resolver._get_alias_init_lock().locked()
 
     # Lock should be released after exiting
-    lock = await AliasResolver._get_alias_init_lock()
-    assert not lock.locked()
+    assert not resolver._get_alias_init_lock().locked()
 
 
 async def test_get_alias_map_returns_in_memory_map() -> None:
@@ -114,12 +128,11 @@ async def test_store_mapping_uses_injected_configuration_is_at_home() -> None:
     config = Configuration(is_at_home=True, token='test-token', default_key_value_store_id='default-kvs-id')
     resolver = AliasResolver(storage_type='Dataset', alias='test-alias', configuration=config, api_client=_api_client())
 
-    fake_kvs_client = AsyncMock()
-    fake_kvs_client.get_record = AsyncMock(return_value=None)
-    fake_kvs_client.set_record = AsyncMock(return_value=None)
+    fake_kvs_client = _fake_kvs_client({})
 
     with patch.object(AliasResolver, '_get_default_kvs_client', return_value=fake_kvs_client):
         await resolver.store_mapping(storage_id='new-id-789')
+        await AliasResolver.flush_mappings()
 
     fake_kvs_client.set_record.assert_awaited_once()
     assert AliasResolver._alias_map[resolver._storage_key] == 'new-id-789'
@@ -182,9 +195,7 @@ def test_alias_resolution_runs_across_event_loops_with_shared_client() -> None:
     """A single injected client can drive alias resolution from more than one event loop without loop-bound state."""
     config = Configuration(is_at_home=True, token='test-token', default_key_value_store_id='default-kvs-id')
 
-    kvs_client = AsyncMock()
-    kvs_client.get_record = AsyncMock(return_value={'value': {}})
-    kvs_client.set_record = AsyncMock(return_value=None)
+    kvs_client = _fake_kvs_client({'value': {}})
     api_client = MagicMock()
     api_client.key_value_store = MagicMock(return_value=kvs_client)
 
@@ -192,10 +203,14 @@ def test_alias_resolution_runs_across_event_loops_with_shared_client() -> None:
         # Each loop starts from clean class state and builds its own lock on the running loop.
         AliasResolver._alias_map = {}
         AliasResolver._alias_map_loaded = False
-        AliasResolver._alias_init_lock = None
+        AliasResolver._alias_init_locks = {}
+        AliasResolver._alias_map_lock = None
+        AliasResolver._pending_mappings = {}
+        AliasResolver._flush_task = None
         resolver = AliasResolver(storage_type='Dataset', alias=alias, configuration=config, api_client=api_client)
         async with resolver:
             await resolver.store_mapping(storage_id=storage_id)
+        await AliasResolver.flush_mappings()
 
     loop_a = asyncio.new_event_loop()
     loop_b = asyncio.new_event_loop()
@@ -208,3 +223,99 @@ def test_alias_resolution_runs_across_event_loops_with_shared_client() -> None:
 
     # The same injected client served both event loops.
     assert kvs_client.set_record.await_count == 2
+
+
+async def test_deferred_mappings_are_persisted_once() -> None:
+    """Mappings stored within the context resolve immediately and are written with a single update at its exit."""
+    config = Configuration(is_at_home=True, token='test-token', default_key_value_store_id='default-kvs-id')
+    api_client = _api_client()
+    resolvers = [
+        AliasResolver(storage_type='Dataset', alias=f'alias-{i}', configuration=config, api_client=api_client)
+        for i in range(3)
+    ]
+
+    fake_kvs_client = _fake_kvs_client({'value': {'existing-key': 'existing-id'}})
+
+    with patch.object(AliasResolver, '_get_default_kvs_client', return_value=fake_kvs_client):
+        async with AliasResolver.defer_mapping_persistence():
+            await asyncio.gather(
+                *(resolver.store_mapping(storage_id=f'id-{i}') for i, resolver in enumerate(resolvers))
+            )
+            assert [await resolver.resolve_id() for resolver in resolvers] == ['id-0', 'id-1', 'id-2']
+            fake_kvs_client.set_record.assert_not_awaited()
+
+    fake_kvs_client.set_record.assert_awaited_once()
+    assert fake_kvs_client.set_record.await_args_list[0].kwargs['value'] == {
+        'existing-key': 'existing-id',
+        **{resolver._storage_key: f'id-{i}' for i, resolver in enumerate(resolvers)},
+    }
+
+
+async def test_mappings_stored_within_flush_window_are_written_once() -> None:
+    config = Configuration(is_at_home=True, token='test-token', default_key_value_store_id='default-kvs-id')
+    api_client = _api_client()
+    resolvers = [
+        AliasResolver(storage_type='Dataset', alias=f'alias-{i}', configuration=config, api_client=api_client)
+        for i in range(100)
+    ]
+
+    stored_record: dict[str, Any] = {'value': {}}
+    fake_kvs_client = _fake_kvs_client(stored_record)
+
+    with (
+        patch.object(AliasResolver, '_FLUSH_WINDOW', timedelta(milliseconds=10)),
+        patch.object(AliasResolver, '_get_default_kvs_client', return_value=fake_kvs_client),
+    ):
+        for i, resolver in enumerate(resolvers):
+            await resolver.store_mapping(storage_id=f'id-{i}')
+        fake_kvs_client.set_record.assert_not_awaited()
+
+        await asyncio.sleep(0.05)
+
+    fake_kvs_client.set_record.assert_awaited_once()
+    assert stored_record['value'] == {resolver._storage_key: f'id-{i}' for i, resolver in enumerate(resolvers)}
+    assert AliasResolver._pending_mappings == {}
+
+
+async def test_flush_retries_when_mapping_is_overwritten_concurrently() -> None:
+    config = Configuration(is_at_home=True, token='test-token', default_key_value_store_id='default-kvs-id')
+    resolver = AliasResolver(storage_type='Dataset', alias='alias', configuration=config, api_client=_api_client())
+
+    # The read-back after the first write sees the mapping of another process, which overwrote this one.
+    fake_kvs_client = AsyncMock()
+    fake_kvs_client.get_record = AsyncMock(
+        side_effect=[
+            {'value': {}},
+            {'value': {}},
+            {'value': {'other-key': 'other-id'}},
+            {'value': {'other-key': 'other-id'}},
+            {'value': {'other-key': 'other-id', resolver._storage_key: 'id'}},
+        ]
+    )
+    fake_kvs_client.set_record = AsyncMock(return_value=None)
+
+    with patch.object(AliasResolver, '_get_default_kvs_client', return_value=fake_kvs_client):
+        await resolver.store_mapping(storage_id='id')
+        await AliasResolver.flush_mappings()
+
+    assert fake_kvs_client.set_record.await_count == 2
+    assert fake_kvs_client.set_record.await_args_list[1].kwargs['value'] == {
+        'other-key': 'other-id',
+        resolver._storage_key: 'id',
+    }
+
+
+async def test_failed_flush_keeps_mappings_pending() -> None:
+    config = Configuration(is_at_home=True, token='test-token', default_key_value_store_id='default-kvs-id')
+    resolver = AliasResolver(storage_type='Dataset', alias='alias', configuration=config, api_client=_api_client())
+
+    fake_kvs_client = AsyncMock()
+    fake_kvs_client.get_record = AsyncMock(side_effect=[None, RuntimeError('API unavailable')])
+
+    with patch.object(AliasResolver, '_get_default_kvs_client', return_value=fake_kvs_client):
+        await resolver.store_mapping(storage_id='id')
+        await AliasResolver.flush_mappings()
+
+    # The in-memory mapping is authoritative, the alias keeps resolving while its write waits for the next flush.
+    assert await resolver.resolve_id() == 'id'
+    assert AliasResolver._pending_mappings == {resolver._storage_key: (resolver, 'id')}
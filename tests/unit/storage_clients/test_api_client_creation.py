@@ -1,14 +1,25 @@
 from __future__ import annotations
 
 import json
+import time
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
 import brotli
 import pytest
 
+from apify_client._models import Dataset, KeyValueStore
+
 from apify import Actor
 from apify._configuration import Configuration
-from apify.storage_clients._apify._api_client_creation import _create_api_client, create_storage_api_client
+from apify.storage_clients import ApifyStorageClient
+from apify.storage_clients._apify._api_client_creation import (
+    _create_api_client,
+    clear_api_client_cache,
+    create_storage_api_client,
+)
+from apify.storage_clients._apify._storage_metadata_cache import StorageMetadataCache
+from apify.storages import RequestQueue
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -18,6 +29,8 @@ if TYPE_CHECKING:
 
     from apify_client import ApifyClientAsync
 
+    from .._request_queue_api_server import RequestQueueApiServer
+
 
 def test_create_api_client_without_token() -> None:
     """Test that _create_api_client raises ValueError when no token is set."""
@@ -110,3 +123,96 @@ async def test_sdk_client_compresses_request_body_with_brotli(
     assert captured['content_encoding'] == 'br'
     # The body must be genuinely brotli-compressed and round-trip back to the original items.
     assert json.loads(brotli.decompress(captured['body'])) == items
+
+
+async def test_storage_opens_share_api_client(httpserver: HTTPServer) -> None:
+    """Storages opened with the same credentials share one API client, different credentials get their own."""
+    api_url = str(httpserver.url_for('/')).removesuffix('/')
+    now = '2025-01-01T00:00:00.000Z'
+    for dataset_id in ('first-dataset', 'second-dataset'):
+        httpserver.expect_request(f'/v2/datasets/{dataset_id}', method='GET').respond_with_json(
+            {
+                'data': {
+                    'id': dataset_id,
+                    'userId': 'test-user-id',
+                    'createdAt': now,
+                    'modifiedAt': now,
+                    'accessedAt': now,
+                    'itemCount': 0,
+                    'cleanItemCount': 0,
+                    'consoleUrl': f'https://console.apify.com/storage/datasets/{dataset_id}',
+                }
+            }
+        )
+
+    config = Configuration(token='test-token', api_base_url=api_url, api_public_base_url=api_url)
+    other_config = Configuration(token='other-token', api_base_url=api_url, api_public_base_url=api_url)
+
+    first = await create_storage_api_client(storage_type='Dataset', configuration=config, id='first-dataset')
+    second = await create_storage_api_client(storage_type='Dataset', configuration=config, id='second-dataset')
+    other = await create_storage_api_client(storage_type='Dataset', configuration=other_config, id='first-dataset')
+
+    assert first._http_client is second._http_client
+    assert first._http_client is not other._http_client
+
+    clear_api_client_cache()
+    reopened = await create_storage_api_client(storage_type='Dataset', configuration=config, id='first-dataset')
+    assert reopened._http_client is not first._http_client
+
+
+async def test_opening_request_queue_costs_one_metadata_round_trip(
+    request_queue_api_server: RequestQueueApiServer,
+) -> None:
+    """The metadata fetched to verify the queue exists is reused by the open and the first metadata read."""
+    queue_id = request_queue_api_server.create_queue()
+    url = request_queue_api_server.url
+    config = Configuration(token='test-token', api_base_url=url, api_public_base_url=url)
+
+    rq = await RequestQueue.open(id=queue_id, storage_client=ApifyStorageClient(), configuration=config)
+    assert request_queue_api_server.call_counts['get_queue'] == 1
+
+    # Later reads observe the current state of the queue.
+    await rq.get_metadata()
+    assert request_queue_api_server.call_counts['get_queue'] == 2
+
+
+async def test_trusted_default_storage_id_is_not_verified(httpserver: HTTPServer) -> None:
+    api_url = str(httpserver.url_for('/')).removesuffix('/')
+    config = Configuration(
+        token='test-token',
+        api_base_url=api_url,
+        api_public_base_url=api_url,
+        default_dataset_id='default-dataset-id',
+        trust_default_storage_ids=True,
+    )
+
+    api_client = await create_storage_api_client(storage_type='Dataset', configuration=config)
+
+    assert api_client.resource_id == 'default-dataset-id'
+    assert httpserver.log == []
+
+
+def test_storage_metadata_cache_hands_over_metadata_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = datetime.now(tz=UTC)
+    metadata = Dataset(
+        id='dataset-id',
+        user_id='user-id',
+        created_at=now,
+        modified_at=now,
+        accessed_at=now,
+        item_count=0,
+        clean_item_count=0,
+        console_url='https://console.apify.com/storage/datasets/dataset-id',
+    )
+
+    StorageMetadataCache.put(metadata)
+    assert StorageMetadataCache.take('dataset-id', KeyValueStore) is None
+
+    StorageMetadataCache.put(metadata)
+    assert StorageMetadataCache.take('dataset-id', Dataset) is metadata
+    assert StorageMetadataCache.take('dataset-id', Dataset) is None
+
+    StorageMetadataCache.put(metadata)
+    fetched_at = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: fetched_at + 60)
+    assert StorageMetadataCache.take('dataset-id', Dataset) is None
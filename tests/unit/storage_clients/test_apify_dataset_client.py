@@ -2,15 +2,19 @@ from __future__ import annotations
 
 import asyncio
 import json
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 
 from crawlee._utils.byte_size import ByteSize
 
+from apify.storage_clients import _ppe_dataset_mixin
 from apify.storage_clients._apify._dataset_client import ApifyDatasetClient
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
 
 def _make_dataset_client(api_client: AsyncMock | None = None) -> tuple[ApifyDatasetClient, AsyncMock]:
     """Create an ApifyDatasetClient with a mocked API client."""
@@ -145,3 +149,43 @@ async def test_concurrent_multi_chunk_pushes_preserve_per_push_order(monkeypatch
     for push in range(concurrency):
         indices = [i for p, i in received if p == push]
         assert indices == list(range(items_per_push))
+
+
+async def test_push_data_pulls_an_iterable_in_batches_while_uploading(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Items of an iterable are pulled in bounded batches, the next one while the previous one is uploaded."""
+    monkeypatch.setattr(_ppe_dataset_mixin, 'STREAM_BATCH_SIZE', 3)
+    client, api_client = _make_dataset_client()
+    produced: list[int] = []
+    produced_at_upload: list[int] = []
+
+    def produce() -> Iterator[dict]:
+        for i in range(10):
+            produced.append(i)
+            yield {'id': i}
+
+    async def push_items(**_kwargs: Any) -> None:
+        produced_at_upload.append(len(produced))
+        await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(api_client, 'push_items', AsyncMock(side_effect=push_items))
+
+    await client.push_data(produce())
+
+    chunks = [json.loads(call.kwargs['items']) for call in api_client.push_items.await_args_list]
+    assert [[item['id'] for item in chunk] for chunk in chunks] == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+    # While a batch is uploaded, the next one is pulled already, but no more than that.
+    assert produced_at_upload == [6, 9, 10, 10]
+
+
+async def test_push_data_accepts_an_async_iterable() -> None:
+    """Items of an async iterable are pushed like the items of a list."""
+    client, api_client = _make_dataset_client()
+
+    async def produce() -> AsyncIterator[dict]:
+        for i in range(3):
+            yield {'id': i}
+
+    await client.push_data(produce())
+
+    chunk = api_client.push_items.await_args.kwargs['items']
+    assert chunk == '[{"id":0},{"id":1},{"id":2}]'
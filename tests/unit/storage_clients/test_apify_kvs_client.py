@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any
-from unittest.mock import AsyncMock
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from apify_client._models import ListOfKeys
 
 from apify.storage_clients._apify._key_value_store_client import ApifyKeyValueStoreClient
+from apify.storage_clients._apify._key_value_store_record_cache import KeyValueStoreRecordCache
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator
+    from pathlib import Path
 
 
 def _make_kvs_client(
@@ -128,8 +135,304 @@ async def test_iterate_keys_pagination() -> None:
     assert api_client.list_keys.await_count == 2
 
 
+def _list_of_keys(keys: list[str], *, is_truncated: bool) -> ListOfKeys:
+    return ListOfKeys.model_validate(
+        {
+            'items': [{'key': key, 'size': 1, 'recordPublicUrl': f'https://example.com/{key}'} for key in keys],
+            'count': len(keys),
+            'limit': 1000,
+            'isTruncated': is_truncated,
+            'nextExclusiveStartKey': keys[-1] if is_truncated else None,
+        }
+    )
+
+
+async def test_iterate_keys_requests_only_the_remaining_keys() -> None:
+    api_client = AsyncMock()
+    api_client.list_keys = AsyncMock(
+        side_effect=[_list_of_keys(['a', 'b'], is_truncated=True), _list_of_keys(['c'], is_truncated=True)]
+    )
+    client, _ = _make_kvs_client(api_client=api_client)
+
+    keys = [item.key async for item in client.iterate_keys(limit=3)]
+
+    assert keys == ['a', 'b', 'c']
+    assert [call.kwargs for call in api_client.list_keys.await_args_list] == [
+        {'exclusive_start_key': None, 'limit': 3},
+        {'exclusive_start_key': 'b', 'limit': 1},
+    ]
+
+
+async def test_iterate_keys_prefetches_the_next_page() -> None:
+    api_client = AsyncMock()
+    api_client.list_keys = AsyncMock(
+        side_effect=[_list_of_keys(['a', 'b'], is_truncated=True), _list_of_keys(['c'], is_truncated=False)]
+    )
+    client, _ = _make_kvs_client(api_client=api_client)
+
+    iterator = client.iterate_keys()
+    assert (await anext(iterator)).key == 'a'
+    await asyncio.sleep(0)
+
+    # The second page is requested before the first one is consumed.
+    assert api_client.list_keys.await_count == 2
+    assert [item.key async for item in iterator] == ['b', 'c']
+
+
+async def test_iterate_records_fetches_values_concurrently_in_order() -> None:
+    keys = [f'key-{i}' for i in range(10)]
+    api_client = AsyncMock()
+    api_client.list_keys = AsyncMock(return_value=_list_of_keys(keys, is_truncated=False))
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_get_record(key: str) -> dict[str, Any] | None:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later keys are served faster, so the records complete out of order.
+        await asyncio.sleep(0.001 * (len(keys) - keys.index(key)))
+        in_flight -= 1
+        return None if key == 'key-3' else {'key': key, 'value': key, 'content_type': 'text/plain'}
+
+    api_client.get_record = AsyncMock(side_effect=slow_get_record)
+    client, _ = _make_kvs_client(api_client=api_client)
+
+    records = [record.key async for record in client.iterate_records(max_concurrency=4)]
+
+    assert records == [key for key in keys if key != 'key-3']
+    assert max_in_flight == 4
+
+
 async def test_purge_raises_not_implemented() -> None:
     """Test that purge() raises NotImplementedError."""
     client, _ = _make_kvs_client()
     with pytest.raises(NotImplementedError, match='Purging key-value stores is not supported'):
         await client.purge()
+
+
+def _make_cached_kvs_client(
+    *, max_records: int = 10, ttl: timedelta = timedelta(minutes=1)
+) -> tuple[ApifyKeyValueStoreClient, AsyncMock]:
+    """Create an ApifyKeyValueStoreClient with a record cache, whose API client serves the records in `records`."""
+    records: dict[str, Any] = {'config': {'retries': 3}, 'blob': b'data'}
+    api_client = AsyncMock()
+    api_client.get_record = AsyncMock(
+        side_effect=lambda key: (
+            {'key': key, 'value': records[key], 'content_type': 'application/json'} if key in records else None
+        )
+    )
+    return _make_kvs_client(
+        api_client=api_client,
+        record_cache=KeyValueStoreRecordCache(max_records=max_records, ttl=ttl),
+    )
+
+
+async def test_cached_get_value_reads_record_once() -> None:
+    """Repeated reads of the same record, present or missing, are served from the cache."""
+    client, api_client = _make_cached_kvs_client()
+
+    for _ in range(3):
+        record = await client.get_value(key='config')
+        assert record is not None
+        assert record.value == {'retries': 3}
+        assert await client.get_value(key='missing') is None
+
+    assert api_client.get_record.await_count == 2
+    assert await client.record_exists(key='config')
+    assert not await client.record_exists(key='missing')
+    api_client.record_exists.assert_not_awaited()
+
+
+async def test_cached_values_are_not_shared_with_callers() -> None:
+    client, _ = _make_cached_kvs_client()
+
+    record = await client.get_value(key='config')
+    assert record is not None
+    record.value['retries'] = 0
+
+    cached_record = await client.get_value(key='config')
+    assert cached_record is not None
+    assert cached_record.value == {'retries': 3}
+
+
+@pytest.mark.parametrize('operation', ['set_value', 'delete_value'])
+async def test_cached_record_is_invalidated_by_write(operation: str) -> None:
+    client, api_client = _make_cached_kvs_client()
+    await client.get_value(key='config')
+
+    if operation == 'set_value':
+        await client.set_value(key='config', value={'retries': 5})
+    else:
+        await client.delete_value(key='config')
+    await client.get_value(key='config')
+
+    assert api_client.get_record.await_count == 2
+
+
+async def test_read_racing_with_write_is_not_cached() -> None:
+    """A record read while the same client writes it may be outdated, so it must not be cached."""
+    client, api_client = _make_cached_kvs_client()
+    read_started = asyncio.Event()
+    write_done = asyncio.Event()
+
+    async def slow_get_record(key: str) -> dict[str, Any]:
+        read_started.set()
+        await write_done.wait()
+        return {'key': key, 'value': 'old', 'content_type': 'text/plain'}
+
+    api_client.get_record = AsyncMock(side_effect=slow_get_record)
+    read = asyncio.create_task(client.get_value(key='config'))
+    await read_started.wait()
+    await client.set_value(key='config', value='new')
+    write_done.set()
+    await read
+
+    await client.get_value(key='config')
+    assert api_client.get_record.await_count == 2
+
+
+async def test_cached_records_expire_and_are_evicted() -> None:
+    client, api_client = _make_cached_kvs_client(max_records=1, ttl=timedelta(milliseconds=50))
+
+    await client.get_value(key='config')
+    await client.get_value(key='blob')  # Evicts 'config', the least recently used record.
+    await client.get_value(key='config')
+    assert api_client.get_record.await_count == 3
+
+    await asyncio.sleep(0.1)
+    await client.get_value(key='config')
+    assert api_client.get_record.await_count == 4
+
+
+async def test_bulk_writes_of_different_keys_run_concurrently() -> None:
+    client, api_client = _make_kvs_client()
+    in_flight: list[str] = []
+    max_in_flight = 0
+
+    async def slow_write(key: str, **_: Any) -> None:
+        nonlocal max_in_flight
+        in_flight.append(key)
+        max_in_flight = max(max_in_flight, len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(key)
+
+    api_client.set_record = AsyncMock(side_effect=slow_write)
+    api_client.delete_record = AsyncMock(side_effect=slow_write)
+
+    await client.set_values({f'key-{i}': i for i in range(20)}, max_concurrency=5)
+    assert api_client.set_record.await_count == 20
+    assert max_in_flight == 5
+
+    max_in_flight = 0
+    await client.delete_values([f'key-{i}' for i in range(20)], max_concurrency=20)
+    assert api_client.delete_record.await_count == 20
+    assert max_in_flight == 20
+
+
+async def test_writes_of_the_same_key_are_serialized() -> None:
+    client, api_client = _make_kvs_client()
+    writes: list[str] = []
+
+    async def slow_write(value: Any, **_: Any) -> None:
+        writes.append(f'start {value}')
+        await asyncio.sleep(0.01)
+        writes.append(f'end {value}')
+
+    api_client.set_record = AsyncMock(side_effect=slow_write)
+    await asyncio.gather(client.set_value(key='key', value='a'), client.set_value(key='key', value='b'))
+
+    assert writes == ['start a', 'end a', 'start b', 'end b']
+
+
+async def test_get_values_returns_records_by_key() -> None:
+    client, _ = _make_cached_kvs_client()
+
+    records = await client.get_values(['blob', 'missing', 'config', 'blob'])
+
+    assert list(records) == ['blob', 'missing', 'config']
+    assert records['blob'] is not None
+    assert records['blob'].value == b'data'
+    assert records['missing'] is None
+
+
+async def test_stream_value_yields_response_chunks(tmp_path: Path) -> None:
+    client, api_client = _make_kvs_client()
+
+    async def aiter_bytes() -> AsyncIterator[bytes]:
+        for chunk in (b'first ', b'second'):
+            yield chunk
+
+    response = MagicMock(headers={'content-length': '12'}, aiter_bytes=aiter_bytes)
+
+    @asynccontextmanager
+    async def stream_record(key: str) -> AsyncGenerator[dict[str, Any] | None]:
+        yield {'key': key, 'value': response, 'content_type': 'text/plain'} if key == 'archive' else None
+
+    api_client.stream_record = stream_record
+
+    async with client.stream_value(key='archive') as record:
+        assert record is not None
+        assert record.metadata.size == 12
+        assert [chunk async for chunk in record.chunks] == [b'first ', b'second']
+
+    target = tmp_path / 'archive.txt'
+    assert await client.save_value_to_file(key='archive', path=target)
+    assert target.read_bytes() == b'first second'
+    assert not await client.save_value_to_file(key='missing', path=tmp_path / 'missing')
+
+
+async def test_set_value_from_file_uploads_raw_bytes(tmp_path: Path) -> None:
+    client, api_client = _make_kvs_client()
+    source = tmp_path / 'page.html'
+    source.write_bytes(b'<html></html>')
+
+    await client.set_value_from_file(key='page', path=source)
+
+    api_client.set_record.assert_awaited_once_with(key='page', value=b'<html></html>', content_type='text/html')
+
+
+async def test_set_value_serializes_json_compactly() -> None:
+    client, api_client = _make_kvs_client()
+
+    await client.set_value(
+        key='state', value={'items': [1, 2], 'at': datetime(2024, 1, 1, tzinfo=UTC), 'name': 'Zürich'}
+    )
+
+    api_client.set_record.assert_awaited_once_with(
+        key='state',
+        value='{"items":[1,2],"at":"2024-01-01 00:00:00+00:00","name":"Zürich"}'.encode(),
+        content_type='application/json; charset=utf-8',
+    )
+
+
+async def test_set_value_rejects_nan() -> None:
+    client, api_client = _make_kvs_client()
+
+    with pytest.raises(ValueError, match='Out of range float values'):
+        await client.set_value(key='state', value={'ratio': float('nan')})
+
+    api_client.set_record.assert_not_awaited()
+
+
+async def test_set_value_uploads_bytes_without_copying() -> None:
+    client, api_client = _make_kvs_client()
+    payload = b'\x00' * 1024
+
+    await client.set_value(key='whole', value=memoryview(payload))
+    await client.set_value(key='slice', value=memoryview(payload)[:10])
+
+    whole_call, slice_call = api_client.set_record.await_args_list
+    assert whole_call.kwargs['value'] is payload
+    assert whole_call.kwargs['content_type'] == 'application/octet-stream'
+    assert slice_call.kwargs['value'] == b'\x00' * 10
+
+
+async def test_set_value_uploads_pre_serialized_values_as_is() -> None:
+    client, api_client = _make_kvs_client()
+
+    await client.set_value(key='state', value=b'{"a": 1}', content_type='application/json', pre_serialized=True)
+    api_client.set_record.assert_awaited_once_with(key='state', value=b'{"a": 1}', content_type='application/json')
+
+    with pytest.raises(TypeError, match='must be bytes-like or a string'):
+        await client.set_value(key='state', value={'a': 1}, pre_serialized=True)
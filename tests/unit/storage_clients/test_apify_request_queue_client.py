@@ -32,10 +32,10 @@ if TYPE_CHECKING:
     from collections.abc import Callable, Sequence
 
 
-def _make_metadata() -> RequestQueueMetadata:
+def _make_metadata(queue_id: str = 'test-rq-id') -> RequestQueueMetadata:
     now = datetime.now(tz=UTC)
     return RequestQueueMetadata(
-        id='test-rq-id',
+        id=queue_id,
         name='test-rq',
         accessed_at=now,
         created_at=now,
@@ -88,12 +88,20 @@ def _make_single_client(
     return client, api_client
 
 
+_HTTP_CLIENT = object()
+"""Stands in for the HTTP client shared by the API clients with the same credentials."""
+
+
 def _make_shared_client(
     api_client: AsyncMock | None = None,
+    *,
+    queue_id: str = 'test-rq-id',
+    http_client: object = _HTTP_CLIENT,
 ) -> tuple[ApifyRequestQueueSharedClient, AsyncMock]:
     if api_client is None:
         api_client = AsyncMock()
-    metadata = _make_metadata()
+    api_client._http_client = http_client
+    metadata = _make_metadata(queue_id)
     client = ApifyRequestQueueSharedClient(
         api_client=api_client,
         metadata=metadata,
@@ -811,11 +819,11 @@ async def test_mark_request_as_handled_clears_in_progress() -> None:
     fetched = await client.fetch_next_request()
 
     assert fetched is not None
-    assert request_id in client._requests_in_progress
+    assert request_id in client._head.requests_in_progress
 
     await client.mark_request_as_handled(fetched)
 
-    assert request_id not in client._requests_in_progress
+    assert request_id not in client._head.requests_in_progress
 
 
 async def test_reclaim_request_frees_in_progress() -> None:
@@ -835,14 +843,292 @@ async def test_reclaim_request_frees_in_progress() -> None:
     first = await client.fetch_next_request()
 
     assert first is not None
-    assert request_id in client._requests_in_progress
+    assert request_id in client._head.requests_in_progress
 
     await client.reclaim_request(first)
 
-    assert request_id not in client._requests_in_progress
+    assert request_id not in client._head.requests_in_progress
 
     # After reclaim the same request is eligible to be handed out again.
     second = await client.fetch_next_request()
 
     assert second is not None
     assert second.unique_key == request.unique_key
+
+
+async def test_release_unused_locks_releases_only_unstarted_requests() -> None:
+    """Locked head entries never handed out are released in parallel; requests in progress keep their locks."""
+    client, api_client = _make_shared_client()
+    requests = [Request.from_url(f'https://example.com/{i}') for i in range(3)]
+    request_ids = [unique_key_to_request_id(request.unique_key) for request in requests]
+    future = datetime.now(tz=UTC) + timedelta(seconds=180)
+
+    api_client.list_and_lock_head = AsyncMock(
+        return_value=_locked_head([_locked_item(request, lock_expires_at=future) for request in requests])
+    )
+    api_client.get_request = AsyncMock(side_effect=_client_request_getter(requests))
+    api_client.delete_request_lock = AsyncMock(return_value=None)
+
+    fetched = await client.fetch_next_request()
+    assert fetched is not None
+    assert fetched.unique_key == requests[0].unique_key
+
+    await client.release_unused_locks()
+
+    released = {call.args[0] for call in api_client.delete_request_lock.await_args_list}
+    assert released == set(request_ids[1:])
+    assert not client._head.queue_head
+    assert request_ids[0] in client._head.requests_in_progress
+
+
+async def test_release_unused_locks_tolerates_failures() -> None:
+    """A failed lock release is only logged; the remaining locks are still released."""
+    client, api_client = _make_shared_client()
+    requests = [Request.from_url(f'https://example.com/{i}') for i in range(2)]
+    future = datetime.now(tz=UTC) + timedelta(seconds=180)
+
+    api_client.list_and_lock_head = AsyncMock(
+        return_value=_locked_head([_locked_item(request, lock_expires_at=future) for request in requests])
+    )
+    api_client.delete_request_lock = AsyncMock(side_effect=[RuntimeError('lock lost'), None])
+
+    await client.is_empty()
+    await client.release_unused_locks()
+
+    assert api_client.delete_request_lock.await_count == 2
+    assert not client._head.queue_head
+
+
+async def test_release_unused_locks_stops_tracking_every_cleared_request() -> None:
+    """Every request cleared from the head leaves the lock expiry index, also the ones in progress."""
+    client, api_client = _make_shared_client()
+    head = client._head
+    api_client.delete_request_lock = AsyncMock(return_value=None)
+    expires_at = datetime.now(tz=UTC) + timedelta(minutes=3)
+
+    for request_id in ['request-in-progress', 'request-unused']:
+        head.track_lock(request_id, expires_at)
+        head.queue_head.append(request_id)
+    head.requests_in_progress.add('request-in-progress')
+
+    await head.release_unused_locks()
+
+    api_client.delete_request_lock.assert_awaited_once_with('request-unused')
+    assert not head.lock_expires_at
+    assert not head._lock_expiry_heap
+
+
+async def test_release_all_unused_locks_reaches_every_shared_queue() -> None:
+    clients = [_make_shared_client(queue_id=f'test-rq-id-{i}') for i in range(2)]
+    future = datetime.now(tz=UTC) + timedelta(seconds=180)
+
+    for index, (client, api_client) in enumerate(clients):
+        request = Request.from_url(f'https://example.com/{index}')
+        api_client.list_and_lock_head = AsyncMock(
+            return_value=_locked_head([_locked_item(request, lock_expires_at=future)])
+        )
+        api_client.delete_request_lock = AsyncMock(return_value=None)
+        await client.is_empty()
+
+    await ApifyRequestQueueSharedClient.release_all_unused_locks()
+
+    for _, api_client in clients:
+        api_client.delete_request_lock.assert_awaited_once()
+
+
+async def test_shared_clients_of_one_queue_share_locked_head() -> None:
+    """Requests locked by one shared client are handed to another client of the same queue without a new listing."""
+    first, first_api_client = _make_shared_client()
+    second, second_api_client = _make_shared_client()
+    requests = [Request.from_url(f'https://example.com/{i}') for i in range(3)]
+    future = datetime.now(tz=UTC) + timedelta(seconds=180)
+
+    first_api_client.list_and_lock_head = AsyncMock(
+        return_value=_locked_head([_locked_item(request, lock_expires_at=future) for request in requests])
+    )
+    for api_client in (first_api_client, second_api_client):
+        api_client.get_request = AsyncMock(side_effect=_client_request_getter(requests))
+
+    fetched_first = await first.fetch_next_request()
+    fetched_second = await second.fetch_next_request()
+
+    assert fetched_first is not None
+    assert fetched_second is not None
+    assert fetched_first.unique_key == requests[0].unique_key
+    assert fetched_second.unique_key == requests[1].unique_key
+    first_api_client.list_and_lock_head.assert_awaited_once()
+    second_api_client.list_and_lock_head.assert_not_awaited()
+
+
+async def test_shared_clients_of_one_queue_use_lock_owner_for_lock_operations() -> None:
+    """Locks are bound to the client key that acquired them, so every client prolongs and updates via the owner."""
+    owner, owner_api_client = _make_shared_client()
+    other, other_api_client = _make_shared_client()
+    request = Request.from_url('https://example.com/1')
+    now = datetime.now(tz=UTC)
+
+    owner_api_client.list_and_lock_head = AsyncMock(
+        return_value=_locked_head([_locked_item(request, lock_expires_at=now + timedelta(seconds=30))])
+    )
+    owner_api_client.prolong_request_lock = AsyncMock(
+        return_value=RequestLockInfo(lock_expires_at=now + timedelta(seconds=180))
+    )
+    owner_api_client.update_request = AsyncMock(return_value=_processed(request))
+    other_api_client.get_request = AsyncMock(return_value=_client_request(request, handled_at=None))
+
+    fetched = await other.fetch_next_request()
+    assert fetched is not None
+    await other.mark_request_as_handled(fetched)
+
+    owner_api_client.prolong_request_lock.assert_awaited_once()
+    owner_api_client.update_request.assert_awaited_once()
+    other_api_client.prolong_request_lock.assert_not_awaited()
+    other_api_client.update_request.assert_not_awaited()
+    assert owner._head is other._head
+    assert not other._head.requests_in_progress
+
+
+async def test_shared_clients_of_different_queues_do_not_share_head() -> None:
+    first, _ = _make_shared_client(queue_id='first-rq-id')
+    second, _ = _make_shared_client(queue_id='second-rq-id')
+
+    assert first._head is not second._head
+
+
+async def test_shared_clients_with_different_credentials_do_not_share_head() -> None:
+    """Clients of one queue opened with other credentials use their own API client, so they get their own head."""
+    first, _ = _make_shared_client()
+    second, _ = _make_shared_client(http_client=object())
+
+    assert first._head is not second._head
+    assert first._head is _make_shared_client()[0]._head
+
+
+async def test_fetch_next_request_prunes_all_expired_locks_without_api_calls() -> None:
+    """Every head entry whose lock lapsed is dropped in one pass, without prolonging or hydrating any of them."""
+    client, api_client = _make_shared_client()
+    expired = [Request.from_url(f'https://example.com/expired-{i}') for i in range(3)]
+    valid = Request.from_url('https://example.com/valid')
+    now = datetime.now(tz=UTC)
+
+    api_client.list_and_lock_head = AsyncMock(
+        return_value=_locked_head(
+            [
+                *(_locked_item(request, lock_expires_at=now - timedelta(seconds=60)) for request in expired),
+                _locked_item(valid, lock_expires_at=now + timedelta(seconds=180)),
+            ]
+        )
+    )
+    api_client.get_request = AsyncMock(side_effect=_client_request_getter([*expired, valid]))
+    api_client.prolong_request_lock = AsyncMock()
+
+    fetched = await client.fetch_next_request()
+
+    assert fetched is not None
+    assert fetched.unique_key == valid.unique_key
+    assert not client._head.lock_expires_at
+    api_client.prolong_request_lock.assert_not_awaited()
+    requested_ids = {call.args[0] for call in api_client.get_request.await_args_list}
+    assert requested_ids.isdisjoint(unique_key_to_request_id(request.unique_key) for request in expired)
+
+
+def test_lock_expiry_index_stays_bounded() -> None:
+    """Stale expiry entries of requests that left the head are compacted away instead of piling up."""
+    client, _ = _make_shared_client()
+    head = client._head
+    expires_at = datetime.now(tz=UTC) + timedelta(minutes=3)
+
+    for i in range(1_000):
+        head.track_lock(f'request-{i}', expires_at)
+        head.untrack_lock(f'request-{i}')
+
+    assert len(head._lock_expiry_heap) <= head._LOCK_EXPIRY_HEAP_SLACK + 1
+    assert head.prune_expired_locks(expires_at) == 0
+
+
+def _make_multi_client_shared_client(
+    *, metadata_max_staleness: timedelta
+) -> tuple[ApifyRequestQueueSharedClient, AsyncMock]:
+    """Build a shared client of a queue other clients work with, whose global metadata reports 10 pending requests."""
+    metadata = _make_metadata()
+    metadata.had_multiple_clients = True
+    platform_metadata = ApifyRequestQueueMetadata.model_validate(
+        metadata.model_dump() | {'total_request_count': 10, 'pending_request_count': 10}
+    )
+    metadata_getter = AsyncMock(return_value=platform_metadata)
+    client = ApifyRequestQueueSharedClient(
+        api_client=AsyncMock(),
+        metadata=metadata,
+        cache_size=100,
+        metadata_getter=metadata_getter,
+        metadata_max_staleness=metadata_max_staleness,
+    )
+    return client, metadata_getter
+
+
+async def test_metadata_estimate_reuses_fresh_global_metadata() -> None:
+    """With multiple clients, the global metadata is fetched once and reused while fresh."""
+    client, metadata_getter = _make_multi_client_shared_client(metadata_max_staleness=timedelta(minutes=1))
+
+    for _ in range(5):
+        metadata = await client._get_metadata_estimate()
+
+    metadata_getter.assert_awaited_once()
+    assert metadata.total_request_count == 10
+    assert metadata.had_multiple_clients
+
+
+async def test_metadata_estimate_merges_local_changes_into_cached_metadata() -> None:
+    """Requests added and handled locally since the fetch are reflected without refetching the global metadata."""
+    client, metadata_getter = _make_multi_client_shared_client(metadata_max_staleness=timedelta(minutes=1))
+    await client._get_metadata_estimate()
+
+    client.metadata.total_request_count += 3
+    client.metadata.handled_request_count += 2
+    metadata = await client._get_metadata_estimate()
+
+    metadata_getter.assert_awaited_once()
+    assert metadata.total_request_count == 13
+    assert metadata.handled_request_count == 2
+    assert metadata.pending_request_count == 11
+
+
+async def test_metadata_estimate_refreshes_stale_metadata_in_background() -> None:
+    """Stale global metadata is served immediately while a single refresh runs in the background."""
+    client, metadata_getter = _make_multi_client_shared_client(metadata_max_staleness=timedelta(0))
+    await client._get_metadata_estimate()
+
+    refresh_started = asyncio.Event()
+    release_refresh = asyncio.Event()
+    stale_metadata = metadata_getter.return_value
+
+    async def slow_getter() -> ApifyRequestQueueMetadata:
+        refresh_started.set()
+        await release_refresh.wait()
+        return stale_metadata.model_copy(update={'total_request_count': 20})
+
+    metadata_getter.side_effect = slow_getter
+
+    # Both reads return the stale copy right away, and only one refresh is started.
+    assert (await client._get_metadata_estimate()).total_request_count == 10
+    assert (await client._get_metadata_estimate()).total_request_count == 10
+    await refresh_started.wait()
+    assert metadata_getter.await_count == 2
+
+    release_refresh.set()
+    assert client._metadata_refresh_task is not None
+    await client._metadata_refresh_task
+    assert client._platform_metadata is not None
+    assert client._platform_metadata.total_request_count == 20
+
+
+async def test_metadata_estimate_keeps_stale_metadata_when_refresh_fails() -> None:
+    client, metadata_getter = _make_multi_client_shared_client(metadata_max_staleness=timedelta(0))
+    await client._get_metadata_estimate()
+
+    metadata_getter.side_effect = RuntimeError('API unavailable')
+    assert (await client._get_metadata_estimate()).total_request_count == 10
+    assert client._metadata_refresh_task is not None
+    await client._metadata_refresh_task
+
+    assert (await client._get_metadata_estimate()).total_request_count == 10
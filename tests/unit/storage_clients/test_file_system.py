@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pytest
 
@@ -12,6 +13,9 @@ from crawlee._consts import METADATA_FILENAME
 from apify import Actor, Configuration
 from apify.storage_clients._file_system import ApifyFileSystemKeyValueStoreClient
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
 
 async def test_purge_preserves_input_file_and_metadata() -> None:
     """Test that purge() preserves INPUT.json and metadata files but removes other files."""
@@ -132,3 +136,107 @@ async def test_record_exists_and_delete_value_target_existing_input_file() -> No
     await client.delete_value(key=configuration.input_key)
     assert await client.record_exists(key=configuration.input_key) is False
     assert not (kvs_path / 'INPUT.json').exists()
+
+
+async def test_bulk_operations_write_and_delete_many_records() -> None:
+    configuration = Configuration.get_global_configuration()
+    client = await ApifyFileSystemKeyValueStoreClient.open(
+        id=None, name='test-kvs', alias=None, configuration=configuration
+    )
+    values = {f'key-{i}': {'index': i} for i in range(50)} | {'text': 'hello', 'binary': b'\x00\x01', 'none': None}
+
+    await client.set_values(values)
+
+    records = await client.get_values([*values, 'missing'])
+    assert {key: record.value if record else None for key, record in records.items()} == values | {'missing': None}
+    assert records['text'] is not None
+    assert records['text'].content_type == 'text/plain; charset=utf-8'
+
+    # The bulk writes are indistinguishable from single writes.
+    await client.set_value(key='single', value={'index': 0})
+    single_metadata = await asyncio.to_thread((client.path_to_kvs / f'single.{METADATA_FILENAME}').read_text)
+    bulk_metadata = await asyncio.to_thread((client.path_to_kvs / f'key-0.{METADATA_FILENAME}').read_text)
+    assert json.loads(single_metadata) | {'key': 'key-0'} == json.loads(bulk_metadata)
+
+    await client.delete_values([*values, 'missing'])
+    assert [metadata.key async for metadata in client.iterate_keys()] == ['single']
+
+
+async def test_bulk_operations_write_under_the_store_lock() -> None:
+    configuration = Configuration.get_global_configuration()
+    client = await ApifyFileSystemKeyValueStoreClient.open(
+        id=None, name='test-kvs', alias=None, configuration=configuration
+    )
+    await client.set_value(key='deleted', value=1)
+
+    async with client._lock:
+        bulk_write = asyncio.create_task(client.set_values({'written': 1}))
+        bulk_delete = asyncio.create_task(client.delete_values(['deleted']))
+        await asyncio.sleep(0.1)
+
+        # Nothing is written or deleted while another write of the store holds the lock.
+        assert not (client.path_to_kvs / 'written').exists()
+        assert (client.path_to_kvs / 'deleted').exists()
+
+    await asyncio.gather(bulk_write, bulk_delete)
+    assert [metadata.key async for metadata in client.iterate_keys()] == ['written']
+
+
+async def test_streamed_records_are_stored_under_the_store_lock(tmp_path: Path) -> None:
+    configuration = Configuration.get_global_configuration()
+    client = await ApifyFileSystemKeyValueStoreClient.open(
+        id=None, name='test-kvs', alias=None, configuration=configuration
+    )
+    source = tmp_path / 'page.html'
+    await asyncio.to_thread(source.write_bytes, b'<html></html>')
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield b'streamed'
+
+    async with client._lock:
+        from_file = asyncio.create_task(client.set_value_from_file(key='from-file', path=source))
+        from_stream = asyncio.create_task(client.set_value_from_stream(key='from-stream', chunks=chunks()))
+        await asyncio.sleep(0.1)
+
+        # The values are not moved in place while another write of the store holds the lock.
+        assert not (client.path_to_kvs / 'from-file').exists()
+        assert not (client.path_to_kvs / 'from-stream').exists()
+
+    await asyncio.gather(from_file, from_stream)
+    assert sorted([metadata.key async for metadata in client.iterate_keys()]) == ['from-file', 'from-stream']
+    assert list(client.path_to_kvs.glob('*.tmp')) == []
+
+
+async def test_record_values_stream_to_and_from_files(tmp_path: Path) -> None:
+    configuration = Configuration.get_global_configuration()
+    client = await ApifyFileSystemKeyValueStoreClient.open(
+        id=None, name='test-kvs', alias=None, configuration=configuration
+    )
+    source = tmp_path / 'screenshot.png'
+    await asyncio.to_thread(source.write_bytes, b'\x89PNG' + bytes(range(256)) * 10_000)
+
+    await client.set_value_from_file(key='screenshot', path=source)
+
+    async with client.stream_value(key='screenshot') as record:
+        assert record is not None
+        assert record.metadata.content_type == 'image/png'
+        assert record.metadata.size == source.stat().st_size
+        assert b''.join([chunk async for chunk in record.chunks]) == source.read_bytes()
+
+    target = tmp_path / 'downloaded.png'
+    assert await client.save_value_to_file(key='screenshot', path=target)
+    assert target.read_bytes() == source.read_bytes()
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for part in (b'{"streamed": ', b'true}'):
+            yield part
+
+    await client.set_value_from_stream(key='document', chunks=chunks(), content_type='application/json')
+    record = await client.get_value(key='document')
+    assert record is not None
+    assert record.value == {'streamed': True}
+
+    async with client.stream_value(key='missing') as missing_record:
+        assert missing_record is None
+    assert not await client.save_value_to_file(key='missing', path=tmp_path / 'missing')
+    assert not (tmp_path / 'missing').exists()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Literal
+
+import pytest
+
+from apify_client import ApifyClientAsync
+
+from apify import Configuration, Request
+from apify.storage_clients._apify._request_queue_client import ApifyRequestQueueClient
+from apify.storage_clients._apify._request_queue_shared_client import ApifyRequestQueueSharedClient
+from apify.storage_clients._apify._utils import unique_key_to_request_id
+
+if TYPE_CHECKING:
+    from apify_client._resource_clients import RequestQueueClientAsync
+
+    from .._request_queue_api_server import RequestQueueApiServer
+
+
+async def _open_client(
+    server: RequestQueueApiServer,
+    queue_id: str,
+    *,
+    access: Literal['single', 'shared'] = 'shared',
+    metadata_max_staleness: timedelta = timedelta(seconds=5),
+    token: str = 'test-token',  # noqa: S107
+) -> ApifyRequestQueueClient:
+    configuration = Configuration(
+        token=token,
+        api_base_url=server.url,
+        api_public_base_url=server.url,
+        actor_run_id='test-run-id',
+        request_queue_metadata_max_staleness=metadata_max_staleness,
+    )
+    client = await ApifyRequestQueueClient.open(
+        id=queue_id, name=None, alias=None, configuration=configuration, access=access
+    )
+    # Like the storage instance manager does, consume the metadata handed over from the open.
+    await client.get_metadata()
+    return client
+
+
+def _other_consumer(server: RequestQueueApiServer, queue_id: str) -> RequestQueueClientAsync:
+    """A raw API client with its own client key, standing in for a consumer running in another process."""
+    return ApifyClientAsync(token='test-token', api_url=server.url).request_queue(
+        request_queue_id=queue_id, client_key='other-run-id'
+    )
+
+
+@pytest.mark.parametrize('access', ['single', 'shared'])
+async def test_client_processes_queue_through_api(
+    request_queue_api_server: RequestQueueApiServer, access: Literal['single', 'shared']
+) -> None:
+    queue_id = request_queue_api_server.create_queue()
+    client = await _open_client(request_queue_api_server, queue_id, access=access)
+    requests = [Request.from_url(f'https://example.com/{i}') for i in range(3)]
+
+    await client.add_batch_of_requests(requests)
+
+    fetched_urls = []
+    while request := await client.fetch_next_request():
+        fetched_urls.append(request.url)
+        await client.mark_request_as_handled(request)
+
+    assert fetched_urls == [request.url for request in requests]
+    assert await client.is_finished()
+    metadata = await client.get_metadata()
+    assert metadata.handled_request_count == 3
+
+
+async def test_shared_client_respects_locks_of_other_consumers(
+    request_queue_api_server: RequestQueueApiServer,
+) -> None:
+    queue_id = request_queue_api_server.create_queue()
+    client = await _open_client(request_queue_api_server, queue_id)
+    request = Request.from_url('https://example.com/1')
+    await client.add_batch_of_requests([request])
+
+    locked_head = await _other_consumer(request_queue_api_server, queue_id).list_and_lock_head(
+        lock_duration=timedelta(minutes=3)
+    )
+    assert [item.unique_key for item in locked_head.items] == [request.unique_key]
+
+    # The request is locked by the other consumer, so it is not available, but the queue is not finished either.
+    assert await client.fetch_next_request() is None
+    assert not await client.is_finished()
+
+    # Once the other consumer's lock expires, the request is listed and locked for this client.
+    expired = datetime.now(tz=UTC) + timedelta(minutes=5)
+    request_queue_api_server.clock = lambda: expired
+    fetched = await client.fetch_next_request()
+
+    assert fetched is not None
+    assert fetched.unique_key == request.unique_key
+    stored = request_queue_api_server.get_stored_request(queue_id, unique_key_to_request_id(request.unique_key))
+    assert stored['lockClientKey'] == 'test-run-id'
+
+
+async def test_shared_client_uses_configured_metadata_max_staleness(
+    request_queue_api_server: RequestQueueApiServer,
+) -> None:
+    queue_id = request_queue_api_server.create_queue()
+    client = await _open_client(request_queue_api_server, queue_id, metadata_max_staleness=timedelta(minutes=2))
+
+    assert isinstance(client._implementation, ApifyRequestQueueSharedClient)
+    assert client._implementation._metadata_max_staleness == timedelta(minutes=2)
+
+
+async def test_shared_clients_share_head_only_with_the_same_credentials(
+    request_queue_api_server: RequestQueueApiServer,
+) -> None:
+    queue_id = request_queue_api_server.create_queue()
+    clients = [
+        await _open_client(request_queue_api_server, queue_id),
+        await _open_client(request_queue_api_server, queue_id),
+        await _open_client(request_queue_api_server, queue_id, token='other-token'),
+    ]
+    implementations = [client._implementation for client in clients]
+    heads = [impl._head for impl in implementations if isinstance(impl, ApifyRequestQueueSharedClient)]
+
+    assert len(heads) == 3
+    assert heads[0] is heads[1]
+    assert heads[0] is not heads[2]
+
+
+async def test_drop_cancels_background_metadata_refresh(request_queue_api_server: RequestQueueApiServer) -> None:
+    queue_id = request_queue_api_server.create_queue()
+    client = await _open_client(request_queue_api_server, queue_id)
+    assert isinstance(client._implementation, ApifyRequestQueueSharedClient)
+
+    async def refresh() -> None:
+        await asyncio.Event().wait()
+
+    refresh_task = asyncio.create_task(refresh())
+    client._implementation._metadata_refresh_task = refresh_task
+    await client.drop()
+
+    assert refresh_task.cancelled()
+    assert client._implementation._metadata_refresh_task is None
+
+
+async def test_lock_operations_of_other_consumers_are_rejected(
+    request_queue_api_server: RequestQueueApiServer,
+) -> None:
+    queue_id = request_queue_api_server.create_queue()
+    client = await _open_client(request_queue_api_server, queue_id)
+    request = Request.from_url('https://example.com/1')
+    await client.add_batch_of_requests([request])
+
+    fetched = await client.fetch_next_request()
+    assert fetched is not None
+
+    other_consumer = _other_consumer(request_queue_api_server, queue_id)
+    with pytest.raises(Exception, match='locked by another client'):
+        await other_consumer.delete_request_lock(unique_key_to_request_id(request.unique_key))
+
+    assert (await client.get_metadata()).had_multiple_clients
+
+
+async def test_injected_server_errors_are_retried(request_queue_api_server: RequestQueueApiServer) -> None:
+    queue_id = request_queue_api_server.create_queue()
+    client = await _open_client(request_queue_api_server, queue_id)
+    await client.add_batch_of_requests([Request.from_url('https://example.com/1')])
+
+    request_queue_api_server.fail_next('list_and_lock_head', status_code=500)
+    fetched = await client.fetch_next_request()
+
+    assert fetched is not None
+    assert request_queue_api_server.call_counts['list_and_lock_head'] == 2
+
+
+async def test_injected_client_errors_surface(request_queue_api_server: RequestQueueApiServer) -> None:
+    queue_id = request_queue_api_server.create_queue()
+    request_queue_api_server.fail_next('get_queue', status_code=404)
+
+    with pytest.raises(ValueError, match='failed'):
+        await _open_client(request_queue_api_server, queue_id)
+
+
+async def test_latency_is_added_to_every_call(request_queue_api_server: RequestQueueApiServer) -> None:
+    queue_id = request_queue_api_server.create_queue()
+    client = await _open_client(request_queue_api_server, queue_id)
+    request_queue_api_server.latency = timedelta(milliseconds=100)
+
+    started_at = time.perf_counter()
+    await client.get_metadata()
+
+    assert time.perf_counter() - started_at >= 0.1
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+
+from crawlee.storage_clients import MemoryStorageClient
+
+from apify._incremental_state import IncrementalState
+from apify.storages import KeyValueStore
+
+
+@pytest.fixture
+async def kvs() -> KeyValueStore:
+    return await KeyValueStore.open(storage_client=MemoryStorageClient())
+
+
+async def _record_keys(kvs: KeyValueStore) -> list[str]:
+    return sorted([record.key async for record in kvs.iterate_keys()])
+
+
+async def test_changes_are_written_as_deltas(kvs: KeyValueStore) -> None:
+    state = await IncrementalState.load(kvs, 'STATE', {f'page-{i}': 'pending' for i in range(10)})
+    state['page-0'] = 'done'
+    await state.persist()
+
+    state['page-1'] = 'done'
+    del state['page-2']
+    await state.persist()
+
+    assert await _record_keys(kvs) == ['STATE_DELTA_0', 'STATE_SNAPSHOT']
+    assert await kvs.get_value('STATE_DELTA_0') == {'set': {'page-1': 'done'}, 'deleted': ['page-2']}
+
+    # Nothing changed, nothing is written.
+    await state.persist()
+    assert await _record_keys(kvs) == ['STATE_DELTA_0', 'STATE_SNAPSHOT']
+
+    restored = await IncrementalState.load(kvs, 'STATE')
+    assert restored == state
+    assert 'page-2' not in restored
+
+
+async def test_deltas_are_compacted_into_a_snapshot(kvs: KeyValueStore) -> None:
+    state = await IncrementalState.load(kvs, 'STATE', {f'page-{i}': 0 for i in range(10)}, compaction_interval=3)
+
+    for i in range(5):
+        state['page-0'] = i
+        await state.persist()
+
+    # The first persist wrote the snapshot, the next three deltas were compacted into a new one by the fifth.
+    assert await _record_keys(kvs) == ['STATE_SNAPSHOT']
+    assert await kvs.get_value('STATE_SNAPSHOT') == {'state': {**state}, 'nextDelta': 3}
+
+    state['page-0'] = 5
+    await state.persist()
+    assert await _record_keys(kvs) == ['STATE_DELTA_3', 'STATE_SNAPSHOT']
+    assert (await IncrementalState.load(kvs, 'STATE'))['page-0'] == 5
+
+
+async def test_deltas_superseded_by_the_snapshot_are_ignored(kvs: KeyValueStore) -> None:
+    state = await IncrementalState.load(kvs, 'STATE', {'a': 1, 'b': 1, 'c': 1}, compaction_interval=1)
+    for value in range(3):
+        state['a'] = value
+        await state.persist()
+    assert await kvs.get_value('STATE_SNAPSHOT') == {'state': {'a': 2, 'b': 1, 'c': 1}, 'nextDelta': 1}
+
+    # A compaction interrupted before it deleted the delta it superseded.
+    await kvs.set_value('STATE_DELTA_0', {'set': {'a': 'stale'}, 'deleted': []})
+
+    assert (await IncrementalState.load(kvs, 'STATE'))['a'] == 2
+
+
+async def test_failed_persist_is_retried(kvs: KeyValueStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    state = await IncrementalState.load(kvs, 'STATE', {'a': 1, 'b': 1, 'c': 1})
+    state['a'] = 2
+
+    async def failing_set_value(*_: object, **__: object) -> None:
+        raise RuntimeError('Storage unavailable')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(kvs, 'set_value', failing_set_value)
+        with pytest.raises(RuntimeError, match='Storage unavailable'):
+            await state.persist()
+
+    await state.persist()
+    assert (await IncrementalState.load(kvs, 'STATE'))['a'] == 2